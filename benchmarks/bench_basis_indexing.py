@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+"""Benchmark the lookup of basis states of a product Hilbert space by index
+
+:meth:`.ProductSpace.basis_state` converts an index into the indices of the
+local basis states by mixed-radix arithmetic, instead of enumerating the
+product of the local bases. This benchmark compares this with the enumeration
+of the full basis (which is also what an eager construction of
+:attr:`.ProductSpace.basis_labels` entails), for Fock spaces with an
+increasing number of modes.
+
+Run as::
+
+    python benchmarks/bench_basis_indexing.py
+"""
+import timeit
+from itertools import product as cartesian_product
+
+from qnet import LocalSpace, ProductSpace, BasisKet, TensorKet
+
+
+def enumerated_basis_state(hs, index):
+    """Reference implementation enumerating the full basis"""
+    ls_bases = [ls.basis_labels for ls in hs.local_factors]
+    label_tuple = list(cartesian_product(*ls_bases))[index]
+    return TensorKet(
+        *[BasisKet(label, hs=ls) for (ls, label)
+          in zip(hs.local_factors, label_tuple)])
+
+
+def main(number=3, repeat=3, dimension=5):
+    for n_modes in [4, 6, 8]:
+        spaces = [
+            LocalSpace('m%d' % i, dimension=dimension) for i in range(n_modes)]
+        hs = ProductSpace.create(*spaces)
+        index = hs.dimension // 2
+        assert enumerated_basis_state(hs, index) == hs.basis_state(index)
+        print("%d modes (dimension %d)" % (n_modes, hs.dimension))
+        for label, func in [
+                ('enumerated', lambda: enumerated_basis_state(hs, index)),
+                ('mixed-radix', lambda: hs.basis_state(index)),
+                ('basis_states[index]', lambda: hs.basis_states[index])]:
+            time = min(
+                timeit.repeat(func, number=number, repeat=repeat)) / number
+            print("    %-26s %10.3f ms" % (label, 1000 * time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""Benchmark the detection of the block structure of operator matrices
+
+Times :attr:`.Matrix.block_structure`, both for a dense :class:`.Matrix` and
+for a :class:`.SparseMatrix`, for
+
+* the block-diagonal scattering matrix of the concatenation of many
+  beamsplitters (blocks of size two), and
+* the scattering matrix of a cyclic permutation of the channels (a single
+  block).
+
+The block structure is computed for a new matrix in each run, so that the
+cached value of an earlier run is not used.
+
+Run as::
+
+    python benchmarks/bench_block_structure.py
+"""
+import timeit
+from functools import reduce
+
+import sympy
+
+from qnet import Beamsplitter, CPermutation, Matrix, SparseMatrix
+
+
+def beamsplitters(n):
+    """Scattering matrix of `n` concatenated beamsplitters, and its number of
+    blocks"""
+    BS = [
+        Beamsplitter(label='BS%d' % i, mixing_angle=sympy.pi/3).toSLH()
+        for i in range(n)]
+    return reduce(lambda a, b: a.concatenate_slh(b), BS).S, n
+
+
+def cyclic_permutation(n):
+    """Scattering matrix of a cyclic permutation of `2 * n` channels, and its
+    number of blocks"""
+    perm = CPermutation(tuple(range(1, 2 * n)) + (0, ))
+    return perm.toSLH().S, 1
+
+
+def main(number=1, repeat=3):
+    for (name, network) in [
+            ('beamsplitters', beamsplitters),
+            ('cyclic_permutation', cyclic_permutation)]:
+        for n in [8, 16, 32, 64]:
+            S, n_blocks = network(n)
+            print("%s(%d): dimension %d" % (name, n, 2 * n))
+            for (label, cls) in [
+                    ('Matrix', Matrix), ('SparseMatrix', SparseMatrix)]:
+                matrices = [cls(S) for _ in range(number * repeat)]
+
+                def run():
+                    assert len(matrices.pop().block_structure) == n_blocks
+
+                time = min(timeit.repeat(
+                    run, number=number, repeat=repeat)) / number
+                print("    %-26s %10.4f s" % (label, time))
+
+
+if __name__ == '__main__':
+    main()
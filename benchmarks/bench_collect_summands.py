@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""Benchmark collecting the summands of large operator sums
+
+:func:`.collect_summands` groups the coefficients of all summands that share
+the same term and combines each group in a single step (a single
+:class:`sympy.Add` for symbolic coefficients). This benchmark compares this
+with the pairwise accumulation of coefficients (``coeff_map[term] += coeff``)
+that builds a new, ever larger sympy expression for every summand, for
+
+* a sum with many distinct symbolic coefficients for only a few terms, and
+* a sum of many terms with numeric coefficients,
+
+and times :meth:`.QuantumPlus.from_terms` on a generator of terms.
+
+Run as::
+
+    python benchmarks/bench_collect_summands.py
+"""
+import random
+import timeit
+from collections import OrderedDict
+
+import sympy
+from sympy.core.cache import clear_cache
+
+from qnet import (
+    LocalSpace, OperatorSymbol, OperatorPlus, ScalarTimesOperator,
+    no_instance_caching)
+from qnet.algebra.core.algebraic_properties import collect_summands
+
+
+def pairwise_collect_summands(cls, ops, kwargs):
+    """Reference implementation accumulating coefficients pairwise"""
+    coeff_map = OrderedDict()
+    for op in ops:
+        if isinstance(op, ScalarTimesOperator):
+            coeff, term = op.coeff, op.term
+        else:
+            coeff, term = 1, op
+        if term in coeff_map:
+            coeff_map[term] += coeff
+        else:
+            coeff_map[term] = coeff
+    fops = [coeff * term for (term, coeff) in coeff_map.items()]
+    return tuple(op for op in fops if not op.is_zero), kwargs
+
+
+def symbolic_terms(n_terms=1000, n_ops=4):
+    ops = [OperatorSymbol('A%d' % i, hs=0) for i in range(n_ops)]
+    s = sympy.symbols('s0:%d' % n_terms)
+    return [s[k] * ops[k % n_ops] for k in range(n_terms)]
+
+
+def numeric_terms(n_terms=5000, n_ops=100, seed=0):
+    hs = [LocalSpace(i, dimension=4) for i in range(4)]
+    ops = [OperatorSymbol('A%d' % i, hs=hs[i % 4]) for i in range(n_ops)]
+    random.seed(seed)
+    return [random.random() * ops[k % n_ops] for k in range(n_terms)]
+
+
+def main(number=1, repeat=3):
+    timings = {}
+    for name, terms in [
+            ('symbolic', symbolic_terms()), ('numeric', numeric_terms())]:
+        print("%d summands with %s coefficients" % (len(terms), name))
+        for label, collect in [
+                ('pairwise', pairwise_collect_summands),
+                ('grouped', collect_summands)]:
+            # sympy caches the result of additions, so we must clear the
+            # cache between repetitions
+            timings[name, label] = min(timeit.repeat(
+                lambda: collect(OperatorPlus, terms, {}),
+                setup=clear_cache, number=number, repeat=repeat)) / number
+            print("    %-26s %10.2f ms"
+                  % (label, 1000 * timings[name, label]))
+        with no_instance_caching():
+            timings[name, 'from_terms'] = min(timeit.repeat(
+                lambda: OperatorPlus.from_terms(t for t in terms),
+                setup=clear_cache, number=number, repeat=repeat)) / number
+        print("    %-26s %10.2f ms" % (
+            'OperatorPlus.from_terms', 1000 * timings[name, 'from_terms']))
+    return timings
+
+
+if __name__ == '__main__':
+    main()
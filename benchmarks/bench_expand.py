@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""Benchmark the distributive expansion of products of large sums
+
+Expanding a product of sums generates the products of all combinations of
+summands. These transient products are grouped by term as they are generated
+(without being stored in the instance cache), so that the memory required is
+proportional to the number of distinct terms in the result. This benchmark
+times the expansion of powers of a Hamiltonian-like sum of operators, and
+reports the number of expressions added to the instance cache.
+
+Run as::
+
+    python benchmarks/bench_expand.py
+"""
+import time
+
+import sympy
+
+from qnet import LocalSpace, Destroy, ZeroOperator, Expression
+
+
+def all_subclasses(cls):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from all_subclasses(subclass)
+
+
+def n_cached_instances():
+    """Total number of entries in the instance caches of all classes"""
+    classes = set(all_subclasses(Expression)) | {Expression}
+    return sum(
+        len(cls.__dict__['_instances'])
+        for cls in classes if '_instances' in cls.__dict__)
+
+
+def hamiltonian(n_modes=4):
+    hs = [LocalSpace(i, dimension=5) for i in range(n_modes)]
+    a = [Destroy(hs=h) for h in hs]
+    g = sympy.symbols('g0:%d' % n_modes)
+    return sum(
+        (g[i] * (a[i].dag() * a[(i+1) % n_modes] + a[i] * a[i].dag()) +
+         a[i].dag() * a[i] for i in range(n_modes)), ZeroOperator)
+
+
+def main():
+    for (n_modes, power) in [(3, 2), (5, 2), (3, 3), (5, 3)]:
+        H = hamiltonian(n_modes)
+        n_cached = n_cached_instances()
+        t_start = time.perf_counter()
+        res = (H**power).expand()
+        t_stop = time.perf_counter()
+        print("%d modes, H**%d: %5d terms in %8.2f s (%6d new cached)" % (
+            n_modes, power, len(res.operands), t_stop - t_start,
+            n_cached_instances() - n_cached))
+
+
+if __name__ == '__main__':
+    main()
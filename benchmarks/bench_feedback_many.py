@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""Benchmark closing several feedback loops of an SLH model
+
+Compares closing all feedback connections of a ring of cavities coupled
+through beamsplitters one at a time (via :meth:`.SLH.feedback`, which
+permutes the channels and eliminates a single channel in each step) with
+eliminating all of them at once (via :meth:`.SLH.feedback_many`).
+
+Each run starts with empty instance, SymPy, and simplification caches.
+
+Run as::
+
+    python benchmarks/bench_feedback_many.py
+"""
+import timeit
+from functools import reduce
+
+import sympy
+from sympy.core.cache import clear_cache
+
+from qnet import (
+    Destroy, SLH, Beamsplitter, Expression, clear_simplify_scalar_cache,
+    temporary_instance_cache)
+
+
+def cavity(i):
+    """Single-mode cavity with one input/output port"""
+    kappa = sympy.symbols('kappa_%d' % i, positive=True)
+    Delta = sympy.symbols('Delta_%d' % i, real=True)
+    a = Destroy(hs='c%d' % i)
+    return SLH([[1]], [[sympy.sqrt(kappa) * a]], Delta * a.dag() * a)
+
+
+def ring(n):
+    """Concatenation of `n` cavities and beamsplitters, and the feedback
+    connections ``(out_port, in_port)`` that close them into a ring: each
+    cavity feeds into the next beamsplitter, whose transmitted output feeds
+    into the next cavity"""
+    components = []
+    for i in range(n):
+        components.extend([
+            cavity(i),
+            Beamsplitter(label='BS%d' % i, mixing_angle=sympy.pi/3).toSLH()])
+    slh = reduce(lambda a, b: a.concatenate_slh(b), components)
+    pairs = []
+    for i in range(n):
+        # ports: cavity (3i), beamsplitter (3i+1, 3i+2)
+        pairs.append((3 * i, 3 * i + 1))
+        pairs.append((3 * i + 1, (3 * i + 3) % (3 * n)))
+    return slh, pairs
+
+
+def feedback_one_at_a_time(slh, pairs):
+    """Close the feedback connections in `pairs` with :meth:`.SLH.feedback`,
+    keeping track of the renumbering of the remaining channels"""
+    outs = list(range(slh.cdim))
+    ins = list(range(slh.cdim))
+    for (out_port, in_port) in pairs:
+        slh = slh.feedback(
+            out_port=outs.index(out_port), in_port=ins.index(in_port))
+        outs.remove(out_port)
+        ins.remove(in_port)
+    return slh
+
+
+def main(number=1, repeat=3):
+    for n in [2, 3, 4]:
+        slh, pairs = ring(n)
+        print("ring(%d): %d channels, %d feedback connections"
+              % (n, slh.cdim, len(pairs)))
+        for (label, func) in [
+                ('feedback', lambda: feedback_one_at_a_time(slh, pairs)),
+                ('feedback_many', lambda: slh.feedback_many(pairs))]:
+
+            def run():
+                clear_cache()
+                clear_simplify_scalar_cache()
+                with temporary_instance_cache(Expression):
+                    func()
+
+            time = min(
+                timeit.repeat(run, number=number, repeat=repeat)) / number
+            print("    %-26s %10.3f s" % (label, time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""Benchmark the construction of ABCD state-space models from SLH models
+
+Compares the derivation of the ABCD model from the Heisenberg equations of
+motion (``getABCD(slh, method='eom')``) with the direct construction from the
+coefficients of the linear SLH model (``getABCD(slh, method='linear')``), and
+with the numeric evaluation of the latter (``getABCD(slh, method='linear',
+params=...)``), for a chain of `n` cascaded cavities.
+
+Each run starts with empty instance, SymPy, and simplification caches.
+
+Run as::
+
+    python benchmarks/bench_getABCD.py
+"""
+import timeit
+from functools import reduce
+
+import sympy
+from sympy.core.cache import clear_cache
+
+from qnet import (
+    Destroy, SLH, Expression, getABCD, clear_simplify_scalar_cache,
+    temporary_instance_cache)
+
+
+def cavity(i):
+    """Single-mode cavity with one input/output port"""
+    kappa = sympy.symbols('kappa_%d' % i, positive=True)
+    Delta = sympy.symbols('Delta_%d' % i, real=True)
+    a = Destroy(hs='c%d' % i)
+    return SLH([[1]], [[sympy.sqrt(kappa) * a]], Delta * a.dag() * a)
+
+
+def chain(n):
+    """Series product of `n` cavities"""
+    return reduce(
+        lambda a, b: b.series_with_slh(a), [cavity(i) for i in range(n)])
+
+
+def main(number=1, repeat=3):
+    for n in [2, 4, 8]:
+        slh = chain(n)
+        params = {
+            sym: 1.0 + 0.1 * i
+            for (i, sym) in enumerate(sorted(slh.free_symbols, key=str))}
+        print("chain(%d): %d modes" % (n, n))
+        for (label, func) in [
+                ('eom', lambda: getABCD(slh, method='eom')),
+                ('linear', lambda: getABCD(slh, method='linear')),
+                ('linear (numeric)',
+                 lambda: getABCD(slh, method='linear', params=params))]:
+
+            def run():
+                clear_cache()
+                clear_simplify_scalar_cache()
+                with temporary_instance_cache(Expression):
+                    func()
+
+            try:
+                time = min(
+                    timeit.repeat(run, number=number, repeat=repeat)) / number
+            except Exception as exc_info:
+                print("    %-26s %10s (%s)"
+                      % (label, 'failed', exc_info.__class__.__name__))
+            else:
+                print("    %-26s %10.3f s" % (label, time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""Benchmark the overhead of instance keys in :meth:`.Expression.create`
+
+Every call to :meth:`.Expression.create` calculates the instance key of its
+arguments (see :meth:`.Expression._get_instance_key`), both for looking up
+the instance cache and when instantiating the expression. This benchmark
+times
+
+* the calculation of instance keys for typical arguments,
+* the re-creation of a deep expression with the instance cache (almost
+  entirely cache lookups), and
+* the hashing of a (new) operator-valued matrix.
+
+Run as::
+
+    python benchmarks/bench_instance_keys.py
+"""
+import timeit
+
+import numpy as np
+import sympy
+
+from qnet import (
+    LocalSpace, Destroy, OperatorSymbol, OperatorPlus, OperatorTimes,
+    ScalarTimesOperator, Matrix, ZeroOperator)
+
+
+def deep_expression(n_modes=3):
+    hs = [LocalSpace(i, dimension=5) for i in range(n_modes)]
+    a = [Destroy(hs=h) for h in hs]
+    g = sympy.symbols('g0:%d' % n_modes)
+    H = sum(
+        (g[i] * (a[i].dag() * a[(i+1) % n_modes] + a[i] * a[i].dag())
+         for i in range(n_modes)), ZeroOperator)
+    return (H * H + H).expand()
+
+
+def recreate(expr):
+    """Re-create `expr` bottom-up through `create`"""
+    try:
+        args = [recreate(arg) for arg in expr.args]
+        return expr.create(*args, **expr.kwargs)
+    except AttributeError:
+        return expr
+
+
+def main(number=200, repeat=5):
+    expr = deep_expression()
+    A = OperatorSymbol('A', hs=0)
+    key_args = [
+        ((A, ), {}), (('A', ), {'hs': LocalSpace(0)}),
+        ((sympy.Symbol('g'), A), {}), (tuple(expr.args), {}),
+        (('a', 'b'), {'hs': LocalSpace(0), 'dimension': 2})]
+    op_matrix = np.array(
+        [[A * i + j for i in range(10)] for j in range(10)], dtype=object)
+
+    def instance_keys():
+        for (args, kwargs) in key_args:
+            OperatorPlus._get_instance_key(args, kwargs)
+            OperatorTimes._get_instance_key(args, kwargs)
+            ScalarTimesOperator._get_instance_key(args, kwargs)
+
+    def matrix_hash():
+        hash(Matrix(op_matrix))
+
+    for label, func, n in [
+            ('instance keys', instance_keys, number * 10),
+            ('re-create deep expression', lambda: recreate(expr), number),
+            ('hash operator matrix', matrix_hash, number)]:
+        time = min(timeit.repeat(func, number=n, repeat=repeat)) / n
+        print("%-30s %10.2f us" % (label, 1e6 * time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""Benchmark operator expressions with purely numeric coefficients
+
+Multiplying an operator with a Python (or numpy) number wraps the number in a
+:class:`.ScalarValue`, and all further arithmetic on the coefficients (e.g.
+when collecting terms in an :class:`.OperatorPlus`) happens on these wrapped
+values. This benchmark times
+
+* the elementary arithmetic of numeric :class:`.ScalarValue` instances,
+* the construction of products of operators with numeric coefficients, and
+* the construction of an :class:`.OperatorPlus` from thousands of such terms,
+  including the collection of terms that differ only in their coefficient.
+
+Run as::
+
+    python benchmarks/bench_numeric_scalars.py
+"""
+import random
+import timeit
+
+from qnet import (
+    LocalSpace, OperatorSymbol, OperatorPlus, ScalarValue,
+    no_instance_caching)
+
+
+def numeric_terms(n_terms=2000, n_ops=40, n_spaces=4, seed=0):
+    """List of `n_terms` products of two operators with random complex
+    coefficients"""
+    hs = [LocalSpace(i, dimension=4) for i in range(n_spaces)]
+    ops = [
+        OperatorSymbol('A%d' % i, hs=hs[i % n_spaces]) for i in range(n_ops)]
+    random.seed(seed)
+    coeffs = [
+        random.random() + 1j * random.random() for _ in range(n_terms)]
+    return [
+        (c, ops[i % n_ops], ops[(i * 7) % n_ops])
+        for (i, c) in enumerate(coeffs)]
+
+
+def main(number=5, repeat=3):
+    a = ScalarValue.create(0.5 + 0.2j)
+    b = ScalarValue.create(0.3)
+    terms = numeric_terms()
+
+    def scalar_arithmetic():
+        for _ in range(1000):
+            ((a * b + a)**2).conjugate()
+
+    def products():
+        return [c * A * B for (c, A, B) in terms]
+
+    products_list = products()
+
+    def operator_plus():
+        OperatorPlus.create(*products_list)
+
+    print("Operator sum with %d numeric-coefficient terms" % len(terms))
+    # without instance caching, repeated runs do not simply return the
+    # expression cached in the first run
+    with no_instance_caching():
+        for label, func in [
+                ('scalar arithmetic (x1000)', scalar_arithmetic),
+                ('build products', products),
+                ('build OperatorPlus', operator_plus)]:
+            time = min(
+                timeit.repeat(func, number=number, repeat=repeat)) / number
+            print("%-30s %10.2f ms" % (label, 1000 * time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""Benchmark the reduction of circuit networks to a single SLH model
+
+Compares :func:`.connect` (with ``force_SLH=True``), which adds one feedback
+connection at a time to the concatenation of all components, with the
+graph-based :func:`.reduce_network`, for synthetic networks of
+
+* a chain of cavities,
+* a ring of cavities coupled through beamsplitters, and
+* a square lattice of beamsplitters, with a cavity in front of each
+  beamsplitter.
+
+Each run starts with empty instance, SymPy, and simplification caches.
+
+Run as::
+
+    python benchmarks/bench_reduce_network.py
+"""
+import timeit
+
+import sympy
+from sympy.core.cache import clear_cache
+
+from qnet import (
+    Destroy, SLH, Beamsplitter, Expression, connect, reduce_network,
+    clear_simplify_scalar_cache, temporary_instance_cache)
+
+
+def cavity(i):
+    """Single-mode cavity with one input/output port"""
+    kappa = sympy.symbols('kappa_%d' % i, positive=True)
+    Delta = sympy.symbols('Delta_%d' % i, real=True)
+    a = Destroy(hs='c%d' % i)
+    return SLH([[1]], [[sympy.sqrt(kappa) * a]], Delta * a.dag() * a)
+
+
+def chain(n):
+    """`n` cavities in series"""
+    components = [cavity(i) for i in range(n)]
+    connections = [((i, 0), (i + 1, 0)) for i in range(n - 1)]
+    return components, connections
+
+
+def ring(n):
+    """`n` cavities, each followed by a beamsplitter whose transmitted output
+    feeds into the next cavity, with the last one feeding into the first"""
+    components = []
+    connections = []
+    for i in range(n):
+        components.extend([
+            cavity(i),
+            Beamsplitter(label='BS%d' % i, mixing_angle=sympy.pi/3)])
+    for i in range(n):
+        connections.append(((2 * i, 0), (2 * i + 1, 'in')))
+        connections.append(((2 * i + 1, 'tr'), ((2 * i + 2) % (2 * n), 0)))
+    return components, connections
+
+
+def lattice(n):
+    """`n` x `n` lattice of beamsplitters, with the transmitted output feeding
+    (through a cavity) into the right neighbor, and the reflected output
+    feeding into the lower neighbor"""
+    components = []
+    connections = []
+
+    def bs(row, col):
+        return 2 * (n * row + col) + 1
+
+    for row in range(n):
+        for col in range(n):
+            i = n * row + col
+            components.extend([
+                cavity(i),
+                Beamsplitter(label='BS%d' % i, mixing_angle=sympy.pi/3)])
+            connections.append(((bs(row, col) - 1, 0), (bs(row, col), 'in')))
+            if col + 1 < n:
+                connections.append(
+                    ((bs(row, col), 'tr'), (bs(row, col + 1) - 1, 0)))
+            if row + 1 < n:
+                connections.append(
+                    ((bs(row, col), 'rf'), (bs(row + 1, col), 'vac')))
+    return components, connections
+
+
+def main(number=1, repeat=1):
+    for (name, network, sizes) in [
+            ('chain', chain, [10, 20]), ('ring', ring, [4, 8]),
+            ('lattice', lattice, [2, 3])]:
+        for n in sizes:
+            components, connections = network(n)
+            print("%s(%d): %d components, %d connections"
+                  % (name, n, len(components), len(connections)))
+            for (label, func) in [
+                    ('connect', lambda: connect(
+                        components, connections, force_SLH=True)),
+                    ('reduce_network', lambda: reduce_network(
+                        components, connections))]:
+
+                def run():
+                    clear_cache()
+                    clear_simplify_scalar_cache()
+                    with temporary_instance_cache(Expression):
+                        func()
+
+                time = min(
+                    timeit.repeat(run, number=number, repeat=repeat)) / number
+                print("    %-26s %10.2f s" % (label, time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""Benchmark matching the algebraic rules against typical operands
+
+All patterns in the `_rules` and `_binary_rules` tables set up by
+:func:`qnet.algebra._rules._algebraic_rules` are matched against operand lists
+containing moderately large expressions. Almost all of these matches fail.
+The benchmark compares the default matching (where the reason for a failed
+match is only generated on demand) with matching where the reason of every
+failed match is evaluated, which corresponds to the earlier behavior of
+:meth:`.Pattern.match` generating the reason string eagerly.
+
+Run as::
+
+    python benchmarks/bench_rule_matching.py
+"""
+import timeit
+
+import sympy
+
+from qnet import (
+    LocalSpace, Destroy, OperatorSymbol, KetSymbol, BasisKet, SPre,
+    CircuitSymbol, ZeroOperator, Expression)
+from qnet.algebra.pattern_matching import ProtoExpr, match_pattern, Pattern
+
+
+def all_subclasses(cls):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from all_subclasses(subclass)
+
+
+def rule_patterns():
+    """List of all patterns in the algebraic rules"""
+    patterns = []
+    for cls in set(all_subclasses(Expression)):
+        for attr in ['_rules', '_binary_rules']:
+            rules = cls.__dict__.get(attr, {})
+            patterns.extend(pat for (pat, replacement) in rules.values())
+    return patterns
+
+
+def operand_lists():
+    """List of operand lists for typical `create` calls"""
+    hs = [LocalSpace(i, dimension=5) for i in range(3)]
+    a = [Destroy(hs=h) for h in hs]
+    g = sympy.symbols('g0:3')
+    H = sum(
+        (g[i] * (a[i].dag() * a[(i+1) % 3] + a[i] * a[(i+2) % 3].dag())
+         for i in range(3)), ZeroOperator)
+    A = OperatorSymbol('A', hs=hs[0])
+    psi = KetSymbol('Psi', hs=hs[0])
+    return [
+        [H, A], [g[0], H], [A, H.dag()], [H], [2, A],
+        [psi, BasisKet(1, hs=hs[0])], [H, psi], [SPre(H), SPre(A)],
+        [CircuitSymbol('C', cdim=2), CircuitSymbol('D', cdim=2)]]
+
+
+def match_all(patterns, exprs, evaluate_reason):
+    for pat in patterns:
+        for expr in exprs:
+            match_dict = match_pattern(pat, expr)
+            if evaluate_reason and not match_dict:
+                match_dict.reason
+
+
+def main(number=5, repeat=3):
+    patterns = rule_patterns()
+    exprs = [ProtoExpr(ops, {}) for ops in operand_lists()]
+    print("Matching %d rule patterns against %d operand lists"
+          % (len(patterns), len(exprs)))
+    timings = {}
+    for compiled in [False, True]:
+        Pattern.compiled_matching = compiled
+        for evaluate_reason in [True, False]:
+            label = "%s, %s reasons" % (
+                "compiled" if compiled else "interpreted",
+                "eager" if evaluate_reason else "lazy")
+            timings[label] = min(timeit.repeat(
+                lambda: match_all(patterns, exprs, evaluate_reason),
+                number=number, repeat=repeat)) / number
+            print("%-30s %8.2f ms" % (label, 1000 * timings[label]))
+    Pattern.compiled_matching = False
+    return timings
+
+
+if __name__ == '__main__':
+    main()
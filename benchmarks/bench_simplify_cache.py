@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""Benchmark the memoization of scalar simplifications
+
+The same symbolic coefficients are simplified over and over when an SLH model
+is built up step by step (each call to :meth:`.SLH.simplify_scalar`,
+:func:`.move_drive_to_H`, etc. re-simplifies all coefficients). This
+benchmark repeatedly simplifies the SLH model of a chain of driven cavities,
+starting from an empty cache and re-using the memoized results of
+:func:`sympy.simplify` from earlier calls, and reports the cache statistics.
+
+Run as::
+
+    python benchmarks/bench_simplify_cache.py
+"""
+import timeit
+
+import sympy
+
+from qnet import (
+    Destroy, SLH, identity_matrix, simplify_scalar_cache_info,
+    clear_simplify_scalar_cache, move_drive_to_H)
+
+
+def cavity_chain(n_cavities=4):
+    """SLH model for a chain of `n_cavities` driven cavities, with
+    coefficients that are not in their simplest form"""
+    kappa = sympy.symbols('kappa_1:%d' % (n_cavities + 1), positive=True)
+    alpha = sympy.symbols('alpha_1:%d' % (n_cavities + 1))
+    Delta = sympy.symbols('Delta_1:%d' % (n_cavities + 1), real=True)
+    a = [Destroy(hs='c%d' % i) for i in range(n_cavities)]
+    L = [[sympy.sqrt(kappa[i]) * (a[i] + alpha[i] * (kappa[i] + 1) /
+                                  (2 * kappa[i] + 2))]
+         for i in range(n_cavities)]
+    H = sum(
+        (((Delta[i]**2 - 1) / (Delta[i] + 1)) * a[i].dag() * a[i]
+         for i in range(n_cavities)), 0 * a[0])
+    return SLH(identity_matrix(n_cavities), L, H)
+
+
+def main(number=1, repeat=3):
+    slh = cavity_chain()
+
+    def simplify():
+        move_drive_to_H(slh).simplify_scalar()
+
+    def simplify_uncached():
+        clear_simplify_scalar_cache()
+        simplify()
+
+    print("SLH model with %d channels" % slh.cdim)
+    for label, func in [
+            ('cold cache', simplify_uncached),
+            ('warm cache', simplify)]:
+        clear_simplify_scalar_cache()
+        time = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+        print("    %-26s %10.2f ms" % (label, 1000 * time))
+    print(simplify_scalar_cache_info())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""Benchmark the strategies for the simplification of scalar coefficients
+
+Times :func:`.connect` for a ring of cavities and beamsplitters (with the
+circuit expanded and simplified after every feedback connection), and
+:func:`.move_drive_to_H` on the resulting model with coherent drives, once
+for each simplification strategy (see
+:mod:`qnet.algebra.core.scalar_simplification`), and reports the size of the
+resulting Hamiltonian. The memoization of simplifications is reset before each
+run.
+
+Run as::
+
+    python benchmarks/bench_simplify_strategies.py
+"""
+import timeit
+
+import sympy
+from sympy.core.cache import clear_cache
+
+from qnet import (
+    Destroy, SLH, Beamsplitter, connect, move_drive_to_H, identity_matrix,
+    clear_simplify_scalar_cache, ascii)
+
+
+def cavity(i):
+    """Single-mode cavity with one input/output port"""
+    kappa = sympy.symbols('kappa_%d' % i, positive=True)
+    Delta = sympy.symbols('Delta_%d' % i, real=True)
+    a = Destroy(hs='c%d' % i)
+    return SLH([[1]], [[sympy.sqrt(kappa) * a]], Delta * a.dag() * a)
+
+
+def cavity_ring(n_cavities=2):
+    """Components and connections of `n_cavities` cavities coupled through
+    beamsplitters in a ring"""
+    components = []
+    connections = []
+    for i in range(n_cavities):
+        theta = sympy.symbols('theta_%d' % i, real=True)
+        components.extend(
+            [cavity(i), Beamsplitter(label='BS%d' % i, mixing_angle=theta)])
+    for i in range(n_cavities):
+        cav, bs = 2 * i, 2 * i + 1
+        next_cav = (2 * i + 2) % (2 * n_cavities)
+        connections.append(((cav, 0), (bs, 'in')))
+        connections.append(((bs, 'tr'), (next_cav, 0)))
+    return components, connections
+
+
+def main(number=1, repeat=3):
+    components, connections = cavity_ring()
+    alpha = sympy.symbols('alpha_1:3')
+    for strategy in ['simplify', 'auto', 'expand']:
+
+        def setup():
+            clear_cache()
+            clear_simplify_scalar_cache()
+
+        def run_connect():
+            return connect(
+                components, connections, force_SLH=True,
+                simplify_strategy=strategy)
+
+        slh = run_connect()
+        driven = (slh << SLH(
+            identity_matrix(len(alpha)), [[a] for a in alpha], 0)).toSLH()
+
+        def run_move_drive_to_H():
+            return move_drive_to_H(driven, simplify_strategy=strategy)
+
+        print("strategy %r" % strategy)
+        for label, func in [
+                ('connect', run_connect),
+                ('move_drive_to_H', run_move_drive_to_H)]:
+            time = min(timeit.repeat(
+                func, setup=setup, number=number, repeat=repeat)) / number
+            print("    %-26s %10.2f ms" % (label, 1000 * time))
+        print("    len(ascii(H))              %10d"
+              % len(ascii(run_move_drive_to_H().H)))
+
+
+if __name__ == '__main__':
+    main()
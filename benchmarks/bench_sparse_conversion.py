@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""Benchmark the conversion of Hamiltonians to sparse matrices
+
+The Hamiltonian of a chain of Jaynes-Cummings systems (cavity modes coupled
+to two-level atoms, with hopping between neighboring cavities) is converted
+for an increasing number of sites, both to a :class:`qutip.Qobj` via
+:func:`.convert_to_qutip`, and directly to a :class:`scipy.sparse.csr_matrix`
+via :func:`.convert_to_scipy_sparse`. The caches of local operators are
+cleared before every conversion.
+
+Run as::
+
+    python benchmarks/bench_sparse_conversion.py
+"""
+import timeit
+
+from qnet import (
+    LocalSpace, Destroy, LocalSigma, ZeroOperator, convert_to_qutip,
+    convert_to_scipy_sparse)
+from qnet.convert import to_qutip, to_scipy_sparse
+
+
+def jaynes_cummings_chain(n_sites, n_fock=5):
+    """Hamiltonian for a chain of `n_sites` Jaynes-Cummings systems"""
+    H = ZeroOperator
+    a = []
+    for i in range(n_sites):
+        a.append(Destroy(hs=LocalSpace('c%d' % i, dimension=n_fock)))
+        sigma = LocalSigma(
+            'g', 'e', hs=LocalSpace('q%d' % i, basis=('g', 'e')))
+        H += (1.0 * a[i].dag() * a[i] + 0.9 * sigma.dag() * sigma +
+              0.1 * (a[i].dag() * sigma + sigma.dag() * a[i]))
+    for i in range(n_sites - 1):
+        H += 0.05 * (a[i].dag() * a[i+1] + a[i+1].dag() * a[i])
+    return H
+
+
+def main(max_sites=5, repeat=3):
+
+    def to_qobj(H):
+        to_qutip._LOCAL_OPERATOR_CACHE.clear()
+        return convert_to_qutip(H)
+
+    def to_csr(H):
+        to_scipy_sparse._LOCAL_OPERATOR_CACHE.clear()
+        return convert_to_scipy_sparse(H)
+
+    print("%6s %10s %14s %14s" % ("sites", "dimension", "qutip", "scipy"))
+    for n_sites in range(1, max_sites + 1):
+        H = jaynes_cummings_chain(n_sites)
+        number = max(1, 3 // n_sites)
+        times = [
+            min(timeit.repeat(
+                lambda: convert(H), number=number, repeat=repeat)) / number
+            for convert in [to_qobj, to_csr]]
+        print("%6d %10d %11.2f ms %11.2f ms" % (
+            n_sites, H.space.dimension, 1000 * times[0], 1000 * times[1]))
+
+
+if __name__ == '__main__':
+    main()
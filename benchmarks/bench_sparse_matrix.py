@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""Benchmark SLH algebra with dense and sparse scattering matrices
+
+Compares the series product, feedback, and concatenation of SLH models with
+a large channel dimension, and the reduction of a network with
+:func:`.connect`, with S and L stored as dense :class:`.Matrix` or as
+:class:`.SparseMatrix` instances (see :func:`.set_sparse_matrix_threshold`).
+
+Each run starts with empty instance, SymPy, and simplification caches.
+
+Run as::
+
+    python benchmarks/bench_sparse_matrix.py
+"""
+import timeit
+from functools import reduce
+
+import sympy
+from sympy.core.cache import clear_cache
+
+from qnet import (
+    Destroy, SLH, Beamsplitter, Expression, connect, map_channels,
+    clear_simplify_scalar_cache, set_sparse_matrix_threshold,
+    temporary_instance_cache)
+
+
+def cavity(i):
+    """Single-mode cavity with one input/output port"""
+    kappa = sympy.symbols('kappa_%d' % i, positive=True)
+    Delta = sympy.symbols('Delta_%d' % i, real=True)
+    a = Destroy(hs='c%d' % i)
+    return SLH([[1]], [[sympy.sqrt(kappa) * a]], Delta * a.dag() * a)
+
+
+def components(n):
+    """`n` pairs of a cavity and a beamsplitter"""
+    result = []
+    for i in range(n):
+        result.extend([
+            cavity(i),
+            Beamsplitter(label='BS%d' % i, mixing_angle=sympy.pi/3)])
+    return result
+
+
+def concatenation(n):
+    """Concatenation of the SLH models of `n` cavities and beamsplitters"""
+    return reduce(
+        lambda a, b: a.concatenate_slh(b),
+        [c.toSLH() for c in components(n)])
+
+
+def series_with_permutation(n):
+    """Series product of the concatenation with a channel permutation"""
+    slh = concatenation(n)
+    perm = map_channels({0: slh.cdim - 1}, slh.cdim).toSLH()
+    return perm.series_with_slh(slh).series_with_slh(perm)
+
+
+def feedback(n):
+    """Feedback from the first cavity into the first beamsplitter"""
+    return concatenation(n).feedback(out_port=0, in_port=1)
+
+
+def ring(n):
+    """`n` cavities, each followed by a beamsplitter whose transmitted output
+    feeds into the next cavity, with the last one feeding into the first"""
+    connections = []
+    for i in range(n):
+        connections.append(((2 * i, 0), (2 * i + 1, 'in')))
+        connections.append(((2 * i + 1, 'tr'), ((2 * i + 2) % (2 * n), 0)))
+    return connect(components(n), connections, force_SLH=True)
+
+
+def main(number=1, repeat=3):
+    orig_threshold = set_sparse_matrix_threshold(None)
+    try:
+        for (name, func, sizes) in [
+                ('concatenation', concatenation, [8, 16, 32]),
+                ('series_with_permutation', series_with_permutation,
+                 [8, 16, 32]),
+                ('feedback', feedback, [8, 16, 32]),
+                ('ring', ring, [3, 6])]:
+            for n in sizes:
+                print("%s(%d)" % (name, n))
+                for threshold in [None, orig_threshold]:
+
+                    def run():
+                        clear_cache()
+                        clear_simplify_scalar_cache()
+                        with temporary_instance_cache(Expression):
+                            func(n)
+
+                    set_sparse_matrix_threshold(threshold)
+                    time = min(timeit.repeat(
+                        run, number=number, repeat=repeat)) / number
+                    label = 'dense' if threshold is None else (
+                        'sparse (threshold %d)' % threshold)
+                    print("    %-26s %10.3f s" % (label, time))
+    finally:
+        set_sparse_matrix_threshold(orig_threshold)
+
+
+if __name__ == '__main__':
+    main()
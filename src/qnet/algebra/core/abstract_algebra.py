@@ -24,9 +24,10 @@ from .exceptions import CannotSimplify
 from ..pattern_matching import ProtoExpr
 from ...utils.singleton import Singleton
 from ...utils.containers import nested_tuple
+from ...utils.cache import UnboundedCache
 
 __all__ = [
-    'Expression', 'Operation', 'substitute']
+    'Expression', 'Operation', 'substitute', 'batch_substitute']
 
 __private__ = []  # anything not in __all__ must be in __private__
 
@@ -66,6 +67,10 @@ class Expression(metaclass=ABCMeta):
             class method should cache the instantiation of instances. If True,
             repeated calls to :meth:`create` with the same arguments return
             instantly, instead of re-evaluating all simplifications and rules.
+            The cached instances are stored in a cache backend (by default an
+            :class:`.UnboundedCache`) that may be replaced e.g. by a
+            size-bounded :class:`.LRUCache` through
+            :func:`.set_instance_cache`.
         simplifications (list): List of callable simplifications that
             :meth:`create` will use to process its positional and keyword
             arguments. Each callable must take three parameters (the class, the
@@ -84,8 +89,11 @@ class Expression(metaclass=ABCMeta):
     simplifications = []
 
     # we cache all instances of Expressions for fast construction
-    _instances = {}
+    _instances = UnboundedCache()
     instance_caching = True
+    # If False (cf. `_no_instance_cache_stores`), the instance cache is still
+    # used for lookups, but newly created instances are not stored
+    _store_instances = True
 
     # eventually, we should ensure that the create method is idempotent, i.e.
     # expr.create(*expr.args, **expr.kwargs) == expr(*expr.args, **expr.kwargs)
@@ -129,16 +137,16 @@ class Expression(metaclass=ABCMeta):
                 "%s%s.create(*args, **kwargs); args = %s, kwargs = %s",
                 ("  " * LEVEL), cls.__name__, args, kwargs)
             LEVEL += 1
-        key = cls._get_instance_key(args, kwargs)
-        try:
-            if cls.instance_caching:
+        if cls.instance_caching:
+            key = cls._get_instance_key(args, kwargs)
+            try:
                 instance = cls._instances[key]
                 if LOG:
                     LEVEL -= 1
                     logger.debug("%s(cached)-> %s", ("  " * LEVEL), instance)
                 return instance
-        except KeyError:
-            pass
+            except KeyError:
+                pass
         for i, simplification in enumerate(cls.simplifications):
             if LOG:
                 try:
@@ -155,9 +163,10 @@ class Expression(metaclass=ABCMeta):
             except (TypeError, ValueError):
                 # We assume that if the simplification didn't return a tuple,
                 # the result is a fully instantiated object
-                if cls.instance_caching:
+                store = cls.instance_caching and cls._store_instances
+                if store:
                     cls._instances[key] = simplified
-                if cls._create_idempotent and cls.instance_caching:
+                if cls._create_idempotent and store:
                     try:
                         key2 = simplified._instance_key
                         if key2 != key:
@@ -174,9 +183,10 @@ class Expression(metaclass=ABCMeta):
         if len(kwargs) > 0:
             cls._has_kwargs = True
         instance = cls(*args, **kwargs)
-        if cls.instance_caching:
+        store = cls.instance_caching and cls._store_instances
+        if store:
             cls._instances[key] = instance
-        if cls._create_idempotent and cls.instance_caching:
+        if cls._create_idempotent and store:
             key2 = cls._get_instance_key(args, kwargs)
             if key2 != key:
                 cls._instances[key2] = instance  # instantiated key
@@ -250,6 +260,8 @@ class Expression(metaclass=ABCMeta):
             a context in which rules may be defined locally.
         """
         from qnet.utils.check_rules import check_rules_dict
+        from qnet.algebra.core.algebraic_properties import (
+            _invalidate_rules_indices)
         if attr is None:
             attr = cls._rules_attr()
         if name in getattr(cls, attr):
@@ -257,6 +269,7 @@ class Expression(metaclass=ABCMeta):
                 "Duplicate key '%s': rule already exists" % name)
         getattr(cls, attr).update(check_rules_dict(
             [(name, (pattern, replacement))]))
+        _invalidate_rules_indices()
 
     @classmethod
     def show_rules(cls, *names, attr=None):
@@ -310,6 +323,8 @@ class Expression(metaclass=ABCMeta):
             KeyError: If any rules in `names` does not exist
             AttributeError: If invalid `attr`
         """
+        from qnet.algebra.core.algebraic_properties import (
+            _invalidate_rules_indices)
         if attr is None:
             attr = cls._rules_attr()
         if len(names) == 0:
@@ -318,6 +333,7 @@ class Expression(metaclass=ABCMeta):
         else:
             for name in names:
                 del getattr(cls, attr)[name]
+        _invalidate_rules_indices()
 
     @classmethod
     def rules(cls, attr=None):
@@ -404,19 +420,18 @@ class Expression(metaclass=ABCMeta):
         cost of possibly not returning a maximally simplified expression. The
         `safe` keyword is not handled recursively, i.e. any `args`/`kwargs`
         will be fully simplified, possibly changing their types.
+
+        The expression tree is traversed iteratively (see
+        :class:`_SubstitutionPlan`), so that there is no limit on its depth.
+        Sub-expressions that are not affected by the substitution are
+        returned unchanged, without being re-created.
         """
         if self in var_map:
             if not safe or (type(var_map[self]) == type(self)):
                 return var_map[self]
         if isinstance(self.__class__, Singleton):
             return self
-        new_args = [substitute(arg, var_map) for arg in self.args]
-        new_kwargs = {key: substitute(val, var_map)
-                      for (key, val) in self.kwargs.items()}
-        if safe:
-            return self.__class__(*new_args, **new_kwargs)
-        else:
-            return self.create(*new_args, **new_kwargs)
+        return _SubstitutionPlan(self).evaluate(var_map, safe=safe)
 
     def doit(self, classes=None, recursive=True, **kwargs):
         """Rewrite (sub-)expressions in a more explicit form
@@ -691,6 +706,151 @@ def substitute(expr, var_map):
         return expr
 
 
+def batch_substitute(expr, var_maps):
+    """Perform :func:`substitute` for each of the given `var_maps`
+
+    This is equivalent to ``[substitute(expr, var_map) for var_map in
+    var_maps]``, but the expression tree of `expr` is traversed only once, and
+    every sub-expression that occurs multiple times in `expr` is processed
+    only once for every `var_map`. This is useful e.g. for substituting a
+    large number of numerical values for the symbols in an expression.
+
+    Args:
+        expr: The expression in which to perform the substitutions
+        var_maps (list): The substitution dictionaries
+
+    Returns:
+        list: the result of the substitution for each dictionary in `var_maps`
+    """
+    if _substitute_is_generic(expr.__class__):
+        plan = _SubstitutionPlan(expr)
+        return [plan.evaluate(var_map) for var_map in var_maps]
+    else:
+        return [substitute(expr, var_map) for var_map in var_maps]
+
+
+_GENERIC_SUBSTITUTE = {}  # class => bool, cf. `_substitute_is_generic`
+
+
+def _substitute_is_generic(cls):
+    """Check whether instances of `cls` are substituted by
+    :meth:`Expression._substitute`, based on their `args` and `kwargs` only"""
+    try:
+        return _GENERIC_SUBSTITUTE[cls]
+    except KeyError:
+        is_generic = (
+            issubclass(cls, Expression) and
+            not isinstance(cls, Singleton) and
+            cls.substitute is Expression.substitute and
+            cls._substitute is Expression._substitute)
+        _GENERIC_SUBSTITUTE[cls] = is_generic
+        return is_generic
+
+
+class _SubstitutionPlan():
+    """Expression tree of `expr`, flattened for :func:`substitute`
+
+    The attribute `nodes` is a list of all distinct objects in the tree, in
+    post-order (i.e., every object appears after all its `args` and `kwargs`).
+    An object that occurs several times in the tree (the same object, not just
+    an equal object) appears only once. Each element of `nodes` is a tuple
+    ``(obj, arg_indices, kwarg_indices)``, where `arg_indices` is a list of
+    indices in `nodes` for the `args` of `obj`, and `kwarg_indices` is a list
+    of tuples ``(key, index)`` for the `kwargs`. The traversal does not
+    descend into any object for which :func:`_substitute_is_generic` is False:
+    for these, `arg_indices` and `kwarg_indices` are None, and the
+    substitution is delegated to :func:`substitute`.
+
+    The tree is traversed without recursion.
+    """
+
+    def __init__(self, expr):
+        nodes = []
+        indices = {}  # id(obj) => index in `nodes`
+        stack = [(expr, None, None)]
+        while len(stack) > 0:
+            obj, args, kwargs = stack.pop()
+            if id(obj) in indices:
+                continue
+            if args is None:
+                if not _substitute_is_generic(obj.__class__):
+                    indices[id(obj)] = len(nodes)
+                    nodes.append((obj, None, None))
+                    continue
+                # Note that `args` and `kwargs` may be properties that return
+                # new objects. Thus, we must hold on to the same objects
+                # whose `id` is used in `indices`
+                args = tuple(obj.args)
+                kwargs = tuple(obj.kwargs.items())
+                stack.append((obj, args, kwargs))
+                for child in reversed(args + tuple(v for (k, v) in kwargs)):
+                    if id(child) not in indices:
+                        stack.append((child, None, None))
+            else:
+                arg_indices = [indices[id(arg)] for arg in args]
+                kwarg_indices = [
+                    (key, indices[id(val)]) for (key, val) in kwargs]
+                indices[id(obj)] = len(nodes)
+                nodes.append((obj, arg_indices, kwarg_indices))
+                # Calculate (and cache) the hash of `obj` for `var_map`
+                # lookups, bottom-up to avoid recursion
+                hash(obj)
+        self.nodes = nodes
+
+    def _needed(self, var_map, safe):
+        """List that indicates for every node whether its substitution must
+        be calculated. This excludes nodes that only occur inside
+        sub-expressions that are directly replaced via `var_map`. For a
+        needed node that is replaced via `var_map`, the corresponding entry is
+        the replacement, wrapped in a tuple."""
+        nodes = self.nodes
+        needed = [False] * len(nodes)
+        needed[-1] = True
+        for i in range(len(nodes) - 1, -1, -1):
+            obj, arg_indices, kwarg_indices = nodes[i]
+            if needed[i] and arg_indices is not None:
+                if obj in var_map:
+                    replacement = var_map[obj]
+                    if (i < len(nodes) - 1 or not safe or
+                            type(replacement) == type(obj)):
+                        needed[i] = (replacement, )
+                        continue
+                for j in arg_indices:
+                    needed[j] = True
+                for (key, j) in kwarg_indices:
+                    needed[j] = True
+        return needed
+
+    def evaluate(self, var_map, safe=False):
+        """Return the result of substituting `var_map` in the expression
+        (cf. :meth:`Expression._substitute` for `safe`)"""
+        nodes = self.nodes
+        needed = self._needed(var_map, safe)
+        results = [None] * len(nodes)
+        for i, (obj, arg_indices, kwarg_indices) in enumerate(nodes):
+            if needed[i] is False:
+                continue
+            elif needed[i] is not True:
+                results[i] = needed[i][0]
+            elif arg_indices is None:
+                results[i] = substitute(obj, var_map)
+            else:
+                new_args = [results[j] for j in arg_indices]
+                new_kwargs = {key: results[j] for (key, j) in kwarg_indices}
+                if i == len(nodes) - 1 and safe:
+                    results[i] = obj.__class__(*new_args, **new_kwargs)
+                    continue
+                unchanged = all(
+                    results[j] is nodes[j][0] for j in arg_indices)
+                unchanged = unchanged and all(
+                    results[j] is nodes[j][0] for (_, j) in kwarg_indices)
+                if unchanged:
+                    results[i] = obj
+                else:
+                    results[i] = obj.create(*new_args, **new_kwargs)
+        return results[-1]
+
+
 def _apply_rules_no_recurse(expr, rules):
     """Non-recursively match expr again all rules"""
     try:
@@ -10,17 +10,21 @@ and superoperators.
 import re
 from abc import ABCMeta, abstractmethod
 from collections import defaultdict, OrderedDict
-from itertools import product as cartesian_product
+from itertools import chain, product as cartesian_product
 
 import sympy
 from sympy import Symbol, sympify
 
 from .hilbert_space_algebra import ProductSpace, LocalSpace, TrivialSpace
 from .abstract_algebra import Operation, Expression, substitute
-from .algebraic_properties import derivative_via_diff
+from .algebraic_properties import (
+    derivative_via_diff, group_summands, collected_summands)
 from .indexed_operations import IndexedSum
+from .scalar_simplification import simplification_strategy
 from ...utils.ordering import (
     DisjunctCommutativeHSOrder, FullCommutativeHSOrder, KeyTuple, )
+from ...utils.cache import LRUCache
+from ...utils.parallel import map_unique
 from ...utils.indices import (
     SymbolicLabelBase, IndexOverList, IndexOverFockSpace, IndexOverRange)
 
@@ -30,11 +34,15 @@ __all__ = [
     'QuantumPlus', 'QuantumTimes', 'SingleQuantumOperation', 'QuantumAdjoint',
     'QuantumSymbol', 'QuantumIndexedSum', 'QuantumDerivative', 'Sum']
 __private__ = [
-    'ensure_local_space']
+    'ensure_local_space', 'simplify_scalar_parallel']
 
 
 _sympyOne = sympify(1)
 
+#: maximum number of memoized results of scalar simplifications (see
+#: :func:`.simplify_scalar_cache_info`)
+SIMPLIFY_SCALAR_CACHE_SIZE = 4096
+
 
 class QuantumExpression(Expression, metaclass=ABCMeta):
     """Base class for expressions associated with a Hilbert space"""
@@ -49,6 +57,8 @@ class QuantumExpression(Expression, metaclass=ABCMeta):
     _indexed_sum_cls = None  # class for indexed sum
     _default_hs_cls = None  # class for implicit Hilbert spaces (str, int)
     # _default_hs_cls is set by `init_algebra`
+    _simplify_scalar_strategy = 'simplify'  # default for `simplify_scalar`
+    # _simplify_scalar_strategy is set by `set_simplify_scalar_strategy`
 
     _order_index = 0  # index of "order group": things that should go together
     _order_coeff = 1  # scalar prefactor
@@ -116,14 +126,41 @@ class QuantumExpression(Expression, metaclass=ABCMeta):
     def _expand(self):
         return self
 
-    def simplify_scalar(self, func=sympy.simplify):
+    def simplify_scalar(self, func=None, processes=None):
         """Simplify all scalar symbolic (SymPy) coefficients by appyling `func`
-        to them"""
-        return self._simplify_scalar(func=func)
+        to them
+
+        Instead of a function, `func` may be the name of a simplification
+        strategy (see :mod:`~qnet.algebra.core.scalar_simplification`). If
+        None, the strategy set with :func:`.set_simplify_scalar_strategy` is
+        used, which by default is :func:`sympy.simplify`.
+        The results of `func` are memoized across calls (see
+        :func:`.simplify_scalar_cache_info`). If `processes` is an integer
+        greater than 1, the unique coefficients are simplified in parallel, in
+        a pool of `processes` worker processes (see
+        :func:`simplify_scalar_parallel`).
+        """
+        if processes is None:
+            return self._simplify_scalar(func=_memoized_simplification(func))
+        return simplify_scalar_parallel(
+            self._simplify_scalar, func=func, processes=processes)
 
     def _simplify_scalar(self, func):
         return self
 
+    def parameter_sweep(self, params, values, full_space=None):
+        """Numerical (qutip) representation of the expression for many
+        numerical values of its parameters
+
+        Equivalent to substituting each row of `values` for `params` and
+        converting the result via :func:`.convert_to_qutip`, but with the
+        symbolic processing done only once. See
+        :func:`.convert_to_qutip_sweep` for details.
+        """
+        from qnet.convert.to_qutip import convert_to_qutip_sweep
+        return convert_to_qutip_sweep(
+            self, params, values, full_space=full_space)
+
     def diff(self, sym: Symbol, n: int = 1, expand_simplify: bool = True):
         """Differentiate by scalar parameter `sym`.
 
@@ -485,9 +522,37 @@ class QuantumPlus(QuantumOperation, metaclass=ABCMeta):
                 "%s requires at least two operands" % self.__class__.__name__)
         super().__init__(*operands, **kwargs)
 
+    @classmethod
+    def from_terms(cls, terms):
+        """Instantiate the sum of all `terms` while applying simplification
+        rules
+
+        Equivalent to ``cls.create(*terms)``, but `terms` may be an arbitrary
+        iterable (e.g., a generator). The terms are consumed one by one, with
+        nested sums flattened and terms that differ only in their scalar
+        coefficient grouped (without evaluating intermediate sums), so that
+        only the collected terms are passed to :meth:`create`.
+
+        >>> A, B = OperatorSymbol('A', hs=0), OperatorSymbol('B', hs=0)
+        >>> OperatorPlus.from_terms(i * A + B for i in range(1, 4))
+        3 * B^(0) + 6 * A^(0)
+        """
+        return cls.create(*collected_summands(cls._group_terms(terms)))
+
+    @classmethod
+    def _group_terms(cls, terms):
+        """Group the summands of all `terms`, see :func:`.group_summands`"""
+        groups = OrderedDict()
+        for term in terms:
+            if isinstance(term, cls):
+                group_summands(term.operands, groups)
+            else:
+                group_summands((term, ), groups)
+        return groups
+
     def _expand(self):
-        summands = [o.expand() for o in self.operands]
-        return self.__class__._plus_cls.create(*summands)
+        return self.__class__._plus_cls.from_terms(
+            o.expand() for o in self.operands)
 
     def _series_expand(self, param, about, order):
         tuples = (o.series_expand(param, about, order) for o in self.operands)
@@ -593,6 +658,8 @@ class ScalarTimesQuantumExpression(
             sc = substitute(self.coeff, var_map)
         if safe:
             return self.__class__(sc, st)
+        elif sc is self.coeff and st is self.term:
+            return self
         else:
             return sc * st
 
@@ -605,14 +672,24 @@ class ScalarTimesQuantumExpression(
 
     @property
     def _order_key(self):
-        from qnet.printing.asciiprinter import QnetAsciiDefaultPrinter
-        ascii = QnetAsciiDefaultPrinter().doprint
+        from qnet.algebra.core.scalar_algebra import (
+            Scalar, _numeric_order_str)
         t = self.term._order_key
-        try:
-            c = abs(float(self.coeff))  # smallest coefficients first
-        except (ValueError, TypeError):
+        val = getattr(self.coeff, 'val', None)
+        if isinstance(val, sympy.Basic) and len(val.free_symbols) > 0:
+            # shortcut: float() would fail only after a costly evalf
             c = float('inf')
-        return KeyTuple(t[:2] + (c,) + t[3:] + (ascii(self.coeff),))
+        else:
+            try:
+                c = abs(float(self.coeff))  # smallest coefficients first
+            except (ValueError, TypeError):
+                c = float('inf')
+        if val.__class__ in Scalar._numeric_types:
+            label = _numeric_order_str(val)
+        else:
+            from qnet.printing.asciiprinter import QnetAsciiDefaultPrinter
+            label = QnetAsciiDefaultPrinter().doprint(self.coeff)
+        return KeyTuple(t[:2] + (c,) + t[3:] + (label,))
 
     @property
     def space(self):
@@ -1101,24 +1178,170 @@ def _evaluate_at(expr, sym, val):
         return expr.substitute({sym: val})
 
 
+def simplify_scalar_parallel(simplify, func, processes):
+    """Evaluate `simplify` with scalar simplifications in worker processes
+
+    Args:
+        simplify (callable): function that receives a scalar simplification
+            function as its only argument and applies it to all scalar
+            coefficients of some expression, e.g. the
+            :meth:`~QuantumExpression._simplify_scalar` method of a
+            :class:`QuantumExpression`
+        func (callable or str or None): simplification function for scalar
+            coefficients, or the name of a simplification strategy, or None
+            for the default strategy (see
+            :meth:`QuantumExpression.simplify_scalar`)
+        processes (int): number of worker processes
+
+    The `simplify` function is evaluated twice: once to record all scalar
+    coefficients, and once more to substitute the simplified coefficients.
+    In between, `func` is applied to each unique coefficient that does not
+    have a memoized result (see :func:`.simplify_scalar_cache_info`),
+    distributed over `processes` worker processes (see :func:`.map_unique`).
+    For a :class:`.ScalarValue`, `func` receives the wrapped SymPy value. If
+    `func` or any of the coefficients cannot be pickled, or if `processes` is
+    not greater than 1, the coefficients are simplified serially.
+    """
+    func = _memoized_simplification(func)
+    coeffs = []
+
+    def record(coeff):
+        coeffs.append(_unwrapped_scalar(coeff))
+        return coeff
+
+    simplify(record)
+    simplified = map_unique(
+        func.func, [c for c in coeffs if not func.is_memoized(c)],
+        processes=processes)
+    for ((_, coeff), result) in simplified.items():
+        func.memoize(coeff, result)
+
+    def lookup(coeff):
+        value = _unwrapped_scalar(coeff)
+        try:
+            return simplified[type(value), value]
+        except KeyError:
+            return func(coeff)
+
+    return simplify(lookup)
+
+
+def _unwrapped_scalar(coeff):
+    """The value wrapped by `coeff`, if `coeff` is a :class:`.ScalarValue`,
+    or `coeff` itself otherwise"""
+    from qnet.algebra.core.scalar_algebra import ScalarValue
+    if isinstance(coeff, ScalarValue):
+        return coeff.val
+    return coeff
+
+
+class _MemoizedSimplification():
+    """Scalar simplification function `func` whose results are memoized in
+    a cache shared by all instances
+
+    The results of ``func(coeff)`` are stored in the cache under the key
+    ``(func, type(coeff), coeff)``, which must be hashable (otherwise, the
+    result is not memoized). For a :class:`.ScalarValue`, `func` receives
+    (and the key contains) the wrapped value.
+    """
+
+    #: Cache of results, shared by all instances (see
+    #: :func:`.simplify_scalar_cache_info`)
+    cache = LRUCache(maxsize=SIMPLIFY_SCALAR_CACHE_SIZE)
+
+    def __init__(self, func):
+        self.func = func
+
+    def _key(self, coeff):
+        return (self.func, coeff.__class__, coeff)
+
+    def is_memoized(self, coeff):
+        """Check whether there is a memoized result for `coeff`"""
+        try:
+            return self._key(_unwrapped_scalar(coeff)) in self.cache
+        except TypeError:  # unhashable
+            return False
+
+    def memoize(self, coeff, result):
+        """Store `result` as the result of applying :attr:`func` to `coeff`"""
+        try:
+            self.cache[self._key(_unwrapped_scalar(coeff))] = result
+        except TypeError:  # unhashable
+            pass
+
+    def __call__(self, coeff):
+        coeff = _unwrapped_scalar(coeff)
+        try:
+            key = self._key(coeff)
+            return self.cache[key]
+        except KeyError:
+            result = self.func(coeff)
+            self.cache[key] = result
+            return result
+        except TypeError:  # unhashable
+            return self.func(coeff)
+
+
+def _memoized_simplification(func):
+    """Wrap `func` as a :class:`_MemoizedSimplification`, unless it already
+    is one
+
+    If `func` is the name of a simplification strategy, wrap the corresponding
+    function (see :func:`.simplification_strategy`). If `func` is None, use
+    the default strategy (see :func:`.set_simplify_scalar_strategy`).
+    """
+    if isinstance(func, _MemoizedSimplification):
+        return func
+    if func is None:
+        func = QuantumExpression._simplify_scalar_strategy
+    return _MemoizedSimplification(simplification_strategy(func))
+
+
 def _expand_product(factors):
+    """Distributively expand the product of all `factors`
+
+    The distributed products are generated lazily and their summands are
+    grouped by term as they are generated, so that the memory required is
+    proportional to the number of distinct terms in the result. The transient
+    products are not stored in the instance cache.
+    """
     eops = [o.expand() for o in factors]
     # store tuples of summands of all expanded factors
     eopssummands = [
         eo.operands if isinstance(eo, eo.__class__._plus_cls) else (eo,)
         for eo in eops]
-    # iterate over a cartesian product of all factor summands, form product
-    # of each tuple and sum over result
-    summands = []
-    for combo in cartesian_product(*eopssummands):
-        summand = combo[0]
-        for c in combo[1:]:
-            summand *= c
-        summands.append(summand)
-    ret = summands[0]
-    for summand in summands[1:]:
-        ret += summand
+    ret = _sum_transient_terms(_distributed_products(eopssummands))
     if isinstance(ret, ret.__class__._plus_cls):
         return ret.expand()
     else:
         return ret
+
+
+def _sum_transient_terms(terms, plus_cls=None):
+    """Sum of the (non-empty) iterable `terms`
+
+    The `terms` are consumed without storing them in the instance cache, and
+    are grouped by term as they are generated. Only the collected terms and
+    the resulting sum are stored in the instance cache. The memoization of
+    binary rules remains active throughout. If not given, `plus_cls` is
+    determined by the first term.
+    """
+    from qnet.algebra.toolbox.core import _no_instance_cache_stores
+    with _no_instance_cache_stores():
+        terms = iter(terms)
+        if plus_cls is None:
+            first = next(terms)
+            plus_cls = first.__class__._plus_cls
+            terms = chain([first], terms)
+        groups = plus_cls._group_terms(terms)
+    return plus_cls.create(*collected_summands(groups))
+
+
+def _distributed_products(eopssummands):
+    """Iterator over the products of all combinations of summands, where
+    `eopssummands` is a list of tuples of the summands of each factor"""
+    for combo in cartesian_product(*eopssummands):
+        summand = combo[0]
+        for c in combo[1:]:
+            summand *= c
+        yield summand
@@ -10,7 +10,9 @@ from sympy.concrete.delta import (
 from .abstract_algebra import LOG, LEVEL, LOG_NO_MATCH
 from .exceptions import CannotSimplify
 from ..pattern_matching import ProtoExpr, Pattern, match_pattern
+from ...utils.cache import LRUCache
 from ...utils.indices import IdxSym
+from ...utils.singleton import SingletonType
 
 __all__ = []
 __private__ = [
@@ -21,7 +23,8 @@ __private__ = [
     'disjunct_hs_zero', 'commutator_order', 'accept_bras',
     'basis_ket_zero_outside_hs', 'indexed_sum_over_const',
     'indexed_sum_over_kronecker', 'derivative_via_diff', 'collect_summands',
-    'collect_scalar_summands']
+    'collect_scalar_summands', 'group_summands', 'collected_summands',
+    'sum_coefficients']
 
 
 _RESOLVE_KRONECKER_WITH_PIECEWISE = False
@@ -51,7 +54,7 @@ def assoc(cls, ops, kwargs):
         Plus(1, 2, 3)
     """
     expanded = [(o,) if not isinstance(o, cls) else o.operands for o in ops]
-    return sum(expanded, ()), kwargs
+    return tuple(itertools.chain.from_iterable(expanded)), kwargs
 
 
 def assoc_indexed(cls, ops, kwargs):
@@ -159,29 +162,95 @@ def collect_summands(cls, ops, kwargs):
         >>> collect_summands(OperatorPlus, (B, A, -B), {})
         A^(0)
     """
+    groups = group_summands(ops)
+    fops = collected_summands(groups)
+    if len(fops) == 0:
+        return cls._zero
+    elif len(fops) == 1:
+        return fops[0]
+    else:
+        return tuple(fops), kwargs
+
+
+def group_summands(ops, groups=None):
+    """Group the summands `ops` by their term
+
+    Returns an :class:`~collections.OrderedDict` mapping each term (the summand
+    without its scalar coefficient) to a tuple ``(op, coeffs)``, where `op` is
+    the first summand with that term and `coeffs` is the list of the
+    coefficients of all summands with that term. If `groups` is given, it is
+    updated in-place instead of creating a new dict. See
+    :func:`collected_summands` for combining the groups.
+    """
     from qnet.algebra.core.abstract_quantum_algebra import (
         ScalarTimesQuantumExpression)
-    coeff_map = OrderedDict()
+    if groups is None:
+        groups = OrderedDict()
     for op in ops:
         if isinstance(op, ScalarTimesQuantumExpression):
             coeff, term = op.coeff, op.term
         else:
             coeff, term = 1, op
-        if term in coeff_map:
-            coeff_map[term] += coeff
-        else:
-            coeff_map[term] = coeff
+        try:
+            groups[term][1].append(coeff)
+        except KeyError:
+            groups[term] = (op, [coeff])
+    return groups
+
+
+def collected_summands(groups):
+    """List of summands from the `groups` returned by :func:`group_summands`
+
+    The coefficients in each group are combined in a single step (see
+    :func:`sum_coefficients`). Summands that evaluate to zero are dropped.
+    """
     fops = []
-    for (term, coeff) in coeff_map.items():
-        op = coeff * term
+    for (term, (op, coeffs)) in groups.items():
+        if len(coeffs) > 1:
+            coeff = sum_coefficients(coeffs)
+            if coeff == 0:
+                continue
+            op = coeff * term
         if not op.is_zero:
             fops.append(op)
-    if len(fops) == 0:
-        return cls._zero
-    elif len(fops) == 1:
-        return fops[0]
+    return fops
+
+
+def sum_coefficients(coeffs):
+    """Sum of a list of scalar coefficients
+
+    Purely numeric coefficients are added as Python numbers, and coefficients
+    that include sympy expressions are combined with a single
+    :class:`sympy.Add`, instead of evaluating the sum pairwise. Any other
+    coefficients (:class:`.ScalarExpression` instances) result in a single
+    :class:`.ScalarPlus`.
+
+    Example:
+        >>> sum_coefficients([1, 0.5, ScalarValue(2)])
+        3.5
+        >>> print(ascii(sum_coefficients(
+        ...     [1, sympy.Symbol('a'), ScalarValue(sympy.Symbol('a'))])))
+        2*a + 1
+    """
+    from qnet.algebra.core.scalar_algebra import (
+        Scalar, ScalarPlus, ScalarValue, Zero, One)
+    numeric_types = Scalar._numeric_types
+    vals = []
+    symbolic = False
+    for coeff in coeffs:
+        if isinstance(coeff, ScalarValue) or coeff is Zero or coeff is One:
+            coeff = coeff.val
+        if coeff.__class__ in numeric_types:
+            vals.append(coeff)
+        elif isinstance(coeff, sympy.Basic):
+            vals.append(coeff)
+            symbolic = True
+        else:
+            return ScalarPlus.create(*coeffs)
+    if symbolic:
+        return ScalarValue.create(sympy.Add(*vals))
     else:
-        return tuple(fops), kwargs
+        return ScalarValue.create(sum(vals))
 
 
 def collect_scalar_summands(cls, ops, kwargs):
@@ -211,11 +280,11 @@ def collect_scalar_summands(cls, ops, kwargs):
     # coefficiencts from ScalarTimes instead
     from qnet.algebra.core.scalar_algebra import (
         Zero, One, Scalar, ScalarTimes, ScalarValue)
-    a_0 = Zero
-    coeff_map = OrderedDict()
+    a_0 = []
+    groups = OrderedDict()
     for op in ops:
         if isinstance(op, ScalarValue) or isinstance(op, Scalar._val_types):
-            a_0 += op
+            a_0.append(op)
             continue
         elif isinstance(op, ScalarTimes):
             if isinstance(op.operands[0], ScalarValue):
@@ -227,18 +296,16 @@ def collect_scalar_summands(cls, ops, kwargs):
                 coeff, term = One, op
         else:
             coeff, term = One, op
-        if term in coeff_map:
-            coeff_map[term] += coeff
-        else:
-            coeff_map[term] = coeff
+        try:
+            groups[term][1].append(coeff)
+        except KeyError:
+            groups[term] = (op, [coeff])
+    a_0 = sum_coefficients(a_0) if a_0 else Zero
     if a_0 == Zero:
         fops = []
     else:
         fops = [a_0]
-    for (term, coeff) in coeff_map.items():
-        op = coeff * term
-        if not op.is_zero:
-            fops.append(op)
+    fops.extend(collected_summands(groups))
     if len(fops) == 0:
         return cls._zero
     elif len(fops) == 1:
@@ -247,6 +314,168 @@ def collect_scalar_summands(cls, ops, kwargs):
         return tuple(fops), kwargs
 
 
+_RULES_GENERATION = 0
+# Counter that is incremented whenever rules are added or removed via
+# `Expression.add_rule` or `Expression.del_rules` (or temporarily modified via
+# `temporary_rules`), invalidating all instances of _RulesIndex, including
+# their memoized binary replacements
+
+_RULES_INDICES = {}  # (cls, attr) => _RulesIndex
+
+
+def _invalidate_rules_indices():
+    """Invalidate the dispatch indices for all rules
+
+    This must be called whenever the `_rules` or `_binary_rules` of any class
+    are modified in-place. As the result of a rule may depend on the rules of
+    other classes, this also discards all memoized binary replacements (see
+    :func:`_get_binary_replacement`).
+    """
+    global _RULES_GENERATION
+    _RULES_GENERATION += 1
+
+
+def _rules_index(cls, attr):
+    """Return the :class:`_RulesIndex` for the rules in the `attr` class
+    attribute (``'_rules'`` or ``'_binary_rules'``) of `cls`
+
+    The index is rebuilt automatically if the class attribute has been
+    replaced (e.g. by :func:`.temporary_rules`), or if rules have been added
+    or deleted through :meth:`.Expression.add_rule` or
+    :meth:`.Expression.del_rules`.
+    """
+    rules = getattr(cls, attr)
+    index = _RULES_INDICES.get((cls, attr))
+    if (index is None or index.rules is not rules or
+            index.n_rules != len(rules) or
+            index.generation != _RULES_GENERATION):
+        index = _RulesIndex(rules)
+        _RULES_INDICES[(cls, attr)] = index
+    return index
+
+
+def _arg_head(arg):
+    """The type (or tuple of types) that an operand must have in order to be
+    matched by `arg`, which is an element of the `args` of a :class:`Pattern`.
+    None if any type might match."""
+    if isinstance(arg, Pattern):
+        return arg.head
+    elif isinstance(arg, SingletonType) and not hasattr(arg, '_hash_val'):
+        # singletons without a `_hash_val` are only equal to themselves
+        return arg.__class__
+    else:
+        return None
+
+
+def _operand_signature(pat):
+    """Signature for the operands that `pat` can match, for
+    :meth:`_RulesIndex.candidates`.
+
+    The signature is a tuple ``(heads, min_len, max_len, rest_head,
+    rest_on_left)``, where `heads` is the list of heads for the operands that
+    are matched by a single sub-pattern, `min_len` and `max_len` are the
+    minimum and maximum number of operands (`max_len` may be None), and
+    `rest_head` is the head for any operands matched by a sub-pattern with a
+    mode other than :attr:`Pattern.single`. These remaining operands are at the
+    beginning of the operands if `rest_on_left` is True, and at the end
+    otherwise. If `pat` does not restrict its operands, the signature is None.
+    """
+    if not isinstance(pat, Pattern) or pat.args is None:
+        return None
+    heads = []
+    rest_head = None
+    rest_on_left = False
+    min_len = max_len = len(pat.args)
+    for i, arg in enumerate(pat.args):
+        if isinstance(arg, Pattern) and arg.mode > Pattern.single:
+            rest_head = arg.head
+            rest_on_left = (i == 0)
+            max_len = None
+            if arg.mode == Pattern.zero_or_more:
+                min_len -= 1
+        else:
+            heads.append(_arg_head(arg))
+    return heads, min_len, max_len, rest_head, rest_on_left
+
+
+def _operands_may_match(signature, types):
+    """Check whether operands of the given `types` may match a pattern with
+    the given `signature` (see :func:`_operand_signature`)"""
+    if signature is None or len(types) == 0:
+        return True
+    heads, min_len, max_len, rest_head, rest_on_left = signature
+    n_ops = len(types)
+    if n_ops < min_len or (max_len is not None and n_ops > max_len):
+        return False
+    n_fixed = len(heads)
+    if rest_on_left:
+        fixed_types = types[n_ops - n_fixed:]
+        rest_types = types[:n_ops - n_fixed]
+    else:
+        fixed_types = types[:n_fixed]
+        rest_types = types[n_fixed:]
+    try:
+        for (type_, head) in zip(fixed_types, heads):
+            if head is not None and not issubclass(type_, head):
+                return False
+        if rest_head is not None:
+            for type_ in rest_types:
+                if not issubclass(type_, rest_head):
+                    return False
+    except TypeError:  # head is not a class (e.g. a mock)
+        return True
+    return True
+
+
+class _RulesIndex():
+    """Dispatch index for the rules of :func:`match_replace` or
+    :func:`match_replace_binary`
+
+    For a given combination of operand types, :meth:`candidates` returns the
+    (ordered) list of rules whose pattern could possibly match operands of
+    these types, based on the number of operands and the `head` of the
+    sub-pattern for each operand. All other rules are known not to match, and
+    can be skipped. The result is memoized for every combination of operand
+    types.
+
+    For binary rules, the index also holds the memoized results of
+    :func:`_get_binary_replacement` in the :attr:`replacements` cache, which
+    is bounded to :attr:`max_replacements` entries.
+
+    Args:
+        rules (dict): mapping of rule names to ``(pattern, replacement)``
+            tuples
+    """
+
+    max_entries = 1024  # max number of memoized combinations of operand types
+    max_replacements = 4096  # max number of memoized binary replacements
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.n_rules = len(rules)
+        self.generation = _RULES_GENERATION
+        self._signatures = [
+            (key, rule, _operand_signature(rule[0]))
+            for (key, rule) in rules.items()]
+        self._candidates = {}
+        self.replacements = LRUCache(maxsize=self.max_replacements)
+
+    def candidates(self, ops):
+        """List of ``(name, rule)`` tuples for all the rules that might match
+        the given operands `ops`"""
+        types = tuple([type(op) for op in ops])
+        try:
+            return self._candidates[types]
+        except KeyError:
+            if len(self._candidates) >= self.max_entries:
+                self._candidates.clear()
+            candidates = [
+                (key, rule) for (key, rule, signature) in self._signatures
+                if _operands_may_match(signature, types)]
+            self._candidates[types] = candidates
+            return candidates
+
+
 def match_replace(cls, ops, kwargs):
     """Match and replace a full operand specification to a function that
     provides a replacement for the whole expression
@@ -290,11 +519,13 @@ def match_replace(cls, ops, kwargs):
         >>> X.create(1,1)
         1
 
+    Only rules whose pattern can match the number and types of the operands
+    are tried, see :func:`_rules_index`.
     """
     expr = ProtoExpr(ops, kwargs)
     if LOG:
         logger = logging.getLogger('QNET.create')
-    for key, rule in cls._rules.items():
+    for key, rule in _rules_index(cls, '_rules').candidates(ops):
         pat, replacement = rule
         match_dict = match_pattern(pat, expr)
         if match_dict:
@@ -321,11 +552,41 @@ def match_replace(cls, ops, kwargs):
 
 
 def _get_binary_replacement(first, second, cls):
-    """Helper function for match_replace_binary"""
+    """Helper function for match_replace_binary
+
+    Return the result of the first binary rule of `cls` that applies to the
+    pair of operands `first`, `second`, or None if no rule applies. The
+    result is memoized (unless instance caching is disabled for `cls`, or
+    rules are logged), as :func:`_match_replace_binary_combine` tends to
+    process the same pair of adjacent operands many times. The memoized
+    results are discarded when any rules change, see
+    :func:`_invalidate_rules_indices`. Statistics for the memoization are
+    available through :func:`.binary_rules_cache_info`.
+    """
+    index = _rules_index(cls, '_binary_rules')
+    if LOG or not cls.instance_caching:
+        return _binary_replacement(first, second, cls, index)
+    # The types are part of the key, as e.g. `1 == 1.0`
+    key = (type(first), first, type(second), second)
+    replacements = index.replacements
+    try:
+        return replacements[key]
+    except KeyError:
+        replaced = _binary_replacement(first, second, cls, index)
+        replacements[key] = replaced
+        return replaced
+    except TypeError:  # unhashable operands
+        return _binary_replacement(first, second, cls, index)
+
+
+def _binary_replacement(first, second, cls, index):
+    """Apply the first matching rule in the :class:`_RulesIndex` `index` of
+    the binary rules of `cls` to `first` and `second`, cf.
+    :func:`_get_binary_replacement`"""
     expr = ProtoExpr([first, second], {})
     if LOG:
         logger = logging.getLogger('QNET.create')
-    for key, rule in cls._binary_rules.items():
+    for key, rule in index.candidates((first, second)):
         pat, replacement = rule
         match_dict = match_pattern(pat, expr)
         if match_dict:
@@ -7,6 +7,7 @@ import re
 from abc import ABCMeta, abstractmethod
 from collections import OrderedDict
 from functools import reduce
+from itertools import combinations
 
 import numpy as np
 import sympy
@@ -16,6 +17,8 @@ from sympy import symbols, sympify
 
 from .abstract_algebra import (
     Expression, Operation, substitute, )
+from .abstract_quantum_algebra import (
+    simplify_scalar_parallel, _memoized_simplification)
 from .algebraic_properties import (
     assoc, check_cdims, filter_neutral, filter_cid, match_replace,
     match_replace_binary)
@@ -26,11 +29,11 @@ from .exceptions import (
 from .hilbert_space_algebra import LocalSpace, ProductSpace
 from .matrix_algebra import (
     Matrix, block_matrix, identity_matrix, permutation_matrix,
-    vstackm, zerosm)
+    vstackm, zerosm, _sparse_if_large)
 from .operator_algebra import (
     IdentityOperator, LocalProjector, LocalSigma, Operator,
-    OperatorPlus, OperatorSymbol, ScalarTimesOperator, ZeroOperator, adjoint,
-    get_coeffs)
+    OperatorPlus, OperatorSymbol, OperatorTimes, ScalarTimesOperator,
+    ZeroOperator, adjoint, get_coeffs)
 from ...utils.permutations import (
     BadPermutationError, block_perm_and_perms_within_blocks, check_permutation,
     full_block_perm, invert_permutation, permutation_to_block_permutations, )
@@ -321,6 +324,10 @@ class SLH(Circuit, Expression):
         L (Matrix): The coupling vector (with in general Operator-valued
             elements)
         H (Operator): The internal Hamiltonian operator
+
+    If the channel dimension is at least ``SparseMatrix._auto_threshold``
+    (see :func:`.set_sparse_matrix_threshold`), `S` and `L` are stored as
+    :class:`.SparseMatrix` instances.
     """
 
     def __init__(self, S, L, H):
@@ -335,9 +342,12 @@ class SLH(Circuit, Expression):
             raise ValueError(("L has wrong shape %s. L must be a column vector "
                               "of operators (shape n × 1)") % str(L.shape))
 
-        if not all(isinstance(s, Operator) for s in S.matrix.ravel()):
+        S = _sparse_if_large(S)
+        L = _sparse_if_large(L)
+
+        if not all(isinstance(s, Operator) for s in S._elements()):
             S = S * IdentityOperator
-        if not all(isinstance(l, Operator) for l in L.matrix.ravel()):
+        if not all(isinstance(l, Operator) for l in L._elements()):
             L = L * IdentityOperator
         if not isinstance(H, Operator):
             H = H * IdentityOperator
@@ -423,17 +433,40 @@ class SLH(Circuit, Expression):
         """
         return SLH(self.S.expand(), self.L.expand(), self.H.expand())
 
-    def simplify_scalar(self, func=sympy.simplify):
+    def simplify_scalar(self, func=None, processes=None):
         """Simplify all scalar expressions within S, L and H
 
-        Return a new :class:`SLH` object with the simplified expressions.
+        Return a new :class:`SLH` object with the simplified expressions. If
+        `processes` is an integer greater than 1, the unique scalar
+        expressions in S, L, and H are simplified in parallel, in a pool of
+        `processes` worker processes.
 
         See also: :meth:`.QuantumExpression.simplify_scalar`
         """
-        return SLH(
-            self.S.simplify_scalar(func=func),
-            self.L.simplify_scalar(func=func),
-            self.H.simplify_scalar(func=func))
+
+        def simplify(func):
+            return SLH(
+                self.S.simplify_scalar(func=func),
+                self.L.simplify_scalar(func=func),
+                self.H.simplify_scalar(func=func))
+
+        if processes is None:
+            return simplify(_memoized_simplification(func))
+        return simplify_scalar_parallel(
+            simplify, func=func, processes=processes)
+
+    def parameter_sweep(self, params, values, full_space=None):
+        """Numerical (qutip) representation of the Hamiltonian and the collapse
+        operators for many numerical values of the model parameters
+
+        Equivalent to substituting each row of `values` for `params` and
+        calling :func:`.SLH_to_qutip` on the result, but with the symbolic
+        processing done only once. See :func:`.SLH_to_qutip_sweep` for
+        details.
+        """
+        from qnet.convert.to_qutip import SLH_to_qutip_sweep
+        return SLH_to_qutip_sweep(
+            self, params, values, full_space=full_space)
 
     def _series_inverse(self):
         return SLH(self.S.adjoint(), - self.S.adjoint() * self.L, -self.H)
@@ -493,6 +526,119 @@ class SLH(Circuit, Expression):
 
         return SLH(new_S, new_L, new_H)
 
+    def feedback_many(self, pairs):
+        """Feedback from several output ports into input ports at once
+
+        Args:
+            pairs (list): List of tuples ``(out_port, in_port)``, each
+                describing a feedback connection from the output port
+                `out_port` (zero-based) to the input port `in_port`. All port
+                indices refer to the channels of `self`, and no port may occur
+                in more than one connection.
+
+        Returns:
+            SLH: The circuit with all feedback connections closed. The
+            remaining channels are in the same order as in `self`.
+
+        Raises:
+            ValueError: if any port index is out of range or occurs more than
+                once
+            .AlgebraError: if the feedback connections cannot be eliminated
+                because the scattering matrix restricted to them is not
+                scalar, or because they form an ill-posed network
+
+        The result is equivalent to closing the feedback connections one at a
+        time (via :meth:`feedback`), but all connections are eliminated in a
+        single step, as the Schur complement of the block of the scattering
+        matrix that contains the fed-back channels. For $k$ feedback
+        connections, this requires the inversion of a single matrix of
+        dimension $k$, instead of $k$ intermediate permutations and series
+        products.
+
+        Example:
+            >>> slh = Beamsplitter(mixing_angle=sympy.pi/3).toSLH()
+            >>> slh2 = slh.concatenate_slh(slh)
+            >>> closed = slh2.feedback_many([(1, 2), (3, 0)])
+            >>> closed.cdim
+            2
+            >>> closed == (
+            ...     slh2.feedback(out_port=1, in_port=2)
+            ...     .feedback(out_port=2, in_port=0).expand())
+            True
+        """
+        pairs = list(pairs)
+        if len(pairs) == 0:
+            return self
+        n = self.cdim
+        fb_outs = [out_port for (out_port, _) in pairs]
+        fb_ins = [in_port for (_, in_port) in pairs]
+        for ports in (fb_outs, fb_ins):
+            if len(set(ports)) != len(ports):
+                raise ValueError(
+                    "Ports must not occur in more than one feedback "
+                    "connection: %r" % (pairs, ))
+            if any((port < 0 or port >= n) for port in ports):
+                raise ValueError(
+                    "Invalid port in feedback connections %r for circuit of "
+                    "cdim %d" % (pairs, n))
+        outs = [k for k in range(n) if k not in fb_outs]
+        ins = [k for k in range(n) if k not in fb_ins]
+        S, L = self.S.matrix, self.L.matrix
+
+        k = len(pairs)
+        S_scalar = _scalar_matrix(S)
+        if S_scalar is None:
+            one_minus_Sff = _scalar_matrix(
+                np.eye(k, dtype=int) - S[np.ix_(fb_outs, fb_ins)])
+            if one_minus_Sff is None:
+                raise AlgebraError(
+                    'Inversion not implemented for general operators in '
+                    'feedback {!r} of {}'.format(pairs, self))
+        else:
+            one_minus_Sff = (
+                sympy.eye(k) - S_scalar.extract(fb_outs, fb_ins))
+        try:
+            inv = one_minus_Sff.inv()
+        except ValueError:  # singular matrix
+            raise AlgebraError(
+                "Ill-posed network: singularity in feedback [%s] %r"
+                % (str(self), pairs))
+
+        # W = S[:, fb_ins] * (1 - S_ff)^{-1}
+        if S_scalar is None:
+            W = (
+                Matrix(S[:, fb_ins]) *
+                Matrix(np.array(inv.tolist(), dtype=object))).matrix
+            new_S = (
+                Matrix(S[np.ix_(outs, ins)]) +
+                Matrix(W[outs, :]) * Matrix(S[np.ix_(fb_outs, ins)]))
+        else:
+            W = S_scalar.extract(list(range(n)), fb_ins) * inv
+            new_S = (
+                S_scalar.extract(outs, ins) +
+                W.extract(outs, list(range(k))) *
+                S_scalar.extract(fb_outs, ins))
+            # the reshape keeps the shape (0, 0) if all channels are closed
+            new_S = Matrix(
+                np.array(new_S.tolist(), dtype=object).reshape(new_S.shape))
+
+        def W_times_L_f(i):
+            """Row `i` of W times the fed-back elements of L"""
+            return [
+                W[i, j] * L[fb_outs[j], 0] for j in range(k)
+                if not (W[i, j] == 0 or W[i, j] is ZeroOperator)]
+
+        new_L = Matrix(np.array(
+            [[OperatorPlus.create(L[i, 0], *W_times_L_f(i))] for i in outs],
+            dtype=object))
+        # L^dagger * W * L_f
+        L_W_L = OperatorPlus.create(*[
+            L[i, 0].adjoint() * term
+            for i in range(n) for term in W_times_L_f(i)])
+        new_H = self.H + (L_W_L.adjoint() - L_W_L) * (I / 2)
+
+        return SLH(new_S, new_L, new_H)
+
     def symbolic_liouvillian(self):
         from qnet.algebra.core.super_operator_algebra import liouvillian
 
@@ -1452,7 +1598,7 @@ def pad_with_identity(circuit, k, n):
             combined_circuit << CPermutation.create(permutation))
 
 
-def getABCD(slh, a0=None, doubled_up=True):
+def getABCD(slh, a0=None, doubled_up=True, method='eom', params=None):
     """Calculate the ABCD-linearization of an SLH model
 
     Return the A, B, C, D and (a, c) matrices that linearize an SLH model
@@ -1479,6 +1625,14 @@ def getABCD(slh, a0=None, doubled_up=True):
             with annihilation mode operators as keys and (numeric or symbolic)
             amplitude as values.
         doubled_up: boolean, necessary for phase-sensitive / active systems
+        method (str): If ``'eom'``, compute the symbolic Heisenberg equations
+            of motion for all modes and extract their coefficients. If
+            ``'linear'``, read the coefficients of the creation and
+            annihilation operators in L and H directly, and assemble the
+            matrices by matrix products (see below).
+        params (dict or None): If given, a mapping of all symbols in the
+            model to numerical values. The result is then returned as complex
+            numpy arrays.
 
 
     Returns:
@@ -1495,10 +1649,53 @@ def getABCD(slh, a0=None, doubled_up=True):
         * `a`: constant coherent input vector for mode e.o.m.
         * `c`: constant coherent input vector of scattered amplitudes
             contributing to the output
+
+        The matrices are sympy matrices, or numpy arrays if `params` is given
+        (with `a` and `c` as one-dimensional arrays).
+
+    Raises:
+        ValueError: for an invalid `method`, if `params` does not contain
+            values for all symbols, or if the model cannot be handled by the
+            ``'linear'`` method
+
+    The ``'linear'`` method is much faster for models with many modes, but it
+    requires that S is scalar, that (after the displacement by `a0`) each
+    element of L is linear in the creation and annihilation operators, and
+    that H is a polynomial in the creation and annihilation operators. Terms
+    of H of more than second order in the (displaced) operators are dropped.
+    With ``L = P a + Q a^* + c`` and ``H = a^* Omega a + a^* G a^* + f a^*
+    + ...`` (with ``a`` the vector of annihilation operators and ``a^*`` the
+    vector of creation operators), the coupling matrices of the annihilation
+    operators are
+
+    * ``A = -i Omega + (Q^T Q^* - P^H P) / 2``
+    * ``B = -P^H S``
+    * ``C = P``
+    * ``D = S``
+
+    The scalar coefficients are expanded, but not simplified.
+
+    Example:
+        >>> a = Destroy(hs=1)
+        >>> kappa = sympy.symbols('kappa', positive=True)
+        >>> slh = SLH([[1]], [[sympy.sqrt(kappa) * a]], 2 * a.dag() * a)
+        >>> A, B, C, D, _, _ = getABCD(
+        ...     slh, doubled_up=False, method='linear')
+        >>> A
+        Matrix([[-kappa/2 - 2*I]])
+        >>> A, B, C, D, _, _ = getABCD(
+        ...     slh, doubled_up=False, method='linear', params={kappa: 2})
+        >>> A
+        array([[-1.-2.j]])
     """
     from qnet.algebra.library.fock_operators import Create, Destroy
     if a0 is None:
         a0 = {}
+    if method == 'linear':
+        return _getABCD_linear(slh, a0, doubled_up, params)
+    elif method != 'eom':
+        raise ValueError(
+            "Invalid method %r, must be 'eom' or 'linear'" % (method, ))
 
     # the different degrees of freedom
     full_space = ProductSpace.create(slh.S.space, slh.L.space, slh.H.space)
@@ -1607,10 +1804,176 @@ def getABCD(slh, a0=None, doubled_up=True):
                 C[jj, kk+ncav] = coeffsjj[Create(hs=skk)]
                 C[jj+cdim, kk] = coeffsjj[Create(hs=skk)].conjugate()
 
+    if params is not None:
+        return _numeric_ABCD((A, B, C, D, a, c), params)
     return map(SympyMatrix, (A, B, C, D, a, c))
 
 
-def move_drive_to_H(slh, which=None, expand_simplify=True):
+def _getABCD_linear(slh, a0, doubled_up, params):
+    """Implementation of :func:`getABCD` for ``method='linear'``"""
+    from qnet.algebra.library.fock_operators import Create, Destroy
+
+    full_space = ProductSpace.create(slh.S.space, slh.L.space, slh.H.space)
+    modes = sorted(full_space.local_factors)
+    mode_index = {hs: k for (k, hs) in enumerate(modes)}
+    ncav = len(modes)
+    cdim = slh.cdim
+
+    alpha = np.zeros(ncav, dtype=object)
+    for (aj, aj_0) in a0.items():
+        alpha[mode_index[aj.space]] = sympify(aj_0)
+
+    def monomials(op):
+        """List of tuples ``(coeff, factors)`` for the terms of `op`, where
+        `factors` is a list of tuples ``(mode index, is_creator)``"""
+        op = op.expand()
+        terms = op.operands if isinstance(op, OperatorPlus) else [op]
+        result = []
+        for term in terms:
+            coeff = 1
+            if isinstance(term, ScalarTimesOperator):
+                coeff, term = term.coeff, term.term
+            if term is ZeroOperator:
+                continue
+            elif term is IdentityOperator:
+                ops = []
+            elif isinstance(term, OperatorTimes):
+                ops = term.operands
+            else:
+                ops = [term]
+            factors = []
+            for factor in ops:
+                if not isinstance(factor, (Create, Destroy)):
+                    raise ValueError(
+                        "Cannot linearize %s: %s is not a creation or "
+                        "annihilation operator" % (op, factor))
+                factors.append(
+                    (mode_index[factor.space], isinstance(factor, Create)))
+            result.append((sympify(coeff), factors))
+        return result
+
+    def amplitude(factor):
+        mode, is_creator = factor
+        return alpha[mode].conjugate() if is_creator else alpha[mode]
+
+    S = _scalar_matrix(slh.S.expand().matrix)
+    if S is None:
+        raise ValueError(
+            "Cannot linearize a model with an operator-valued scattering "
+            "matrix")
+    S = np.array(S.tolist(), dtype=object)
+
+    # L = P a + Q a^* + c
+    P = np.zeros((cdim, ncav), dtype=object)
+    Q = np.zeros((cdim, ncav), dtype=object)
+    c = np.zeros(cdim, dtype=object)
+    for (k, Lk) in enumerate(slh.Ls):
+        for (coeff, factors) in monomials(Lk):
+            if len(factors) == 0:
+                c[k] += coeff
+            elif len(factors) == 1:
+                mode, is_creator = factors[0]
+                if is_creator:
+                    Q[k, mode] += coeff
+                else:
+                    P[k, mode] += coeff
+                c[k] += coeff * amplitude(factors[0])
+            else:
+                raise ValueError(
+                    "Cannot linearize the non-linear Lindblad operator %s"
+                    % Lk)
+
+    # H = a^* Omega a + a^* G a^* + f a^* + (terms without a^*)
+    Omega = np.zeros((ncav, ncav), dtype=object)
+    G = np.zeros((ncav, ncav), dtype=object)
+    f = np.zeros(ncav, dtype=object)
+    for (coeff, factors) in monomials(slh.H):
+        # the terms of the displaced monomial with at most two operators
+        for n_ops in (1, 2):
+            for kept in combinations(range(len(factors)), n_ops):
+                value = coeff
+                for (i, factor) in enumerate(factors):
+                    if i not in kept:
+                        value *= amplitude(factor)
+                if value == 0:
+                    continue
+                ops = [factors[i] for i in kept]
+                creators = [mode for (mode, is_cr) in ops if is_cr]
+                annihilators = [mode for (mode, is_cr) in ops if not is_cr]
+                if len(creators) == 1 and len(annihilators) == 0:
+                    f[creators[0]] += value
+                elif len(creators) == 1 and len(annihilators) == 1:
+                    Omega[creators[0], annihilators[0]] += value
+                elif len(creators) == 2:
+                    G[creators[0], creators[1]] += value
+
+    if params is not None:
+        P, Q, c, Omega, G, f, S = [
+            _numeric_array(m, params) for m in (P, Q, c, Omega, G, f, S)]
+        imag_unit = 1j
+    else:
+        imag_unit = I
+
+    # the arrays must be the left operand in products with imag_unit, so
+    # that sympy.I is applied element-wise
+    P_H = P.conjugate().T
+    A_a = Omega * (-imag_unit) + (Q.T @ Q.conjugate() - P_H @ P) / 2
+    A_ac = (G + G.T) * (-imag_unit) + (Q.T @ P.conjugate() - P_H @ Q) / 2
+    a = f * (-imag_unit) + (Q.T @ c.conjugate() - P_H @ c) / 2
+    B_b = -P_H @ S
+    B_bc = Q.T @ S.conjugate()
+    C, D = P, S
+    if doubled_up:
+        A = np.block([[A_a, A_ac], [A_ac.conjugate(), A_a.conjugate()]])
+        B = np.block([[B_b, B_bc], [B_bc.conjugate(), B_b.conjugate()]])
+        C = np.block([[P, Q], [Q.conjugate(), P.conjugate()]])
+        D = np.block([[S, np.zeros_like(S)], [np.zeros_like(S),
+                                              S.conjugate()]])
+        a = np.concatenate((a, a.conjugate()))
+        c = np.concatenate((c, c.conjugate()))
+    else:
+        A, B = A_a, B_b
+
+    if params is not None:
+        return A, B, C, D, a, c
+    return tuple(
+        SympyMatrix(m.tolist()).applyfunc(sympy.expand)
+        for m in (A, B, C, D, a, c))
+
+
+def _numeric_array(array, params):
+    """Complex numpy array for the `array` of scalars, with the values in
+    `params` substituted for all symbols"""
+    array = np.asarray(array, dtype=object)
+    result = np.zeros(array.shape, dtype=complex)
+    replacements = {
+        sympify(key): sympify(val) for (key, val) in params.items()}
+    for (index, value) in np.ndenumerate(array):
+        if isinstance(value, (int, float, complex)):
+            result[index] = value
+            continue
+        # exact replacement of the symbols is much faster than `subs`, which
+        # is only needed for keys that are not literally in the expression
+        value = sympify(value).xreplace(replacements)
+        if value.free_symbols:
+            value = value.subs(replacements)
+        try:
+            result[index] = complex(value)
+        except TypeError:
+            raise ValueError(
+                "No numerical values for the symbols %s"
+                % ", ".join(sorted(str(sym) for sym in value.free_symbols)))
+    return result
+
+
+def _numeric_ABCD(matrices, params):
+    """Numeric version of the `matrices` ``(A, B, C, D, a, c)`` returned by
+    :func:`getABCD`"""
+    return tuple(_numeric_array(m, params) for m in matrices)
+
+
+def move_drive_to_H(
+        slh, which=None, expand_simplify=True, simplify_strategy=None):
     r'''Move coherent drives from the Lindblad operators to the Hamiltonian.
 
     For the given SLH model, move inhomogeneities in the Lindblad operators (resulting
@@ -1651,6 +2014,11 @@ def move_drive_to_H(slh, which=None, expand_simplify=True):
         if True, expand and simplify the new SLH object before returning. This has no
         effect if `slh` does not contain any inhomogeneities.
 
+    simplify_strategy : str or callable or None
+        The simplification of scalar coefficients to use if `expand_simplify`
+        is True, see :meth:`.SLH.simplify_scalar`. If None, use the default set
+        with :func:`.set_simplify_scalar_strategy`.
+
     Returns
     -------
     new_slh : SLH
@@ -1670,17 +2038,20 @@ def move_drive_to_H(slh, which=None, expand_simplify=True):
         return slh
     new_slh = SLH(identity_matrix(slh.cdim), scalarcs, 0) << slh
     if expand_simplify:
-        return new_slh.expand().simplify_scalar()
+        return new_slh.expand().simplify_scalar(func=simplify_strategy)
     return new_slh
 
 
-def prepare_adiabatic_limit(slh, k=None):
+def prepare_adiabatic_limit(slh, k=None, simplify_strategy=None):
     """Prepare the adiabatic elimination on an SLH object
 
     Args:
         slh: The SLH object to take the limit for
         k: The scaling parameter $k \rightarrow \infty$. The default is a
             positive symbol 'k'
+        simplify_strategy: The simplification of scalar coefficients, see
+            :meth:`.QuantumExpression.simplify_scalar`. If None, use the
+            default set with :func:`.set_simplify_scalar_strategy`.
 
     Returns:
         tuple: The objects ``Y, A, B, F, G, N``
@@ -1690,7 +2061,8 @@ def prepare_adiabatic_limit(slh, k=None):
         k = symbols('k', positive=True)
     Ld = slh.L.dag()
     LdL = (Ld * slh.L)[0, 0]
-    K = (-LdL / 2 + I * slh.H).expand().simplify_scalar()
+    K = (-LdL / 2 + I * slh.H).expand().simplify_scalar(
+        func=simplify_strategy)
     N = slh.S.dag()
     B, A, Y = K.series_expand(k, 0, 2)
     G, F = Ld.series_expand(k, 0, 1)
@@ -1698,7 +2070,7 @@ def prepare_adiabatic_limit(slh, k=None):
     return Y, A, B, F, G, N
 
 
-def eval_adiabatic_limit(YABFGN, Ytilde, P0):
+def eval_adiabatic_limit(YABFGN, Ytilde, P0, simplify_strategy=None):
     """Compute the limiting SLH model for the adiabatic approximation
 
     Args:
@@ -1706,31 +2078,41 @@ def eval_adiabatic_limit(YABFGN, Ytilde, P0):
             as returned by prepare_adiabatic_limit.
         Ytilde: The pseudo-inverse of Y, satisfying Y * Ytilde = P0.
         P0: The projector onto the null-space of Y.
+        simplify_strategy: The simplification of scalar coefficients, see
+            :meth:`.QuantumExpression.simplify_scalar`. If None, use the
+            default set with :func:`.set_simplify_scalar_strategy`.
 
     Returns:
         SLH: Limiting SLH model
     """
     Y, A, B, F, G, N = YABFGN
 
-    Klim = (P0 * (B - A * Ytilde * A) * P0).expand().simplify_scalar()
-    Hlim = ((Klim - Klim.dag())/2/I).expand().simplify_scalar()
+    Klim = (P0 * (B - A * Ytilde * A) * P0).expand().simplify_scalar(
+        func=simplify_strategy)
+    Hlim = ((Klim - Klim.dag())/2/I).expand().simplify_scalar(
+        func=simplify_strategy)
 
-    Ldlim = (P0 * (G - A * Ytilde * F) * P0).expand().simplify_scalar()
+    Ldlim = (P0 * (G - A * Ytilde * F) * P0).expand().simplify_scalar(
+        func=simplify_strategy)
 
     dN = identity_matrix(N.shape[0]) + F.H * Ytilde * F
-    Nlim = (P0 * N * dN * P0).expand().simplify_scalar()
+    Nlim = (P0 * N * dN * P0).expand().simplify_scalar(
+        func=simplify_strategy)
 
     return SLH(Nlim.dag(), Ldlim.dag(), Hlim.dag())
 
 
-def try_adiabatic_elimination(slh, k=None, fock_trunc=6, sub_P0=True):
+def try_adiabatic_elimination(
+        slh, k=None, fock_trunc=6, sub_P0=True, simplify_strategy=None):
     """Attempt to automatically do adiabatic elimination on an SLH object
 
     This will project the `Y` operator onto a truncated basis with dimension
     specified by `fock_trunc`.  `sub_P0` controls whether an attempt is made to
-    replace the kernel projector P0 by an :class:`.IdentityOperator`.
+    replace the kernel projector P0 by an :class:`.IdentityOperator`. The
+    `simplify_strategy` determines the simplification of scalar coefficients
+    (see :meth:`.QuantumExpression.simplify_scalar`).
     """
-    ops = prepare_adiabatic_limit(slh, k)
+    ops = prepare_adiabatic_limit(slh, k, simplify_strategy=simplify_strategy)
     Y = ops[0]
     if isinstance(Y.space, LocalSpace):
         try:
@@ -1743,7 +2125,7 @@ def try_adiabatic_elimination(slh, k=None, fock_trunc=6, sub_P0=True):
         Id_trunc = sum(projectors, ZeroOperator)
         Yprojection = (
             ((Id_trunc * Y).expand() * Id_trunc)
-            .expand().simplify_scalar())
+            .expand().simplify_scalar(func=simplify_strategy))
         termcoeffs = get_coeffs(Yprojection)
         terms = set(termcoeffs.keys())
 
@@ -1760,14 +2142,17 @@ def try_adiabatic_elimination(slh, k=None, fock_trunc=6, sub_P0=True):
 
         Yinv = sum(t/termcoeffs[t] for t in terms & projectors)
         assert (
-            (Yprojection*Yinv).expand().simplify_scalar() ==
+            (Yprojection*Yinv).expand().simplify_scalar(
+                func=simplify_strategy) ==
             (Id_trunc - P0).expand())
-        slhlim = eval_adiabatic_limit(ops, Yinv, P0)
+        slhlim = eval_adiabatic_limit(
+            ops, Yinv, P0, simplify_strategy=simplify_strategy)
 
         if sub_P0:
             # TODO for non-unit rank P0, this will not work
             slhlim = slhlim.substitute(
-                {P0: IdentityOperator}).expand().simplify_scalar()
+                {P0: IdentityOperator}).expand().simplify_scalar(
+                    func=simplify_strategy)
         return slhlim
 
     else:
@@ -1775,6 +2160,26 @@ def try_adiabatic_elimination(slh, k=None, fock_trunc=6, sub_P0=True):
             "Currently only single degree of freedom Y-operators supported")
 
 
+def _scalar_matrix(matrix):
+    """Convert the numpy array `matrix` of operators and scalars to a SymPy
+    matrix of scalars, or return None if any of its elements is an operator
+    that is not proportional to the identity"""
+    elements = []
+    for element in matrix.ravel():
+        if isinstance(element, Operator):
+            if element is IdentityOperator:
+                element = 1
+            elif element is ZeroOperator:
+                element = 0
+            elif (isinstance(element, ScalarTimesOperator) and
+                    element.term is IdentityOperator):
+                element = element.coeff
+            else:
+                return None
+        elements.append(element)
+    return SympyMatrix(matrix.shape[0], matrix.shape[1], elements)
+
+
 def _cumsum(lst):
     if not len(lst):
         return []
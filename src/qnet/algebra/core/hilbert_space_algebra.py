@@ -11,6 +11,7 @@ import operator
 import re
 from abc import ABCMeta, abstractmethod
 from collections import OrderedDict
+from collections.abc import Sequence
 from itertools import product as cartesian_product
 
 from .abstract_algebra import (
@@ -662,21 +663,19 @@ class ProductSpace(HilbertSpace, Operation):
     def __init__(self, *local_spaces):
         if len(set(local_spaces)) != len(local_spaces):
             raise ValueError("Nondistinct spaces: %s" % repr(local_spaces))
+        self._has_basis = all(ls.has_basis for ls in local_spaces)
         try:
-            self._dimension = functools.reduce(
-                    operator.mul,
-                    [ls.dimension for ls in local_spaces], 1)
+            # The basis of the product space uses a mixed-radix enumeration
+            # of the local bases, with the last factor running fastest
+            dims = [ls.dimension for ls in local_spaces]
+            self._dimension = functools.reduce(operator.mul, dims, 1)
+            self._basis_strides = tuple(
+                functools.reduce(operator.mul, dims[i+1:], 1)
+                for i in range(len(dims)))
         except BasisNotSetError:
             self._dimension = None
-        # determine the basis labels automatically
-        try:
-            ls_bases = [ls.basis_labels for ls in local_spaces]
-            basis = []
-            for label_tuple in cartesian_product(*ls_bases):
-                basis.append(",".join([str(l) for l in label_tuple]))
-            self._basis = tuple(basis)
-        except BasisNotSetError:
-            self._basis = None
+            self._basis_strides = None
+        self._basis = None  # basis labels are determined lazily
         op_keys = [space._order_key for space in local_spaces]
         self._order_key = KeyTuple([v for op_key in op_keys for v in op_key])
         super().__init__(*local_spaces)  # Operation __init__
@@ -691,23 +690,27 @@ class ProductSpace(HilbertSpace, Operation):
     def has_basis(self):
         """True if the all the local factors of the `ProductSpace` have a
         defined basis"""
-        return self._basis is not None
+        return self._has_basis
+
+    def _check_basis(self):
+        if not self._has_basis:
+            raise BasisNotSetError(
+                "Hilbert space %s has no defined basis" % str(self))
 
     @property
     def basis_states(self):
-        """Yield an iterator over the states (:class:`.TensorKet` instances)
-        that form the canonical basis of the Hilbert space
+        """Sequence of the states (:class:`.TensorKet` instances) that form
+        the canonical basis of the Hilbert space
+
+        The states are created only when they are accessed, so that e.g.
+        ``hs.basis_states[5]`` or ``hs.basis_states[-10:]`` do not instantiate
+        the full basis.
 
         Raises:
             .BasisNotSetError: if the Hilbert space has no defined basis
         """
-        from qnet.algebra.core.state_algebra import BasisKet, TensorKet
-        # importing locally avoids circular import
-        ls_bases = [ls.basis_labels for ls in self.local_factors]
-        for label_tuple in cartesian_product(*ls_bases):
-            yield TensorKet(
-                *[BasisKet(label, hs=ls) for (ls, label)
-                  in zip(self.local_factors, label_tuple)])
+        self._check_basis()
+        return _ProductBasisStates(self)
 
     @property
     def basis_labels(self):
@@ -719,10 +722,108 @@ class ProductSpace(HilbertSpace, Operation):
             .BasisNotSetError: if the Hilbert space has no defined basis
         """
         if self._basis is None:
-            raise BasisNotSetError(
-                "Hilbert space %s has no defined basis" % str(self))
+            self._check_basis()
+            ls_bases = [ls.basis_labels for ls in self.local_factors]
+            self._basis = tuple([
+                ",".join([str(l) for l in label_tuple])
+                for label_tuple in cartesian_product(*ls_bases)])
         return self._basis
 
+    def local_basis_indices(self, index):
+        """Tuple of the indices of the local basis states that factor the
+        basis state with the given `index`
+
+        A negative `index` counts from the end of the basis.
+
+        Raises:
+            .BasisNotSetError: if the Hilbert space has no defined basis
+            IndexError: if there is no basis state with the given index
+
+        Example:
+            >>> hs1 = LocalSpace(1, basis=('g', 'e'))
+            >>> hs = hs1 * LocalSpace(2, dimension=3)
+            >>> hs.local_basis_indices(4)
+            (1, 1)
+            >>> hs.basis_index((1, 1))
+            4
+            >>> hs.basis_label(4)
+            'e,1'
+            >>> hs.basis_index('e,1')
+            4
+        """
+        self._check_basis()
+        if index < 0:
+            index += self._dimension
+        if not 0 <= index < self._dimension:
+            raise IndexError(
+                "Index %d out of range for basis of dimension %d of Hilbert "
+                "space %s" % (index, self._dimension, self))
+        return tuple([
+            (index // stride) % ls.dimension
+            for (ls, stride) in zip(self.local_factors, self._basis_strides)])
+
+    def basis_index(self, local_indices_or_label):
+        """Index of the basis state that is the product of the local basis
+        states with the given indices, or that has the given label
+
+        Args:
+            local_indices_or_label (tuple or str): Either the indices of the
+                local basis states (one for each factor in
+                :attr:`local_factors`), or a basis label (comma-separated
+                local labels, see :attr:`basis_labels`)
+
+        Raises:
+            .BasisNotSetError: if the Hilbert space has no defined basis
+            IndexError: if any local index is out of range
+            KeyError: if there is no basis state with the given label
+
+        See :meth:`local_basis_indices` for an example.
+        """
+        self._check_basis()
+        if isinstance(local_indices_or_label, str):
+            local_labels = local_indices_or_label.split(",")
+            if len(local_labels) != len(self.local_factors):
+                raise KeyError(
+                    "label %s for Hilbert space %s must be comma-separated "
+                    "concatenation of local labels"
+                    % (local_indices_or_label, self))
+            try:
+                local_indices = [
+                    ls.basis_labels.index(label) for (ls, label)
+                    in zip(self.local_factors, local_labels)]
+            except ValueError:
+                raise KeyError(
+                    "label %s is not in the basis of Hilbert space %s"
+                    % (local_indices_or_label, self))
+        else:
+            local_indices = local_indices_or_label
+            if len(local_indices) != len(self.local_factors):
+                raise IndexError(
+                    "Hilbert space %s requires %d local indices, not %r"
+                    % (self, len(self.local_factors), local_indices))
+        index = 0
+        for (ls, stride, i) in zip(
+                self.local_factors, self._basis_strides, local_indices):
+            if not 0 <= i < ls.dimension:
+                raise IndexError(
+                    "Local index %d out of range for %s" % (i, ls))
+            index += i * stride
+        return index
+
+    def basis_label(self, index):
+        """Label of the basis state with the given `index`
+
+        This is the element `index` of :attr:`basis_labels`, but it is
+        determined without calculating all of the basis labels.
+
+        Raises:
+            .BasisNotSetError: if the Hilbert space has no defined basis
+            IndexError: if there is no basis state with the given index
+        """
+        return ",".join([
+            str(ls.basis_labels[i]) for (ls, i)
+            in zip(self.local_factors, self.local_basis_indices(index))])
+
     def basis_state(self, index_or_label):
         """Return the basis state with the given index or label.
 
@@ -733,14 +834,10 @@ class ProductSpace(HilbertSpace, Operation):
         """
         from qnet.algebra.core.state_algebra import BasisKet, TensorKet
         if isinstance(index_or_label, int):  # index
-            ls_bases = [ls.basis_labels for ls in self.local_factors]
-            label_tuple = list(cartesian_product(*ls_bases))[index_or_label]
-            try:
-                return TensorKet(
-                    *[BasisKet(label, hs=ls) for (ls, label)
-                        in zip(self.local_factors, label_tuple)])
-            except ValueError as exc_info:
-                raise IndexError(str(exc_info))
+            local_indices = self.local_basis_indices(index_or_label)
+            return TensorKet(
+                *[BasisKet(ls.basis_labels[i], hs=ls) for (ls, i)
+                  in zip(self.local_factors, local_indices)])
         else:  # label
             local_labels = index_or_label.split(",")
             if len(local_labels) != len(self.local_factors):
@@ -812,3 +909,69 @@ class ProductSpace(HilbertSpace, Operation):
         if other is FullSpace:
             return True
         return False
+
+
+class _ProductBasisStates(Sequence):
+    """Lazy sequence of the basis states of a :class:`ProductSpace`
+
+    Indexing (including slicing and negative indices) and membership tests
+    instantiate only the requested states, using the mixed-radix index
+    arithmetic of :meth:`ProductSpace.local_basis_indices`.
+    """
+
+    def __init__(self, hs):
+        self._hs = hs
+
+    def __len__(self):
+        return self._hs.dimension
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [
+                self._hs.basis_state(i)
+                for i in range(*index.indices(len(self)))]
+        return self._hs.basis_state(operator.index(index))
+
+    def __iter__(self):
+        from qnet.algebra.core.state_algebra import BasisKet, TensorKet
+        # importing locally avoids circular import
+        ls_bases = [ls.basis_labels for ls in self._hs.local_factors]
+        for label_tuple in cartesian_product(*ls_bases):
+            yield TensorKet(
+                *[BasisKet(label, hs=ls) for (ls, label)
+                  in zip(self._hs.local_factors, label_tuple)])
+
+    def index(self, state, start=0, stop=None):
+        """Index of the given basis `state`
+
+        As for :meth:`list.index`, the search may be restricted to the
+        (sliced) range of indices from `start` to `stop`.
+
+        Raises:
+            ValueError: if `state` is not a basis state of the Hilbert space,
+                or if its index is not within `start` and `stop`
+        """
+        try:
+            if state.space != self._hs:
+                raise ValueError("%r is not in basis" % (state, ))
+            local_indices = []
+            for (ket, ls) in zip(state.operands, self._hs.local_factors):
+                if ket.space != ls:
+                    raise ValueError("%r is not in basis" % (state, ))
+                local_indices.append(ket.index)
+            index = self._hs.basis_index(tuple(local_indices))
+        except (AttributeError, TypeError, IndexError):
+            raise ValueError("%r is not in basis" % (state, ))
+        if index not in range(len(self))[start:stop]:
+            raise ValueError(
+                "%r is not in basis[%s:%s]" % (state, start, stop))
+        return index
+
+    def __contains__(self, state):
+        try:
+            return self[self.index(state)] == state
+        except ValueError:
+            return False
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, self._hs)
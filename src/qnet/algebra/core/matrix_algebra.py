@@ -1,22 +1,28 @@
 """Matrices of Operators"""
+from collections import defaultdict
+from functools import partial
+from itertools import product as _product
 
 from numpy import (
     array as np_array, conjugate as np_conjugate, diag as np_diag,
-    hstack as np_hstack, ndarray, ones as np_ones, vstack as np_vstack,
+    empty as np_empty, hstack as np_hstack, integer as np_integer, ndarray,
+    nonzero as np_nonzero, ones as np_ones, vstack as np_vstack,
     zeros as np_zeros, )
 import sympy
 from sympy import I, sympify, Symbol
 
 from .abstract_algebra import Expression, substitute
-from .abstract_quantum_algebra import QuantumExpression
+from .abstract_quantum_algebra import (
+    QuantumExpression, simplify_scalar_parallel, _memoized_simplification)
 from .exceptions import NonSquareMatrix, NoConjugateMatrix
 from .hilbert_space_algebra import ProductSpace, TrivialSpace
-from .operator_algebra import adjoint
+from .operator_algebra import Operator, ZeroOperator, adjoint
 from .scalar_algebra import is_scalar
+from ...utils.parallel import map_unique
 from ...utils.permutations import check_permutation
 
 __all__ = [
-    'Matrix', 'block_matrix', 'diagm', 'hstackm',
+    'Matrix', 'SparseMatrix', 'block_matrix', 'diagm', 'hstackm',
     'identity_matrix', 'vstackm', 'zerosm']
 
 __private__ = [  # anything not in __all__ must be in __private__
@@ -31,6 +37,7 @@ class Matrix(Expression):
     """
     matrix = None
     _hash = None
+    _block_structure = None
 
     def __init__(self, m):
         if isinstance(m, ndarray):
@@ -55,58 +62,62 @@ class Matrix(Expression):
         """For square matrices this gives the block (-diagonal) structure of
         the matrix as a tuple of integers that sum up to the full dimension.
 
+        The block structure is determined in a single pass over the non-zero
+        elements, and cached.
+
         :rtype: tuple
         """
         n, m = self.shape
         if n != m:
             raise AttributeError("block_structure only defined for square "
                                  "matrices")
-        for k in range(1, n):
-            if ((self.matrix[:k, k:] == 0).all() and
-                    (self.matrix[k:, :k] == 0).all()):
-                return (k,) + self[k:, k:].block_structure
-        return n,
+        if self._block_structure is None:
+            self._block_structure = _block_structure(
+                n, self._nonzero_indices())
+        return self._block_structure
+
+    def _nonzero_indices(self):
+        """Iterable over the indices ``(row, col)`` of all non-zero elements"""
+        if self.matrix.dtype != object:
+            return zip(*np_nonzero(self.matrix))
+        ncols = self.shape[1]
+        return (
+            divmod(k, ncols) for (k, o) in enumerate(self.matrix.ravel())
+            if not (o is ZeroOperator or _is_zero_element(o)))
 
     def _get_blocks(self, block_structure):
         n, m = self.shape
+        if sum(block_structure) != n:
+            raise ValueError()
         if n == m:
-            if not sum(block_structure) == n:
-                raise ValueError()
-            if not len(block_structure):
-                return ()
-            j = block_structure[0]
-
-            if ((self.matrix[:j, j:] == 0).all() and
-                    (self.matrix[j:, :j] == 0).all()):
-                return ((self[:j, :j],) +
-                        self[j:, j:]._get_blocks(block_structure[1:]))
-            else:
+            if not _is_coarser(block_structure, self.block_structure):
                 raise ValueError()
-        elif m == 1:
-            if not len(block_structure):
-                return ()
-            else:
-                return ((self[:block_structure[0], :],) +
-                        self[:block_structure[0], :]
-                        ._get_blocks(block_structure[1:]))
-        else:
+        elif m != 1:
             raise ValueError()
+        blocks = []
+        offset = 0
+        for k in block_structure:
+            if n == m:
+                blocks.append(self[offset:offset+k, offset:offset+k])
+            else:
+                blocks.append(self[offset:offset+k, :])
+            offset += k
+        return tuple(blocks)
 
     @property
     def args(self):
         return (self.matrix, )
 
+    def _elements(self):
+        """Iterable over the elements of the matrix. For a
+        :class:`SparseMatrix`, each distinct element occurs at least once, but
+        not necessarily as often as in the matrix"""
+        return self.matrix.ravel()
+
     @property
     def is_zero(self):
         """Are all elements of the matrix zero?"""
-        for o in self.matrix.ravel():
-            try:
-                if not o.is_zero:
-                    return False
-            except AttributeError:
-                if not o == 0:
-                    return False
-        return True
+        return all(_is_zero_element(o) for o in self._elements())
 
     @classmethod
     def _get_instance_key(cls, args, kwargs):
@@ -114,11 +125,21 @@ class Matrix(Expression):
         return (cls, tuple(matrix.ravel()), tuple(matrix.shape))
 
     def __hash__(self):
-        if not self._hash:
-            self._hash = hash((tuple(self.matrix.ravel()),
-                               self.matrix.shape, Matrix))
+        if self._hash is None:
+            self._hash = _matrix_hash(self.shape, self._indexed_elements())
         return self._hash
 
+    def _indexed_elements(self):
+        """Iterable over tuples ``((row, col), element)`` that contain at
+        least all elements that are not zero"""
+        if self.matrix.dtype != object:
+            return (
+                (index, self.matrix[index])
+                for index in zip(*np_nonzero(self.matrix)))
+        ncols = self.shape[1]
+        return (
+            (divmod(k, ncols), o) for (k, o) in enumerate(self.matrix.ravel()))
+
     def __eq__(self, other):
         return (isinstance(other, Matrix) and
                 self.shape == other.shape and
@@ -282,7 +303,7 @@ class Matrix(Expression):
             return Matrix(item)
         return item
 
-    def element_wise(self, func, *args, **kwargs):
+    def element_wise(self, func, *args, processes=None, **kwargs):
         """Apply a function to each matrix element and return the result in a
         new operator matrix of the same shape.
 
@@ -290,13 +311,25 @@ class Matrix(Expression):
             func (FunctionType): A function to be applied to each element. It
                 must take the element as its first argument.
             args: Additional positional arguments to be passed to `func`
+            processes (int or None): If an integer greater than 1, apply
+                `func` to the unique elements of the matrix in parallel, in a
+                pool of `processes` worker processes (see
+                :func:`.map_unique`). This falls back to serial evaluation if
+                `func` or the matrix elements cannot be pickled.
             kwargs: Additional keyword arguments to be passed to `func`
 
         Returns:
             Matrix: Matrix with results of `func`, applied element-wise.
         """
         s = self.shape
-        emat = [func(o, *args, **kwargs) for o in self.matrix.ravel()]
+        if processes is None:
+            emat = [func(o, *args, **kwargs) for o in self.matrix.ravel()]
+        else:
+            elements = self.matrix.ravel()
+            results = map_unique(
+                partial(_apply_to_element, func, args, kwargs), elements,
+                processes=processes)
+            emat = [results[type(o), o] for o in elements]
         return Matrix(np_array(emat).reshape(s))
 
     def series_expand(self, param: Symbol, about, order: int):
@@ -335,7 +368,7 @@ class Matrix(Expression):
     @property
     def free_symbols(self):
         ret = set()
-        for o in self.matrix.ravel():
+        for o in self._elements():
             try:
                 ret = ret | o.free_symbols
             except AttributeError:
@@ -345,34 +378,504 @@ class Matrix(Expression):
     @property
     def space(self):
         """Combined Hilbert space of all matrix elements."""
-        arg_spaces = [o.space for o in self.matrix.ravel()
+        arg_spaces = [o.space for o in self._elements()
                       if hasattr(o, 'space')]
         if len(arg_spaces) == 0:
             return TrivialSpace
         else:
             return ProductSpace.create(*arg_spaces)
 
-    def simplify_scalar(self, func=sympy.simplify):
-        """Simplify all scalar expressions appearing in the Matrix."""
+    def simplify_scalar(self, func=None, processes=None):
+        """Simplify all scalar expressions appearing in the Matrix.
+
+        See :meth:`.QuantumExpression.simplify_scalar` for the possible values
+        of `func`. The results of `func` are memoized across calls (see
+        :func:`.simplify_scalar_cache_info`). If `processes` is an integer
+        greater than 1, the unique scalar expressions are simplified in
+        parallel, in a pool of `processes` worker processes (see
+        :func:`.simplify_scalar_parallel`).
+        """
+
+        def simplify(func):
+
+            def element_simplify(v):
+                if isinstance(v, sympy.Basic):
+                    return func(v)
+                elif isinstance(v, QuantumExpression):
+                    return v.simplify_scalar(func=func)
+                else:
+                    return v
+
+            return self.element_wise(element_simplify)
+
+        if processes is None:
+            return simplify(_memoized_simplification(func))
+        return simplify_scalar_parallel(
+            simplify, func=func, processes=processes)
+
+
+class SparseMatrix(Matrix):
+    """Matrix of Expressions that stores only its non-zero elements
+
+    Args:
+        m: The matrix elements, either in any form accepted by
+            :class:`Matrix`, or as a dictionary mapping ``(row, col)`` tuples
+            to the elements
+        shape (tuple or None): The shape ``(nrows, ncols)`` of the matrix.
+            Required if `m` is a dictionary, and ignored otherwise
+        zero: The value of all elements that are not stored explicitly,
+            either ``0`` or :obj:`.ZeroOperator`. If None, use
+            :obj:`.ZeroOperator` if any of the elements are operators, and
+            ``0`` otherwise.
+
+    For a `zero` of :obj:`.ZeroOperator`, scalar zero elements are not stored
+    either, as in a matrix of operators they stand for the same (zero)
+    element. Consequently, a sparse matrix with a `zero` of
+    :obj:`.ZeroOperator` compares equal to a dense :class:`Matrix` with
+    either ``0`` or :obj:`.ZeroOperator` at the positions of the elements
+    that are not stored.
+
+    A :class:`SparseMatrix` behaves like the equivalent (dense)
+    :class:`Matrix`, and compares equal to it. However, arithmetic operations
+    only involve the stored elements, so that their cost scales with the
+    number of non-zero elements instead of with the size of the matrix.
+    The :attr:`matrix` attribute is created on demand, as a dense numpy
+    array.
+
+    The scattering matrices and coupling vectors of :class:`.SLH` models
+    with a channel dimension of at least ``SparseMatrix._auto_threshold``
+    (see :func:`.set_sparse_matrix_threshold`) are converted to sparse
+    matrices automatically.
+
+    Example:
+        >>> m = SparseMatrix({(0, 1): 1, (2, 0): 2}, shape=(3, 3))
+        >>> m == Matrix([[0, 1, 0], [0, 0, 0], [2, 0, 0]])
+        True
+        >>> sorted((m * m).entries.items())
+        [((2, 1), 2)]
+    """
+    _dense = None
+    _auto_threshold = 8  # see set_sparse_matrix_threshold
+
+    def __init__(self, m, shape=None, zero=None):
+        if isinstance(m, SparseMatrix):
+            shape, entries = m.shape, m.entries
+            if zero is None:
+                zero = m.zero
+            elif not _is_fill(m.zero, zero):
+                entries = dict(entries)
+                for key in _product(range(shape[0]), range(shape[1])):
+                    entries.setdefault(key, m.zero)
+        elif isinstance(m, dict):
+            if shape is None:
+                raise ValueError(
+                    "shape is required to instantiate a SparseMatrix from "
+                    "a dictionary")
+            entries = m
+        else:
+            if not isinstance(m, Matrix):
+                m = Matrix(m)
+            dense = m.matrix
+            shape = dense.shape
+            if dense.dtype == object:
+                entries = {
+                    (i, j): dense[i, j]
+                    for (i, j) in _product(range(shape[0]), range(shape[1]))}
+            else:  # numeric array: find the non-zero elements efficiently
+                entries = {
+                    (i, j): dense[i, j] for (i, j) in zip(*np_nonzero(dense))}
+        shape = tuple(int(d) for d in shape)
+        if len(shape) != 2:
+            raise ValueError("Invalid shape %r" % (shape, ))
+        if zero is None:
+            zero = _zero_for(entries.values())
+        self._shape = shape
+        self._zero = zero
+        self._entries = {
+            (int(i), int(j)): v for ((i, j), v) in entries.items()
+            if not _is_fill(v, zero)}
+        Expression.__init__(self, self._entries, shape=shape, zero=zero)
+
+    @property
+    def matrix(self):
+        """Dense numpy array of the matrix elements"""
+        if self._dense is None:
+            dense = np_empty(self._shape, dtype=object)
+            dense.fill(self._zero)
+            for ((i, j), v) in self._entries.items():
+                dense[i, j] = v
+            self._dense = dense
+        return self._dense
+
+    @property
+    def entries(self):
+        """Dictionary mapping ``(row, col)`` to the stored elements"""
+        return self._entries
 
-        def element_simplify(v):
-            if isinstance(v, sympy.Basic):
-                return func(v)
-            elif isinstance(v, QuantumExpression):
-                return v.simplify_scalar(func=func)
+    @property
+    def zero(self):
+        """The value of all elements not in :attr:`entries`"""
+        return self._zero
+
+    @property
+    def shape(self):
+        return self._shape
+
+    @property
+    def args(self):
+        return (self._entries, )
+
+    @property
+    def kwargs(self):
+        return {'shape': self._shape, 'zero': self._zero}
+
+    @classmethod
+    def _get_instance_key(cls, args, kwargs):
+        entries = args[0]
+        return (
+            cls, tuple(sorted(entries.items(), key=lambda item: item[0])),
+            tuple(kwargs['shape']), kwargs['zero'])
+
+    # overriding __eq__ would otherwise make the class unhashable
+    __hash__ = Matrix.__hash__
+
+    def _indexed_elements(self):
+        return self._entries.items()
+
+    def __eq__(self, other):
+        if not isinstance(other, Matrix) or self.shape != other.shape:
+            return False
+        if not (isinstance(other, SparseMatrix) and
+                _same_zero(other.zero, self._zero)):
+            other = SparseMatrix(other, zero=self._zero)
+        return self._entries == other.entries
+
+    def _elements(self):
+        return list(self._entries.values()) + [self._zero]
+
+    def _nonzero_indices(self):
+        return (
+            index for (index, v) in self._entries.items()
+            if not _is_zero_element(v))
+
+    def __getitem__(self, item_id):
+        key = item_id if isinstance(item_id, tuple) else (
+            item_id, slice(None))
+        if len(key) != 2 or not all(
+                isinstance(k, (int, slice, np_integer)) for k in key):
+            return super().__getitem__(item_id)  # dense fancy indexing
+        rows = range(self._shape[0])[key[0]]
+        cols = range(self._shape[1])[key[1]]
+        if isinstance(rows, int) and isinstance(cols, int):
+            return self._entries.get((rows, cols), self._zero)
+        if isinstance(rows, int):  # single row, as a column vector
+            shape = (len(cols), 1)
+            rows = {rows: 0}
+            cols = {j: k for (k, j) in enumerate(cols)}
+
+            def new_key(i, j):
+                return (cols[j], 0)
+
+        elif isinstance(cols, int):
+            shape = (len(rows), 1)
+            rows = {i: k for (k, i) in enumerate(rows)}
+            cols = {cols: 0}
+
+            def new_key(i, j):
+                return (rows[i], 0)
+
+        else:
+            shape = (len(rows), len(cols))
+            rows = {i: k for (k, i) in enumerate(rows)}
+            cols = {j: k for (k, j) in enumerate(cols)}
+
+            def new_key(i, j):
+                return (rows[i], cols[j])
+
+        return SparseMatrix(
+            {new_key(i, j): v for ((i, j), v) in self._entries.items()
+             if i in rows and j in cols},
+            shape=shape, zero=self._zero)
+
+    def __add__(self, other):
+        if not isinstance(other, Matrix):
+            return Matrix(self.matrix + other)
+        if self.shape != other.shape:
+            raise ValueError(
+                "Cannot add matrices of shapes %s and %s"
+                % (self.shape, other.shape))
+        if not isinstance(other, SparseMatrix):
+            other = SparseMatrix(other)
+        entries = {}
+        other_entries = other.entries
+        for (key, v) in self._entries.items():
+            if key in other_entries:
+                entries[key] = v + other_entries[key]
             else:
-                return v
+                entries[key] = _add_zero(v, other.zero)
+        for (key, v) in other_entries.items():
+            if key not in self._entries:
+                entries[key] = _add_zero(v, self._zero)
+        return SparseMatrix(
+            entries, shape=self.shape,
+            zero=_zero_for([self._zero, other.zero], entries.values()))
 
-        return self.element_wise(element_simplify)
+    def __radd__(self, other):
+        if isinstance(other, Matrix):
+            return SparseMatrix(other) + self
+        return Matrix(other + self.matrix)
+
+    def __mul__(self, other):
+        if not isinstance(other, Matrix):
+            return SparseMatrix(
+                {key: v * other for (key, v) in self._entries.items()},
+                shape=self.shape, zero=self._zero * other)
+        if self.shape[1] != other.shape[0]:
+            raise ValueError(
+                "Cannot multiply matrices of shapes %s and %s"
+                % (self.shape, other.shape))
+        if not isinstance(other, SparseMatrix):
+            other = SparseMatrix(other)
+        other_rows = defaultdict(list)
+        for ((k, j), b) in sorted(other.entries.items()):
+            other_rows[k].append((j, b))
+        terms = defaultdict(list)
+        # sorting ensures that the terms for each element are summed in the
+        # same order as for a dense matrix product
+        for ((i, k), a) in sorted(self._entries.items()):
+            for (j, b) in other_rows.get(k, ()):
+                terms[i, j].append(a * b)
+        entries = {}
+        for (key, products) in terms.items():
+            v = products[0]
+            for product in products[1:]:
+                v = v + product
+            entries[key] = v
+        zero = _zero_for(
+            [self._zero, other.zero], self._entries.values(),
+            other.entries.values())
+        return SparseMatrix(
+            entries, shape=(self.shape[0], other.shape[1]), zero=zero)
+
+    def __rmul__(self, other):
+        if isinstance(other, Matrix):
+            return SparseMatrix(other) * self
+        return SparseMatrix(
+            {key: other * v for (key, v) in self._entries.items()},
+            shape=self.shape, zero=other * self._zero)
+
+    def transpose(self):
+        """The transpose matrix"""
+        return SparseMatrix(
+            {(j, i): v for ((i, j), v) in self._entries.items()},
+            shape=(self.shape[1], self.shape[0]), zero=self._zero)
+
+    def conjugate(self):
+        """The element-wise conjugate matrix
+
+        See :meth:`Matrix.conjugate`.
+        """
+        try:
+            return self.element_wise(lambda v: v.conjugate())
+        except AttributeError:
+            raise NoConjugateMatrix(
+                "Matrix %s contains entries that have no defined "
+                "conjugate" % str(self))
+
+    def element_wise(self, func, *args, processes=None, **kwargs):
+        """Apply a function to each matrix element, see
+        :meth:`Matrix.element_wise`
+
+        The function is applied only once to all elements that are not
+        stored explicitly. If the result is non-zero, the result is a dense
+        :class:`Matrix`.
+        """
+        zero = func(self._zero, *args, **kwargs)
+        if not _is_zero_element(zero):
+            return super().element_wise(
+                func, *args, processes=processes, **kwargs)
+        keys = list(self._entries.keys())
+        elements = [self._entries[key] for key in keys]
+        if processes is None:
+            results = [func(o, *args, **kwargs) for o in elements]
+        else:
+            unique_results = map_unique(
+                partial(_apply_to_element, func, args, kwargs), elements,
+                processes=processes)
+            results = [unique_results[type(o), o] for o in elements]
+        return SparseMatrix(
+            dict(zip(keys, results)), shape=self.shape, zero=zero)
+
+
+def _apply_to_element(func, args, kwargs, element):
+    """Evaluate ``func(element, *args, **kwargs)`` (for
+    :meth:`Matrix.element_wise`, in a form that can be pickled)"""
+    return func(element, *args, **kwargs)
+
+
+def _block_structure(n, nonzero_indices):
+    """Block structure of an ``n x n`` matrix with non-zero elements at the
+    given indices, see :attr:`Matrix.block_structure`
+
+    Each non-zero element ``(i, j)`` couples all indices in the interval
+    between ``i`` and ``j`` into the same block. The blocks are the unions of
+    overlapping intervals.
+    """
+    if n == 0:
+        return (0, )
+    reach = list(range(n))  # largest index coupled to each index
+    for (i, j) in nonzero_indices:
+        if i > j:
+            i, j = j, i
+        if j > reach[i]:
+            reach[i] = j
+    structure = []
+    start = end = 0
+    for k in range(n):
+        end = max(end, reach[k])
+        if end == k:  # no coupling beyond k
+            structure.append(k + 1 - start)
+            start = k + 1
+    return tuple(structure)
+
+
+def _is_coarser(block_structure, fine_block_structure):
+    """Whether `block_structure` can be obtained by combining adjacent blocks
+    of `fine_block_structure`"""
+    boundaries = set(_cumsum(fine_block_structure))
+    return all(k in boundaries for k in _cumsum(block_structure))
+
+
+def _cumsum(block_structure):
+    """Offsets of the ends of all blocks in `block_structure`"""
+    offsets = []
+    offset = 0
+    for k in block_structure:
+        offset += k
+        offsets.append(offset)
+    return offsets
+
+
+def _is_zero_element(o):
+    """Whether the matrix element `o` is zero"""
+    try:
+        return bool(o.is_zero)
+    except AttributeError:
+        return o == 0
+
+
+def _is_fill(o, zero):
+    """Whether the matrix element `o` is represented by the implicit element
+    `zero` of a :class:`SparseMatrix`
+
+    For a `zero` of :obj:`.ZeroOperator`, this includes scalar zeros.
+    """
+    if isinstance(o, Operator):
+        return o is zero
+    return o == 0 if zero is ZeroOperator else o == zero
+
+
+def _same_zero(zero1, zero2):
+    """Whether the implicit elements of two :class:`SparseMatrix` instances
+    are the same"""
+    return zero1 is zero2 or (
+        not isinstance(zero1, Operator) and
+        not isinstance(zero2, Operator) and zero1 == zero2)
+
+
+def _matrix_hash(shape, indexed_elements):
+    """Hash of a matrix of the given `shape` from an iterable of tuples
+    ``((row, col), element)`` that contains at least all non-zero elements
+
+    All zero elements (both scalar zeros and :obj:`.ZeroOperator`) are
+    ignored, so that a dense :class:`Matrix` and a :class:`SparseMatrix` have
+    the same hash if they are equal.
+    """
+    return hash((Matrix, tuple(shape), frozenset(
+        ((int(i), int(j)), o) for ((i, j), o) in indexed_elements
+        if not _is_fill(o, ZeroOperator))))
+
+
+def _zero_for(*element_iterables):
+    """:obj:`.ZeroOperator` if any of the given matrix elements is an
+    operator, 0 otherwise"""
+    for elements in element_iterables:
+        if any(isinstance(o, Operator) for o in elements):
+            return ZeroOperator
+    return 0
+
+
+def _add_zero(o, zero):
+    """Add the implicit element `zero` of a :class:`SparseMatrix` to the
+    matrix element `o`"""
+    if isinstance(o, Operator) == isinstance(zero, Operator):
+        return o  # adding zero of the same kind has no effect
+    return o + zero
+
+
+def _sparse_if_large(matrix):
+    """Convert `matrix` to a :class:`SparseMatrix` if its number of rows is
+    at least ``SparseMatrix._auto_threshold``"""
+    threshold = SparseMatrix._auto_threshold
+    if (isinstance(matrix, SparseMatrix) or threshold is None or
+            matrix.shape[0] < threshold):
+        return matrix
+    return SparseMatrix(matrix)
+
+
+def _stacked(blocks):
+    """Combine the 2D list `blocks` of matrices into a single
+    :class:`SparseMatrix`
+
+    The implicit elements of all blocks are replaced by a single implicit
+    element, which is :obj:`.ZeroOperator` if it is :obj:`.ZeroOperator` for
+    any block.
+    """
+    entries = {}
+    zeros = []
+    row_offset = 0
+    for block_row in blocks:
+        col_offset = 0
+        for block in block_row:
+            if not isinstance(block, SparseMatrix):
+                block = SparseMatrix(block)
+            for ((i, j), v) in block.entries.items():
+                entries[row_offset + i, col_offset + j] = v
+            zeros.append(block.zero)
+            col_offset += block.shape[1]
+        row_offset += block_row[0].shape[0]
+    return SparseMatrix(
+        entries, shape=(row_offset, col_offset), zero=_zero_for(zeros))
+
+
+def _use_sparse(matrices, nrows):
+    """Whether the stacking of `matrices` into a matrix with `nrows` rows
+    should result in a :class:`SparseMatrix`"""
+    threshold = SparseMatrix._auto_threshold
+    return (
+        any(isinstance(m, SparseMatrix) for m in matrices) or
+        (threshold is not None and nrows >= threshold))
 
 
 def hstackm(matrices):
-    """Generalizes `numpy.hstack` to :class:`Matrix` objects."""
+    """Generalizes `numpy.hstack` to :class:`Matrix` objects.
+
+    The result is a :class:`SparseMatrix` if any of the `matrices` is sparse,
+    or if it has at least ``SparseMatrix._auto_threshold`` rows.
+    """
+    if _use_sparse(matrices, matrices[0].shape[0]):
+        return _stacked([matrices])
     return Matrix(np_hstack(tuple(m.matrix for m in matrices)))
 
 
 def vstackm(matrices):
-    """Generalizes `numpy.vstack` to :class:`Matrix` objects."""
+    """Generalizes `numpy.vstack` to :class:`Matrix` objects.
+
+    The result is a :class:`SparseMatrix` if any of the `matrices` is sparse,
+    or if it has at least ``SparseMatrix._auto_threshold`` rows.
+    """
+    if _use_sparse(matrices, sum(m.shape[0] for m in matrices)):
+        return _stacked([[m] for m in matrices])
     arr = np_vstack(tuple(m.matrix for m in matrices))
     #    print(tuple(m.matrix.dtype for m in matrices))
     #    print(arr.dtype)
@@ -399,8 +902,12 @@ def block_matrix(A, B, C, D):
         D (Matrix): Matrix of shape ``(l, k)``
 
     Returns:
-        Matrix: The combined block matrix ``[[A, B], [C, D]]``.
+        Matrix: The combined block matrix ``[[A, B], [C, D]]``. This is a
+        :class:`SparseMatrix` if any of the quadrants is sparse, or if it has
+        at least ``SparseMatrix._auto_threshold`` rows.
     """
+    if _use_sparse((A, B, C, D), A.shape[0] + C.shape[0]):
+        return _stacked([[A, B], [C, D]])
     return vstackm((hstackm((A, B)), hstackm((C, D))))
 
 
@@ -452,9 +959,18 @@ def permutation_matrix(permutation):
 
     Args:
         permutation (tuple): A permutation image tuple (zero-based indices!)
+
+    Returns:
+        Matrix: The permutation matrix. This is a :class:`SparseMatrix` if
+        its dimension is at least ``SparseMatrix._auto_threshold``.
     """
     assert check_permutation(permutation)
     n = len(permutation)
+    threshold = SparseMatrix._auto_threshold
+    if threshold is not None and n >= threshold:
+        return SparseMatrix(
+            {(j, i): 1 for (i, j) in enumerate(permutation)}, shape=(n, n),
+            zero=0)
     op_matrix = np_zeros((n, n), dtype=int)
     for i, j in enumerate(permutation):
         op_matrix[j, i] = 1
@@ -10,7 +10,7 @@ from numpy import complex128, float64, int64
 
 from .abstract_quantum_algebra import (
     QuantumExpression, QuantumIndexedSum, QuantumOperation, QuantumPlus,
-    QuantumTimes, QuantumDerivative)
+    QuantumTimes, QuantumDerivative, _sum_transient_terms)
 from .algebraic_properties import (
     assoc, assoc_indexed, convert_to_scalars, filter_neutral,
     indexed_sum_over_const, indexed_sum_over_kronecker, match_replace,
@@ -38,6 +38,10 @@ class Scalar(QuantumExpression, metaclass=ABCMeta):
     #: values that cannot be wrapped by :class:`ScalarValue`
     _invalid = {sympy.oo, sympy.zoo, numpy.nan, numpy.inf}
 
+    #: exact types of the purely numeric values in :attr:`_val_types`
+    _numeric_types = frozenset(
+        [int, float, complex, int64, complex128, float64])
+
     @property
     def space(self):
         """:obj:`.TrivialSpace`, by definition"""
@@ -217,6 +221,8 @@ class ScalarValue(Scalar):
         :meth:`ScalarValue.create` a safe method for converting unknown objects
         to :class:`Scalar`.
         """
+        if val.__class__ in cls._numeric_types:
+            return cls._create_numeric(val)
         if val in cls._invalid:
             raise ValueError("Invalid value %r" % val)
         if val == 0:
@@ -231,6 +237,32 @@ class ScalarValue(Scalar):
             # probably a good thing)
             return cls(val)
 
+    @classmethod
+    def _create_numeric(cls, val):
+        """Fast path of :meth:`create` for a `val` whose type is in
+        :attr:`_numeric_types`
+
+        This bypasses the generic :meth:`__init__` (and thus sympy and the
+        type checks) by setting the attributes that :meth:`__init__` would set
+        directly.
+        """
+        if val in cls._invalid:
+            raise ValueError("Invalid value %r" % val)
+        if val == 0:
+            return Zero
+        elif val == 1:
+            return One
+        instance = object.__new__(cls)
+        instance._val = val
+        instance._order_args = KeyTuple((val, ))
+        instance._order_kwargs = KeyTuple()
+        instance._hash = None
+        instance._free_symbols = None
+        instance._bound_symbols = None
+        instance._all_symbols = None
+        instance._instance_key = (cls, val)
+        return instance
+
     def __init__(self, val):
         self._val = val
         if not isinstance(val, self._val_types):
@@ -240,7 +272,12 @@ class ScalarValue(Scalar):
         super().__init__(val)
 
     def __getattr__(self, name):
-        return getattr(self.val, name)
+        try:
+            val = self.__dict__['_val']
+        except KeyError:
+            # not initialized yet, e.g. while unpickling
+            raise AttributeError(name)
+        return getattr(val, name)
 
     def _diff(self, sym):
         if isinstance(self.val, sympy.Basic):
@@ -308,6 +345,8 @@ class ScalarValue(Scalar):
             return self.val.as_real_imag()[1]
 
     def _adjoint(self):
+        if self.val.__class__ in self._numeric_types:
+            return self._create_numeric(self.val.conjugate())
         return self.__class__(self.val.conjugate())
 
     def __eq__(self, other):
@@ -897,6 +936,9 @@ class ScalarTimes(QuantumTimes, Scalar):
     @classmethod
     def create(cls, *operands, **kwargs):
         """Instantiate the product while applying simplification rules"""
+        product = _numeric_product(operands)
+        if product is not None:
+            return ScalarValue.create(product)
         converted_operands = []
         for op in operands:
             if not isinstance(op, Scalar):
@@ -927,11 +969,10 @@ class ScalarTimes(QuantumTimes, Scalar):
         eopssummands = [get_summands(eo) for eo in eops]
         # iterate over a cartesian product of all factor summands, form product
         # of each tuple and sum over result
-        summands = []
-        for combo in cartesian_product(*eopssummands):
-            summand = self.__class__._times_cls.create(*combo)
-            summands.append(summand)
-        ret = self.__class__._plus_cls.create(*summands)
+        ret = _sum_transient_terms(
+            (self.__class__._times_cls.create(*combo)
+             for combo in cartesian_product(*eopssummands)),
+            plus_cls=self.__class__._plus_cls)
         if isinstance(ret, self.__class__._plus_cls):
             return ret.expand()
         else:
@@ -1205,6 +1246,47 @@ def sqrt(scalar):
         raise TypeError("Unknown type of scalar: %r" % type(scalar))
 
 
+def _numeric_product(operands):
+    """Product of the numeric values of all `operands`, or None if any of the
+    `operands` is not a number or a :class:`ScalarValue` wrapping a number
+    (cf. :attr:`Scalar._numeric_types`)"""
+    if len(operands) == 0:
+        return None
+    numeric_types = Scalar._numeric_types
+    product = 1
+    for op in operands:
+        if op.__class__ is ScalarValue or op is Zero or op is One:
+            op = op.val
+        if op.__class__ not in numeric_types:
+            return None
+        product = product * op
+    return product
+
+
+def _numeric_order_str(val):
+    """String representation of a number `val` as the tie-breaker in
+    :attr:`.ScalarTimesQuantumExpression._order_key`
+
+    The label depends only on the numerical value, not on its type: a
+    complex value with a zero imaginary part is labeled by its real part,
+    and an integer-valued real number by the equivalent :class:`int`. For
+    example, ``2``, ``2.0``, and ``2+0j`` are all labeled ``'2'``, and
+    ``0.5+0j`` is labeled ``'0.5'``. Thus, terms whose coefficients compare
+    equal are ordered the same way, whereas the ascii printer (whose cache
+    does not distinguish numbers that compare equal) may render them
+    differently depending on what was printed before.
+    """
+    if val.imag != 0:
+        return str(val)
+    val = val.real
+    try:
+        if val == int(val):
+            return str(int(val))
+    except (OverflowError, ValueError):  # inf, nan
+        pass
+    return str(val)
+
+
 def is_scalar(scalar):
     """Check if `scalar` is a :class:`Scalar` or a scalar value
 
@@ -1214,6 +1296,8 @@ def is_scalar(scalar):
 
     For internal use only.
     """
+    if scalar.__class__ in Scalar._numeric_types:
+        return True
     return isinstance(scalar, Scalar) or isinstance(scalar, Scalar._val_types)
 
 
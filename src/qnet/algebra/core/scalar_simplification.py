@@ -0,0 +1,172 @@
+"""Strategies for the simplification of scalar coefficients
+
+The :meth:`~.QuantumExpression.simplify_scalar` method (and likewise
+:meth:`.Matrix.simplify_scalar` and :meth:`.SLH.simplify_scalar`) applies a
+simplification function to every scalar coefficient of an expression. Instead
+of a function, it accepts the name of one of the following strategies:
+
+* ``'simplify'``: :func:`sympy.simplify <sympy.simplify.simplify.simplify>`,
+  SymPy's most thorough (and most expensive) heuristic simplification
+* ``'canonical'``: leave coefficients that are already in canonical form
+  unchanged (see :func:`is_canonical_scalar`), and apply
+  :func:`sympy.simplify <sympy.simplify.simplify.simplify>` to all others
+* ``'expand'``: expand, collect powers of all free symbols, and combine powers
+  (:func:`simplify_expand_collect`)
+* ``'nsimplify'``: replace floating point numbers in coefficients without free
+  symbols by exact expressions (:func:`simplify_nsimplify_numeric`)
+* ``'auto'``: try the ``'expand'`` strategy first, and only use
+  :func:`sympy.simplify <sympy.simplify.simplify.simplify>` if this does not
+  reduce the number of operations in the coefficient
+  (:func:`simplify_cost_aware`)
+
+The strategy used when no simplification function is given can be set
+globally with :func:`.set_simplify_scalar_strategy`.
+"""
+from collections import OrderedDict
+
+import sympy
+
+__all__ = [
+    'is_canonical_scalar', 'simplify_canonical', 'simplify_expand_collect',
+    'simplify_nsimplify_numeric', 'simplify_cost_aware',
+    'simplification_strategy']
+
+__private__ = []  # anything not in __all__ must be in __private__
+
+
+def is_canonical_scalar(coeff):
+    """Check whether `coeff` is in a canonical form that no simplification
+    can improve on
+
+    This is the case for numbers, SymPy atoms (numbers and symbols), powers of
+    atoms with a numeric exponent, and products of any of these.
+
+    Example:
+        >>> alpha, kappa = sympy.symbols('alpha, kappa', positive=True)
+        >>> is_canonical_scalar(sympy.sqrt(kappa) * alpha / 2)
+        True
+        >>> is_canonical_scalar(alpha * kappa + alpha)
+        False
+    """
+    if not isinstance(coeff, sympy.Basic):
+        return True
+    if coeff.is_Atom:
+        return True
+    if coeff.is_Pow:
+        return coeff.base.is_Atom and coeff.exp.is_Number
+    if coeff.is_Mul:
+        return all(
+            (arg.is_Atom or (arg.is_Pow and is_canonical_scalar(arg)))
+            for arg in coeff.args)
+    return False
+
+
+def simplify_canonical(coeff):
+    """Apply :func:`sympy.simplify <sympy.simplify.simplify.simplify>` to
+    `coeff`, unless it is already in canonical form (see
+    :func:`is_canonical_scalar`)"""
+    if is_canonical_scalar(coeff):
+        return coeff
+    return sympy.simplify(coeff)
+
+
+def simplify_expand_collect(coeff):
+    """Simplify `coeff` by expanding it, collecting powers of its free symbols,
+    and combining powers with similar bases and exponents
+
+    Coefficients in canonical form (see :func:`is_canonical_scalar`) are
+    returned unchanged.
+
+    Example:
+        >>> alpha, g, kappa = sympy.symbols('alpha, g, kappa', positive=True)
+        >>> simplify_expand_collect(alpha * (g + 1) - alpha + alpha * kappa)
+        alpha*(g + kappa)
+    """
+    if is_canonical_scalar(coeff):
+        return coeff
+    expanded = sympy.expand(coeff)
+    symbols = sorted(expanded.free_symbols, key=str)
+    if len(symbols) > 0:
+        expanded = sympy.collect(expanded, symbols)
+    return sympy.powsimp(expanded)
+
+
+def simplify_nsimplify_numeric(coeff):
+    """Replace a purely numeric `coeff` by an exact expression, using
+    :func:`sympy.nsimplify <sympy.simplify.simplify.nsimplify>`
+
+    Coefficients that contain free symbols, and integers, are returned
+    unchanged.
+
+    Example:
+        >>> simplify_nsimplify_numeric(0.5 * sympy.sqrt(2))
+        sqrt(2)/2
+        >>> simplify_nsimplify_numeric(0.5 + 0.2j)
+        1/2 + I/5
+    """
+    if isinstance(coeff, int):
+        return coeff
+    if isinstance(coeff, sympy.Basic):
+        if coeff.is_Integer or len(coeff.free_symbols) > 0:
+            return coeff
+    return sympy.nsimplify(coeff)
+
+
+def simplify_cost_aware(coeff):
+    """Simplify `coeff` with :func:`simplify_expand_collect` if this reduces
+    the number of operations in `coeff` (as counted by
+    :func:`sympy.count_ops <sympy.core.function.count_ops>`), and with
+    :func:`sympy.simplify <sympy.simplify.simplify.simplify>` otherwise
+
+    Coefficients in canonical form (see :func:`is_canonical_scalar`) are
+    returned unchanged.
+
+    Example:
+        >>> alpha, g, kappa = sympy.symbols('alpha, g, kappa', positive=True)
+        >>> simplify_cost_aware(alpha * g + alpha * kappa)  # cheap
+        alpha*(g + kappa)
+        >>> simplify_cost_aware((g**2 - 1) / (g - 1))  # escalate
+        g + 1
+    """
+    if is_canonical_scalar(coeff):
+        return coeff
+    result = simplify_expand_collect(coeff)
+    if sympy.count_ops(result) < sympy.count_ops(coeff):
+        return result
+    return sympy.simplify(coeff)
+
+
+#: Mapping of strategy names to scalar simplification functions
+SIMPLIFY_SCALAR_STRATEGIES = OrderedDict([
+    ('simplify', sympy.simplify),
+    ('canonical', simplify_canonical),
+    ('expand', simplify_expand_collect),
+    ('nsimplify', simplify_nsimplify_numeric),
+    ('auto', simplify_cost_aware)])
+
+
+def simplification_strategy(strategy):
+    """Scalar simplification function for the given `strategy`
+
+    Args:
+        strategy (str or callable): The name of a strategy in
+            :data:`SIMPLIFY_SCALAR_STRATEGIES`, or a function that is
+            returned unchanged
+
+    Raises:
+        ValueError: if `strategy` is not a known strategy name
+        TypeError: if `strategy` is neither a string nor callable
+    """
+    if isinstance(strategy, str):
+        try:
+            return SIMPLIFY_SCALAR_STRATEGIES[strategy]
+        except KeyError:
+            raise ValueError(
+                "Unknown simplification strategy %r, must be one of %s"
+                % (strategy, ", ".join(
+                    repr(name) for name in SIMPLIFY_SCALAR_STRATEGIES)))
+    if callable(strategy):
+        return strategy
+    raise TypeError(
+        "Simplification strategy must be a string or callable, not %r"
+        % (strategy, ))
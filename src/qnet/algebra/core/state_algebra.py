@@ -14,7 +14,8 @@ from .scalar_algebra import is_scalar
 from .abstract_quantum_algebra import (
     ScalarTimesQuantumExpression, QuantumExpression, QuantumSymbol,
     QuantumPlus, QuantumTimes, QuantumAdjoint, QuantumIndexedSum,
-    QuantumDerivative, ensure_local_space, _series_expand_combine_prod)
+    QuantumDerivative, ensure_local_space, _series_expand_combine_prod,
+    _sum_transient_terms)
 from .algebraic_properties import (
     accept_bras, assoc, assoc_indexed, basis_ket_zero_outside_hs,
     filter_neutral, match_replace, match_replace_binary, orderby,
@@ -507,13 +508,15 @@ class OperatorTimesKet(State, Operation):
         et = t.expand()
         if isinstance(et, KetPlus):
             if isinstance(ct, OperatorPlus):
-                return sum((cto * eto
-                            for eto in et.operands
-                            for cto in ct.operands), ZeroKet)
+                return _sum_transient_terms(
+                    (cto * eto for eto in et.operands
+                     for cto in ct.operands), plus_cls=KetPlus)
             else:
-                return sum((c * eto for eto in et.operands), ZeroKet)
+                return _sum_transient_terms(
+                    (c * eto for eto in et.operands), plus_cls=KetPlus)
         elif isinstance(ct, OperatorPlus):
-            return sum((cto * et for cto in ct.operands), ZeroKet)
+            return _sum_transient_terms(
+                (cto * et for cto in ct.operands), plus_cls=KetPlus)
         return ct * et
 
     def _diff(self, sym):
@@ -43,18 +43,33 @@ class MatchDict(OrderedDict):
         success (bool):  Value of the :class:`MatchDict` object in a boolean
             context: ``bool(match) == match.success``
         reason (str):  If `success` is False, string explaining why the match
-            failed
+            failed. May be set to a callable that returns the string, in
+            which case the callable is only evaluated when `reason` is
+            accessed. The reasons generated by :meth:`Pattern.match` are
+            always lazy, as the string representation of a large expression
+            may be expensive, and the reason of most failed matches is
+            never used
         merge_lists (int): Code that indicates how to combine multiple values
             that are lists
     """
 
     def __init__(self, *args):
         self.success = True
-        self.reason = ""
+        self._reason = ""
         self._len = 0
         self.merge_lists = 0
         super().__init__(*args)
 
+    @property
+    def reason(self):
+        if callable(self._reason):
+            self._reason = self._reason()
+        return self._reason
+
+    @reason.setter
+    def reason(self, reason):
+        self._reason = reason
+
     def __delitem__(self, key, **kwargs):
         raise KeyError('Read-only dictionary')
 
@@ -84,7 +99,7 @@ class MatchDict(OrderedDict):
         """Update dict with entries from `other`
 
         If `other` has an attribute ``success=False`` and ``reason``, those
-        attributes are copied as well
+        attributes are copied as well (without evaluating a lazy `reason`)
         """
         for other in others:
             for key, val in other.items():
@@ -92,7 +107,10 @@ class MatchDict(OrderedDict):
             try:
                 if not other.success:
                     self.success = False
-                    self.reason = other.reason
+                    try:
+                        self._reason = other._reason
+                    except AttributeError:
+                        self.reason = other.reason
             except AttributeError:
                 pass
 
@@ -177,6 +195,9 @@ class Pattern():
     one_or_more = 2
     zero_or_more = 3
 
+    compiled_matching = False
+    # If True, `match` uses the compiled matcher (see `compiled`)
+
     def __init__(self, head=None, args=None, kwargs=None, *, mode=1,
                  wc_name=None, conditions=None):
         self._str = None
@@ -220,6 +241,7 @@ class Pattern():
         else:
             self.conditions = conditions
         self._repr = None  # lazy evaluation
+        self._compiled = None  # lazy evaluation
         self._arg_iterator = iter
         if self._non_single_arg_on_left:
             # When the non-single argument is on the left, we move through
@@ -279,7 +301,17 @@ class Pattern():
         will evaluate to True in a boolean context. If the match is not
         successful, it will evaluate as False, and the reason for failure is
         available in the `reason` attribute of the :class:`MatchDict` object.
+
+        If the class attribute :attr:`compiled_matching` is True, the match
+        is performed by the matcher returned by :meth:`compiled`, with
+        identical results.
         """
+        if self.compiled_matching:
+            return self._match_compiled(expr)
+        return self._match(expr)
+
+    def _match(self, expr) -> MatchDict:
+        """Interpreted implementation of :meth:`match`"""
         res = MatchDict()
         if self._has_non_single_arg:
             if self._non_single_arg_on_left:
@@ -288,14 +320,14 @@ class Pattern():
                 res.merge_lists = -1
         if self.head is not None:
             if not isinstance(expr, self.head):
-                res.reason = ("%s is not an instance of %s"
-                              % (repr(expr), self._repr_head()))
+                res.reason = lambda: ("%s is not an instance of %s"
+                                      % (repr(expr), self._repr_head()))
                 res.success = False
                 return res
         for i_cond, condition in enumerate(self.conditions):
             if not condition(expr):
-                res.reason = ("%s does not meet condition %d"
-                              % (repr(expr), i_cond+1))
+                res.reason = lambda i_cond=i_cond: (
+                    "%s does not meet condition %d" % (repr(expr), i_cond+1))
                 res.success = False
                 return res
         try:
@@ -319,22 +351,25 @@ class Pattern():
                     if not res.success:
                         return res
         except AttributeError as exc_info:
-            res.reason = ("%s is a scalar, not an Expression: %s"
-                          % (repr(expr), str(exc_info)))
+            res.reason = lambda exc_info=exc_info: (
+                "%s is a scalar, not an Expression: %s"
+                % (repr(expr), str(exc_info)))
             res.success = False
         except ValueError as exc_info:
-            res.reason = "%s: %s" % (repr(expr), str(exc_info))
+            res.reason = lambda exc_info=exc_info: (
+                "%s: %s" % (repr(expr), str(exc_info)))
             res.success = False
         except StopIteration:
-            res.reason = ("%s has an too many positional arguments"
-                          % repr(expr))
+            res.reason = lambda: (
+                "%s has an too many positional arguments" % repr(expr))
             res.success = False
         except KeyError as exc_info:
             if "has already been set" in str(exc_info):
                 res.reason = "Double wildcard: %s" % str(exc_info)
             else:
-                res.reason = ("%s has no keyword argument %s"
-                              % (repr(expr), str(exc_info)))
+                res.reason = lambda exc_info=exc_info: (
+                    "%s has no keyword argument %s"
+                    % (repr(expr), str(exc_info)))
             res.success = False
         if res.success:
             if self.wc_name is not None:
@@ -348,6 +383,42 @@ class Pattern():
                     res.success = False
         return res
 
+    def compiled(self):
+        """Return the compiled matcher for the pattern
+
+        The pattern is lowered (once) into a nested structure of specialized
+        closures. The returned matcher takes an expression as its single
+        argument, and returns None if the pattern does not match the
+        expression, or a :class:`dict` of the wildcard names to the matched
+        expressions otherwise. Unlike :meth:`match`, the compiled matcher
+        does not allocate a :class:`MatchDict` for every (sub-)pattern and does
+        not generate a `reason` for a failed match.
+
+        Example:
+
+            >>> matcher = wc('a', head=int).compiled()
+            >>> matcher(1)
+            {'a': 1}
+            >>> print(matcher('1'))
+            None
+        """
+        if self._compiled is None:
+            self._compiled = _compile_pattern(self, nested=False)
+        return self._compiled
+
+    def _match_compiled(self, expr) -> MatchDict:
+        """Implementation of :meth:`match` through :meth:`compiled`"""
+        bindings = self.compiled()(expr)
+        if bindings is None:
+            res = MatchDict()
+            res.success = False
+            res.reason = lambda: self._match(expr).reason
+        else:
+            res = MatchDict(bindings)
+        if self._has_non_single_arg:
+            res.merge_lists = 1 if self._non_single_arg_on_left else -1
+        return res
+
     def findall(self, expr):
         """list of all matching (sub-)expressions in `expr`
 
@@ -449,6 +520,204 @@ class Pattern():
                                   'conditions', )]))
 
 
+_NO_BINDINGS = {}  # result of a successful compiled match without wildcards
+# Compiled matchers must never modify _NO_BINDINGS (or any dict returned by
+# another matcher, except by taking ownership of it)
+
+
+def _merge_binding(bindings, key, value, merge_lists):
+    """Set `key` to `value` in the dict `bindings` of a compiled match,
+    according to the semantics of :meth:`MatchDict.__setitem__`. Return False
+    if `key` already has a different value (double wildcard), True
+    otherwise."""
+    if key in bindings:
+        old_value = bindings[key]
+        if isinstance(old_value, list) and isinstance(value, list):
+            if merge_lists < 0:
+                old_value.extend(value)
+                return True
+            elif merge_lists > 0:
+                old_value[0:0] = value
+                return True
+        return old_value == value
+    bindings[key] = value
+    return True
+
+
+def _merge_bindings(bindings, other, merge_lists):
+    """Merge the dict `other` into `bindings`, cf. :meth:`MatchDict.update`.
+    Return the resulting bindings, or None for a double wildcard."""
+    if bindings is _NO_BINDINGS:
+        return other  # take ownership of `other`
+    for (key, value) in other.items():
+        if not _merge_binding(bindings, key, value, merge_lists):
+            return None
+    return bindings
+
+
+def _compile_arg(arg):
+    """Compile an element of the `args` or `kwargs` of a :class:`Pattern`
+    into a matcher (cf. :func:`match_pattern`)"""
+    if isinstance(arg, Pattern):
+        return _compile_pattern(arg, nested=True)
+    else:
+
+        def match_literal(expr):
+            if arg == expr:
+                return _NO_BINDINGS
+            return None
+
+        return match_literal
+
+
+def _compile_pattern(pat, nested):
+    """Compile `pat` into a matcher for :meth:`Pattern.compiled`
+
+    If `nested` is True, the matcher is for a sub-pattern. In this case, an
+    :exc:`AttributeError` raised by a condition results in a failed match
+    instead of an exception (as in :func:`match_pattern`).
+    """
+    head = pat.head
+    conditions = tuple(pat.conditions)
+    wc_name = pat.wc_name
+    multiple = pat.mode > Pattern.single
+    merge_lists = 0
+    if pat._has_non_single_arg:
+        merge_lists = 1 if pat._non_single_arg_on_left else -1
+    match_args = _compile_args(pat, merge_lists)
+    match_kwargs = _compile_kwargs(pat, merge_lists)
+
+    def match_compiled(expr):
+        if head is not None and not isinstance(expr, head):
+            return None
+        if nested:
+            try:
+                for condition in conditions:
+                    if not condition(expr):
+                        return None
+            except AttributeError:
+                return None
+        else:
+            for condition in conditions:
+                if not condition(expr):
+                    return None
+        bindings = _NO_BINDINGS
+        try:
+            if match_args is not None:
+                bindings = match_args(expr)
+                if bindings is None:
+                    return None
+            if match_kwargs is not None:
+                bindings = match_kwargs(expr, bindings)
+                if bindings is None:
+                    return None
+        except (AttributeError, ValueError, StopIteration, KeyError):
+            return None
+        if wc_name is not None:
+            value = [expr, ] if multiple else expr
+            if bindings is _NO_BINDINGS:
+                return {wc_name: value}
+            if not _merge_binding(bindings, wc_name, value, merge_lists):
+                return None
+        return bindings
+
+    return match_compiled
+
+
+def _compile_args(pat, merge_lists):
+    """Compile the `args` of `pat` into a function that takes an expression
+    and returns None (no match) or the bindings for the match of the
+    expression's `args`. Return None if `pat` does not have `args`."""
+    if pat.args is None:
+        return None
+    arg_patterns = list(pat._arg_iterator(pat.args))
+    # Note that any Pattern with a mode other than `single` is now last
+    matchers = [_compile_arg(arg) for arg in arg_patterns]
+    arg_iterator = pat._arg_iterator
+    if pat._has_non_single_arg:
+        rest_pattern = arg_patterns[-1]
+        rest_matcher = matchers.pop()
+        n_fixed = len(matchers)
+        min_rest = 1 if rest_pattern.mode == Pattern.one_or_more else 0
+        empty_rest = None
+        if min_rest == 0 and rest_pattern.wc_name is not None:
+            empty_rest = rest_pattern.wc_name
+
+        def match_args(expr):
+            args = list(arg_iterator(expr.args))
+            n_rest = len(args) - n_fixed
+            if n_rest < min_rest:
+                return None
+            bindings = _NO_BINDINGS
+            for (matcher, arg) in zip(matchers, args):
+                sub_bindings = matcher(arg)
+                if sub_bindings is None:
+                    return None
+                if sub_bindings:
+                    bindings = _merge_bindings(
+                        bindings, sub_bindings, merge_lists)
+                    if bindings is None:
+                        return None
+            if n_rest > 0:
+                for arg in args[n_fixed:]:
+                    sub_bindings = rest_matcher(arg)
+                    if sub_bindings is None:
+                        return None
+                    if sub_bindings:
+                        bindings = _merge_bindings(
+                            bindings, sub_bindings, merge_lists)
+                        if bindings is None:
+                            return None
+            elif empty_rest is not None:
+                bindings = _merge_bindings(
+                    bindings, {empty_rest: []}, merge_lists)
+            return bindings
+
+    else:
+        n_args = len(matchers)
+
+        def match_args(expr):
+            args = expr.args
+            if len(args) != n_args:
+                return None
+            bindings = _NO_BINDINGS
+            for (matcher, arg) in zip(matchers, arg_iterator(args)):
+                sub_bindings = matcher(arg)
+                if sub_bindings is None:
+                    return None
+                if sub_bindings:
+                    bindings = _merge_bindings(
+                        bindings, sub_bindings, merge_lists)
+                    if bindings is None:
+                        return None
+            return bindings
+
+    return match_args
+
+
+def _compile_kwargs(pat, merge_lists):
+    """Compile the `kwargs` of `pat` into a function that takes an expression
+    and the bindings of the match so far, and returns None (no match) or the
+    updated bindings. Return None if `pat` does not have `kwargs`."""
+    if pat.kwargs is None:
+        return None
+    matchers = [(key, _compile_arg(arg)) for (key, arg) in pat.kwargs.items()]
+
+    def match_kwargs(expr, bindings):
+        kwargs = expr.kwargs
+        for (key, matcher) in matchers:
+            sub_bindings = matcher(kwargs[key])
+            if sub_bindings is None:
+                return None
+            if sub_bindings:
+                bindings = _merge_bindings(bindings, sub_bindings, merge_lists)
+                if bindings is None:
+                    return None
+        return bindings
+
+    return match_kwargs
+
+
 def pattern(head, *args, mode=1, wc_name=None, conditions=None, **kwargs) \
         -> Pattern:
     """'Flat' constructor for the Pattern class
@@ -626,6 +895,7 @@ def match_pattern(expr_or_pattern: object, expr: object) -> MatchDict:
         else:
             res = MatchDict()
             res.success = False
-            res.reason = "Expressions '%s' and '%s' are not the same" % (
-                          repr(expr_or_pattern), repr(expr))
+            res.reason = lambda: (
+                "Expressions '%s' and '%s' are not the same"
+                % (repr(expr_or_pattern), repr(expr)))
             return res
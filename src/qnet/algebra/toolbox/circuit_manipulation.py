@@ -1,12 +1,17 @@
 from collections import defaultdict
 
+import numpy as np
+
 from ..core.circuit_algebra import (
     Concatenation, SLH, _cumsum, map_channels, )
+from ..core.matrix_algebra import Matrix, identity_matrix, zerosm
 
-__all__ = ["connect", ]
+__all__ = ["connect", "reduce_network"]
 
 
-def connect(components, connections, force_SLH=False, expand_simplify=True):
+def connect(
+        components, connections, force_SLH=False, expand_simplify=True,
+        simplify_strategy=None):
     """Connect a list of components according to a list of connections.
 
     Args:
@@ -19,6 +24,12 @@ def connect(components, connections, force_SLH=False, expand_simplify=True):
         force_SLH (bool): If True, convert the result to an SLH object
         expand_simplify (bool): If the result is an SLH object, expand and
             simplify the circuit after each feedback connection is added
+        simplify_strategy (str or callable or None): The simplification of
+            scalar coefficients to use if `expand_simplify` is True, see
+            :meth:`.SLH.simplify_scalar`. E.g., with ``'auto'``,
+            :func:`sympy.simplify` is only used for coefficients that the
+            cheaper simplification strategies cannot shrink. If None, use the
+            default set with :func:`.set_simplify_scalar_strategy`.
 
     Example:
         >>> A = CircuitSymbol('A', cdim=2)
@@ -53,14 +64,131 @@ def connect(components, connections, force_SLH=False, expand_simplify=True):
         different labels.
     """
     combined = Concatenation.create(*components)
-    cdims = [c.cdim for c in components]
-    offsets = _cumsum([0] + cdims[:-1])
+    offsets = _cumsum([0] + [c.cdim for c in components][:-1])
     imap = []
     omap = []
+    for (c1, op, c2, ip) in _normalized_connections(components, connections):
+        imap.append(offsets[c2] + ip)
+        omap.append(offsets[c1] + op)
+
+    n = combined.cdim
+    nfb = len(connections)
+
+    imapping = map_channels(
+        {k: im for (k, im) in zip(range(n-nfb, n), imap)},
+        n)
+
+    omapping = map_channels(
+        {om: k for (k, om) in zip(range(n-nfb, n), omap)},
+        n)
+
+    combined = omapping << combined << imapping
+
+    if force_SLH:
+        combined = combined.toSLH()
+
+    for k in range(nfb):
+        combined = combined.feedback()
+        if isinstance(combined, SLH) and expand_simplify:
+            combined = combined.expand().simplify_scalar(
+                func=simplify_strategy)
+
+    return combined
+
+
+def reduce_network(
+        components, connections, expand_simplify=True,
+        simplify_strategy=None):
+    """Connect a list of components according to a list of connections, and
+    reduce the resulting network to a single :class:`.SLH` model
+
+    The arguments are the same as for :func:`connect` (with all `components`
+    convertible to :class:`.SLH`), and the result is equivalent to that of
+    ``connect(components, connections, force_SLH=True)``. However, instead of
+    adding one feedback connection at a time to the concatenation of all
+    components, the network is treated as a graph of components, which are
+    merged pairwise:
+
+    1. All connections from a component to itself are closed with feedback
+       in a single step (see :meth:`.SLH.feedback_many`).
+    2. Two components that are connected in one direction only (e.g.
+       successive elements of a chain) are merged via a series product.
+    3. If there are no such components, the two connected components whose
+       merger has the smallest channel dimension are merged via a series
+       product in the direction of the majority of their connections. The
+       connections in the opposite direction are then closed with feedback
+       (step 1).
+
+    Among equivalent choices in steps 2 and 3, the components that are the
+    result of the fewest earlier mergers are merged first, so that e.g. a
+    long chain is reduced as a balanced tree.
+
+    Thus, the series products and feedback loops only act on the small SLH
+    models of the merged components, not on the full network. Permutations of
+    the channels are applied directly to the rows and columns of the S matrix
+    and L vector.
+
+    Args:
+        components (list): List of :class:`.Circuit` instances that can be
+            converted to :class:`.SLH`
+        connections (list): Connections between `components`, see
+            :func:`connect`
+        expand_simplify (bool): If True, expand and simplify the merged SLH
+            model after each reduction step
+        simplify_strategy (str or callable or None): The simplification of
+            scalar coefficients to use if `expand_simplify` is True, see
+            :meth:`.SLH.simplify_scalar`.
+
+    Returns:
+        SLH: The model of the connected network. Its channels are the
+        unconnected input and output channels of the concatenation of
+        `components`, in their original order.
+
+    Raises:
+        ValueError: if `connections` includes any invalid entries
+
+    Example:
+        >>> cav = [
+        ...     SLH([[1]], [[sympy.sqrt(2) * Destroy(hs=i)]], 0)
+        ...     for i in range(2)]
+        >>> chain = reduce_network(
+        ...     components=cav, connections=[((0, 0), (1, 0))])
+        >>> chain == connect(cav, [((0, 0), (1, 0))], force_SLH=True)
+        True
+    """
+    network = _Network(components, connections)
+    if expand_simplify:
+
+        def reduced(slh):
+            return slh.expand().simplify_scalar(func=simplify_strategy)
+
+    else:
+
+        def reduced(slh):
+            return slh
+
+    while len(network.connections) > 0:
+        loops = network.next_loops()
+        if len(loops) > 0:
+            network.close_loops(loops, reduced=reduced)
+        else:
+            network.merge(*network.next_merger(), reduced=reduced)
+    return network.result()
+
+
+def _normalized_connections(components, connections):
+    """List of tuples ``(c1, op, c2, ip)`` of integer indices for the
+    `connections` between `components` (see :func:`connect`), where ``c1``
+    and ``c2`` are indices in `components` and ``op`` and ``ip`` are the
+    indices of the output channel of ``c1`` and the input channel of ``c2``
+
+    Raises:
+        ValueError: if `connections` includes any invalid entries
+    """
     counts = defaultdict(int)
     for component in components:
         counts[component] += 1
-
+    result = []
     for (ic, ((c1, op), (c2, ip))) in enumerate(connections):
 
         # check c1; convert to index int
@@ -139,31 +267,159 @@ def connect(components, connections, force_SLH=False, expand_simplify=True):
                     "Invalid input channel %d <0 or >=%d (cdim of %r) in %r"
                     % (ip, components[c2].cdim, components[c2],
                        connections[ic]))
+        result.append((c1, op, c2, ip))
+    return result
 
-        op_idx = offsets[c1] + op
-        ip_idx = offsets[c2] + ip
-        imap.append(ip_idx)
-        omap.append(op_idx)
 
-    n = combined.cdim
-    nfb = len(connections)
+def _permuted_slh(slh, out_order, in_order):
+    """SLH model whose output channel ``k`` is the output channel
+    ``out_order[k]`` of `slh`, and whose input channel ``k`` is the input
+    channel ``in_order[k]`` of `slh`"""
+    S = slh.S.matrix[np.ix_(out_order, in_order)]
+    L = slh.L.matrix[out_order, :]
+    return SLH(Matrix(S), Matrix(L), slh.H)
 
-    imapping = map_channels(
-        {k: im for (k, im) in zip(range(n-nfb, n), imap)},
-        n)
 
-    omapping = map_channels(
-        {om: k for (k, om) in zip(range(n-nfb, n), omap)},
-        n)
+def _padded_slh(slh, n):
+    """Concatenation of `slh` with `n` identity channels"""
+    if n == 0:
+        return slh
+    return slh.concatenate_slh(
+        SLH(identity_matrix(n), zerosm((n, 1), dtype=int), 0))
 
-    combined = omapping << combined << imapping
 
-    if force_SLH:
-        combined = combined.toSLH()
+class _Network():
+    """Graph of SLH models for :func:`reduce_network`
 
-    for k in range(nfb):
-        combined = combined.feedback()
-        if isinstance(combined, SLH) and expand_simplify:
-            combined = combined.expand().simplify_scalar()
+    Every node of the graph is an SLH model together with the labels of its
+    output and input channels. The labels of the channels are their indices
+    in the concatenation of all components. The connections map the label of
+    an output channel to the label of the input channel it feeds into.
+    The weight of a node is the number of components it contains.
+    """
 
-    return combined
+    def __init__(self, components, connections):
+        offsets = _cumsum([0] + [c.cdim for c in components][:-1])
+        self.nodes = {}  # node index => (slh, outs, ins)
+        self.weights = {}  # node index => number of merged components
+        self.out_nodes = {}  # output label => node index
+        self.in_nodes = {}  # input label => node index
+        for (i, (component, offset)) in enumerate(zip(components, offsets)):
+            labels = list(range(offset, offset + component.cdim))
+            self.nodes[i] = (component.toSLH(), labels, list(labels))
+            self.weights[i] = 1
+            for label in labels:
+                self.out_nodes[label] = i
+                self.in_nodes[label] = i
+        self.connections = {}
+        for (c1, op, c2, ip) in _normalized_connections(
+                components, connections):
+            self.connections[offsets[c1] + op] = offsets[c2] + ip
+
+    def next_loops(self):
+        """List of all connections ``(out_label, in_label)`` from a node to
+        itself, for the first node that has any such connections"""
+        loops = []
+        for (out_label, in_label) in sorted(self.connections.items()):
+            if self.out_nodes[out_label] == self.in_nodes[in_label]:
+                if (len(loops) == 0 or
+                        self.out_nodes[out_label] ==
+                        self.out_nodes[loops[0][0]]):
+                    loops.append((out_label, in_label))
+        return loops
+
+    def next_merger(self):
+        """The node indices ``(upstream, downstream)`` of the next two nodes to
+        be merged"""
+        counts = defaultdict(int)
+        for (out_label, in_label) in self.connections.items():
+            counts[self.out_nodes[out_label], self.in_nodes[in_label]] += 1
+
+        def cost(pair):
+            upstream, downstream = pair
+            n_reverse = counts.get((downstream, upstream), 0)
+            cdim = (
+                len(self.nodes[upstream][1]) + len(self.nodes[downstream][1]) -
+                counts[pair] - n_reverse)
+            weight = self.weights[upstream] + self.weights[downstream]
+            return (n_reverse > 0, cdim, weight, -counts[pair], pair)
+
+        return min(counts, key=cost)
+
+    def close_loops(self, loops, reduced):
+        """Close the feedback loops ``(out_label, in_label)`` in `loops`, all
+        of which must connect the same node to itself"""
+        node = self.out_nodes[loops[0][0]]
+        slh, outs, ins = self.nodes[node]
+        slh = reduced(slh.feedback_many(
+            [(outs.index(out_label), ins.index(in_label))
+             for (out_label, in_label) in loops]))
+        for (out_label, in_label) in loops:
+            outs.remove(out_label)
+            ins.remove(in_label)
+            del self.out_nodes[out_label]
+            del self.in_nodes[in_label]
+            del self.connections[out_label]
+        self.nodes[node] = (slh, outs, ins)
+
+    def merge(self, upstream, downstream, reduced):
+        """Merge the node `upstream` into the node `downstream` by a series
+        product along all connections from `upstream` to `downstream`"""
+        slh_a, outs_a, ins_a = self.nodes.pop(upstream)
+        slh_b, outs_b, ins_b = self.nodes.pop(downstream)
+        inner = [
+            out_label for out_label in outs_a
+            if self.in_nodes.get(self.connections.get(out_label)) ==
+            downstream]
+        inner_ins = set([self.connections[label] for label in inner])
+        free_outs_a = [label for label in outs_a if label not in inner]
+        free_ins_b = [label for label in ins_b if label not in inner_ins]
+        # upstream node, with the free input channels of the downstream node
+        # passed through
+        slh_a = _padded_slh(slh_a, len(free_ins_b))
+        # downstream node, with the free output channels of the upstream node
+        # passed through
+        slh_b = _padded_slh(slh_b, len(free_outs_a))
+        # the output channels of slh_a, in the order of the inputs of slh_b
+        upstream_outs = outs_a + free_ins_b
+        order = {}
+        for (k, label) in enumerate(upstream_outs):
+            if label in inner:
+                order[ins_b.index(self.connections[label])] = k
+            elif k < len(outs_a):
+                order[len(ins_b) + free_outs_a.index(label)] = k
+            else:
+                order[ins_b.index(label)] = k
+        slh_a = _permuted_slh(
+            slh_a, [order[k] for k in range(len(order))],
+            list(range(len(order))))
+        slh = reduced(slh_b.series_with_slh(slh_a))
+        outs = outs_b + free_outs_a
+        ins = ins_a + free_ins_b
+        self.nodes[downstream] = (slh, outs, ins)
+        self.weights[downstream] += self.weights.pop(upstream)
+        for label in outs:
+            self.out_nodes[label] = downstream
+        for label in ins:
+            self.in_nodes[label] = downstream
+        for label in inner:
+            del self.in_nodes[self.connections.pop(label)]
+            del self.out_nodes[label]
+
+    def result(self):
+        """The concatenation of all nodes, with the channels in the order of
+        their labels"""
+        slh = None
+        outs = []
+        ins = []
+        for node in sorted(self.nodes):
+            node_slh, node_outs, node_ins = self.nodes[node]
+            if slh is None:
+                slh = node_slh
+            else:
+                slh = slh.concatenate_slh(node_slh)
+            outs.extend(node_outs)
+            ins.extend(node_ins)
+        return _permuted_slh(
+            slh, sorted(range(len(outs)), key=outs.__getitem__),
+            sorted(range(len(ins)), key=ins.__getitem__))
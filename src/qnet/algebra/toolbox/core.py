@@ -3,13 +3,44 @@ from contextlib import contextmanager
 from collections import OrderedDict
 
 from ..core.abstract_algebra import Expression
+from ..core.abstract_quantum_algebra import (
+    QuantumExpression, _MemoizedSimplification)
+from ..core.matrix_algebra import SparseMatrix
+from ..core.scalar_simplification import simplification_strategy
+from ..core.algebraic_properties import (
+    _invalidate_rules_indices, _rules_index, _RULES_INDICES)
 
 
 __all__ = [
     "no_instance_caching", "temporary_instance_cache", "temporary_rules",
+    "set_instance_cache", "binary_rules_cache_info",
+    "simplify_scalar_cache_info", "clear_simplify_scalar_cache",
+    "set_simplify_scalar_strategy", "set_sparse_matrix_threshold",
     "symbols"]
 
 
+def _empty_cache_like(cache):
+    """Return a new empty instance cache of the same kind as `cache`"""
+    try:
+        return cache.empty_copy()
+    except AttributeError:
+        return {}
+
+
+def _restore_instances(cls, own_instances):
+    """Restore the instance cache of `cls` to `own_instances` (the value of
+    ``cls.__dict__.get('_instances')`` before it was modified).
+
+    If `cls` did not have its own cache, remove the cache defined on `cls`,
+    so that `cls` again uses the cache of its base class.
+    """
+    if own_instances is None:
+        if '_instances' in cls.__dict__:
+            delattr(cls, '_instances')
+    else:
+        cls._instances = own_instances
+
+
 @contextmanager
 def no_instance_caching():
     """Temporarily disable instance caching in :meth:`~.Expression.create`
@@ -27,6 +58,24 @@ def no_instance_caching():
         Expression.instance_caching = orig_flag
 
 
+@contextmanager
+def _no_instance_cache_stores():
+    """Temporarily prevent :meth:`~.Expression.create` from storing new
+    instances in the instance cache
+
+    Unlike :func:`no_instance_caching`, existing instances are still looked
+    up in the cache, and the memoization of binary rules (see
+    :func:`binary_rules_cache_info`) remains active. This is meant for
+    transient expressions that should not accumulate in the cache.
+    """
+    orig_flag = Expression._store_instances
+    Expression._store_instances = False
+    try:
+        yield
+    finally:
+        Expression._store_instances = orig_flag
+
+
 @contextmanager
 def temporary_instance_cache(*classes):
     """Use a temporary cache for instances in :meth:`~.Expression.create`
@@ -38,13 +87,55 @@ def temporary_instance_cache(*classes):
     """
     orig_instances = []
     for cls in classes:
-        orig_instances.append(cls._instances)
-        cls._instances = {}
+        orig_instances.append(cls.__dict__.get('_instances'))
+        cls._instances = _empty_cache_like(cls._instances)
     try:
         yield
     finally:
         for i, cls in enumerate(classes):
-            cls._instances = orig_instances[i]
+            _restore_instances(cls, orig_instances[i])
+
+
+def set_instance_cache(cache):
+    """Replace the cache backend used by :meth:`~.Expression.create`
+
+    Args:
+        cache: The new cache backend for instance caching, for any class. This
+            is usually an instance of one of the classes in
+            :mod:`qnet.utils.cache`, but may be any mutable mapping.
+
+    Returns:
+        The previous cache backend
+
+    Example:
+        To bound the memory of a long-running process, the number of cached
+        instances can be limited, in total and for specific classes::
+
+            >>> orig_cache = set_instance_cache(LRUCache(
+            ...     maxsize=100000, maxsize_per_class={OperatorPlus: 1000}))
+            >>> A = OperatorSymbol('A', hs=0)
+            >>> expr = A + A
+            >>> info = Expression._instances.cache_info()
+            >>> info.maxsize
+            100000
+
+        Alternatively, a :class:`.WeakValueCache` keeps only instances that
+        are still in use elsewhere::
+
+            >>> lru_cache = set_instance_cache(WeakValueCache())
+            >>> _ = set_instance_cache(orig_cache)
+
+    Note:
+        Any instances cached in the previous backend are not carried over to
+        the new backend. Classes that have their own cache (e.g. within the
+        managed context of :func:`temporary_instance_cache`) are not
+        affected.
+    """
+    # this assumes that no sub-class of Expression shadows
+    # Expression._instances
+    orig_cache = Expression._instances
+    Expression._instances = cache
+    return orig_cache
 
 
 @contextmanager
@@ -75,8 +166,8 @@ def temporary_rules(*classes, clear=False):
     orig_simplifications = []
 
     for cls in classes:
-        orig_instances.append(cls._instances)
-        cls._instances = {}
+        orig_instances.append(cls.__dict__.get('_instances'))
+        cls._instances = _empty_cache_like(cls._instances)
         orig_simplifications.append(cls.simplifications)
         cls.simplifications = cls.simplifications.copy()
         try:
@@ -95,17 +186,139 @@ def temporary_rules(*classes, clear=False):
                 cls._binary_rules = cls._binary_rules.copy()
         except AttributeError:
             orig_binary_rules.append(None)
+    _invalidate_rules_indices()
 
     try:
         yield
     finally:
         for i, cls in enumerate(classes):
-            cls._instances = orig_instances[i]
+            _restore_instances(cls, orig_instances[i])
             cls.simplifications = orig_simplifications[i]
             if orig_rules[i] is not None:
                 cls._rules = orig_rules[i]
             if orig_binary_rules[i] is not None:
                 cls._binary_rules = orig_binary_rules[i]
+        _invalidate_rules_indices()
+
+
+def binary_rules_cache_info(*classes):
+    """Statistics for the memoized results of binary rules
+
+    Return a dict that maps each of the given `classes` (all classes that
+    have memoized results of their binary rules, if no `classes` are given)
+    to a :class:`.CacheInfo` for the memoization of the result of applying
+    the class' binary rules to a pair of adjacent operands (see
+    :func:`.match_replace_binary`). The memoized results, and their
+    statistics, are reset whenever any rules are modified.
+    """
+    if len(classes) == 0:
+        classes = [
+            cls for (cls, attr) in list(_RULES_INDICES.keys())
+            if attr == '_binary_rules']
+    return OrderedDict([
+        (cls, _rules_index(cls, '_binary_rules').replacements.cache_info())
+        for cls in classes])
+
+
+def simplify_scalar_cache_info():
+    """Statistics for the memoized results of scalar simplifications
+
+    Return a :class:`.CacheInfo` for the process-wide cache of the results of
+    applying a simplification function to a scalar coefficient, which is
+    shared by all calls to :meth:`~.QuantumExpression.simplify_scalar` (and
+    :meth:`.Matrix.simplify_scalar`, :meth:`.SLH.simplify_scalar`). Every hit
+    is an evaluation of the simplification function (e.g.
+    :func:`sympy.simplify`) that was avoided.
+
+    Example:
+        >>> clear_simplify_scalar_cache()
+        >>> alpha = sympy.symbols('alpha', real=True)
+        >>> A = OperatorSymbol('A', hs=0)
+        >>> expr = ((alpha**2 - 1) / (alpha - 1)) * A
+        >>> expr.simplify_scalar()
+        (alpha + 1) * A^(0)
+        >>> (expr + expr.dag()).simplify_scalar()
+        (alpha + 1) * A^(0) + (alpha + 1) * A^(0)H
+        >>> info = simplify_scalar_cache_info()
+        >>> info.hits, info.misses, info.currsize
+        (2, 1, 1)
+    """
+    return _MemoizedSimplification.cache.cache_info()
+
+
+def clear_simplify_scalar_cache():
+    """Remove all memoized results of scalar simplifications, and reset the
+    statistics reported by :func:`simplify_scalar_cache_info`"""
+    _MemoizedSimplification.cache.clear()
+    _MemoizedSimplification.cache.reset_stats()
+
+
+def set_simplify_scalar_strategy(strategy):
+    """Set the default simplification for scalar coefficients
+
+    Args:
+        strategy (str or callable): The name of a simplification strategy (see
+            :mod:`~qnet.algebra.core.scalar_simplification`), or a function
+            that is applied to each scalar coefficient. This is used by
+            :meth:`~.QuantumExpression.simplify_scalar` (and
+            :meth:`.Matrix.simplify_scalar`, :meth:`.SLH.simplify_scalar`) if
+            no simplification function is given explicitly.
+
+    Returns:
+        The previous default strategy
+
+    Raises:
+        ValueError: if `strategy` is not a known strategy name
+        TypeError: if `strategy` is neither a string nor callable
+
+    Example:
+        >>> g = sympy.symbols('g', positive=True)
+        >>> A = OperatorSymbol('A', hs=0)
+        >>> expr = ((g + 1)**2 - g**2) * A
+        >>> orig_strategy = set_simplify_scalar_strategy('expand')
+        >>> expr.simplify_scalar()
+        (2*g + 1) * A^(0)
+        >>> _ = set_simplify_scalar_strategy(orig_strategy)
+    """
+    simplification_strategy(strategy)  # validate
+    orig_strategy = QuantumExpression._simplify_scalar_strategy
+    QuantumExpression._simplify_scalar_strategy = strategy
+    return orig_strategy
+
+
+def set_sparse_matrix_threshold(dim):
+    """Set the dimension above which matrices are stored as
+    :class:`.SparseMatrix`
+
+    The scattering matrices and coupling vectors of :class:`.SLH` models with
+    a channel dimension of at least `dim`, and the results of
+    :func:`.block_matrix`, :func:`.hstackm`, :func:`.vstackm`, and
+    :func:`.permutation_matrix` with at least `dim` rows are sparse
+    matrices.
+
+    Args:
+        dim (int or None): The minimum number of rows for a sparse matrix. If
+            None, matrices are never converted to sparse matrices
+            automatically.
+
+    Returns:
+        The previous threshold
+
+    Example:
+        >>> slh = Beamsplitter().toSLH()
+        >>> orig_threshold = set_sparse_matrix_threshold(2)
+        >>> type(slh.concatenate_slh(slh).S).__name__
+        'SparseMatrix'
+        >>> _ = set_sparse_matrix_threshold(None)
+        >>> type(slh.concatenate_slh(slh).S).__name__
+        'Matrix'
+        >>> _ = set_sparse_matrix_threshold(orig_threshold)
+    """
+    if dim is not None and int(dim) < 1:
+        raise ValueError("Invalid sparse matrix threshold %r" % (dim, ))
+    orig_threshold = SparseMatrix._auto_threshold
+    SparseMatrix._auto_threshold = dim
+    return orig_threshold
 
 
 def symbols(names, **args):
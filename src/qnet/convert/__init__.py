@@ -1 +1 @@
-"""Conversion to QuTiP and Sympy"""
+"""Conversion to QuTiP, Sympy, and scipy sparse matrices"""
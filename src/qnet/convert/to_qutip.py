@@ -1,16 +1,21 @@
 """Conversion of QNET expressions to qutip objects.
 """
 import re
-from functools import reduce
+from collections import OrderedDict
+from functools import reduce, lru_cache
+import sympy
 from sympy import symbols
 from sympy.utilities.lambdify import lambdify
 from scipy.sparse import csr_matrix
+import numpy as np
 from numpy import (
     diag as np_diag, arange, cos as np_cos, sin as np_sin)
 from ..algebra.core.scalar_algebra import ScalarValue, is_scalar
 from ..algebra.core.exceptions import AlgebraError
 from ..algebra.core.circuit_algebra import SLH, move_drive_to_H
-from ..algebra.core.abstract_algebra import Operation
+from ..algebra.core.abstract_algebra import Operation, batch_substitute
+from ..algebra.core.abstract_quantum_algebra import (
+    QuantumPlus, ScalarTimesQuantumExpression)
 from ..algebra.core.operator_algebra import (
     Operator, IdentityOperator, ZeroOperator, LocalOperator, LocalSigma,
     OperatorPlus, OperatorTimes, ScalarTimesOperator,
@@ -20,8 +25,11 @@ from ..algebra.library.fock_operators import (
     Destroy, Create, Phase, Displace, Squeeze)
 from ..algebra.core.state_algebra import (
     State, BraKet, KetBra, BasisKet, CoherentStateKet, KetPlus, TensorKet,
-    ScalarTimesKet, OperatorTimesKet)
+    ScalarTimesKet, OperatorTimesKet, Bra)
 from ..algebra.core.hilbert_space_algebra import TrivialSpace
+from ..utils.cache import LRUCache
+from .to_scipy_sparse import (
+    _assemble_operator_terms as _assemble_sparse_operator_terms)
 from ..algebra.core.super_operator_algebra import (
     SuperOperator, IdentitySuperOperator, SuperOperatorPlus,
     SuperOperatorTimes, ScalarTimesSuperOperator, SPre, SPost,
@@ -38,7 +46,16 @@ except ImportError:
 
 DENSE_DIMENSION_LIMIT = 1000
 
-__all__ = ['convert_to_qutip', 'SLH_to_qutip']
+LOCAL_OPERATOR_CACHE_SIZE = 1024
+# maximum number of converted local operators to keep in
+# _LOCAL_OPERATOR_CACHE
+
+_LOCAL_OPERATOR_CACHE = LRUCache(maxsize=LOCAL_OPERATOR_CACHE_SIZE)
+# (expr, full_space) => qutip.Qobj, see _cached_local_operator_to_qutip
+
+__all__ = [
+    'convert_to_qutip', 'SLH_to_qutip', 'convert_to_qutip_sweep',
+    'SLH_to_qutip_sweep']
 
 
 def convert_to_qutip(expr, full_space=None, mapping=None):
@@ -89,7 +106,10 @@ def convert_to_qutip(expr, full_space=None, mapping=None):
               for s in full_space.local_factors]
         )
     elif isinstance(expr, LocalOperator):
-        return _convert_local_operator_to_qutip(expr, full_space, mapping)
+        if mapping is None:
+            # the cached Qobj is shared, so the caller gets a copy
+            return _cached_local_operator_to_qutip(expr, full_space).copy()
+        return _local_operator_to_qutip(expr, full_space, mapping)
     elif (isinstance(expr, Operator) and isinstance(expr, Operation)):
         return _convert_operator_operation_to_qutip(expr, full_space, mapping)
     elif isinstance(expr, OperatorTrace):
@@ -119,7 +139,7 @@ def convert_to_qutip(expr, full_space=None, mapping=None):
 
 
 def SLH_to_qutip(slh, full_space=None, time_symbol=None,
-                 convert_as='pyfunc'):
+                 convert_as='pyfunc', tlist=None):
     """Generate and return QuTiP representation matrices for the Hamiltonian
     and the collapse operators. Any inhomogeneities in the Lindblad operators
     (resulting from coherent drives) will be moved into the Hamiltonian, cf.
@@ -132,18 +152,36 @@ def SLH_to_qutip(slh, full_space=None, time_symbol=None,
         time_symbol (:class:`sympy.Symbol` or None): The symbol (if any)
             expressing time dependence (usually 't')
         convert_as (str): How to express time dependencies to qutip. Must be
-            'pyfunc' or 'str'
+            one of 'pyfunc', 'str', 'vectorized', or 'array', see below
+        tlist (array or None): The time grid on which to sample the
+            time-dependent coefficients, for ``convert_as='array'``. This
+            must be the same `tlist` that is passed to the qutip solver.
 
     Returns:
         tuple ``(H, [L1, L2, ...])`` as numerical `qutip.Qobj` representations,
         where ``H`` and each ``L`` may be a nested list to express time
         dependence, e.g.  ``H = [H0, [H1, eps_t]]``, where ``H0`` and
-        ``H1`` are of type `qutip.Qobj`, and ``eps_t`` is either a string
-        (``convert_as='str'``) or a function (``convert_as='pyfunc'``)
+        ``H1`` are of type `qutip.Qobj`, and ``eps_t`` is
+
+        * for ``convert_as='pyfunc'``, a function ``eps_t(t, args)``
+          evaluating a separately lambdified coefficient,
+        * for ``convert_as='str'``, a string,
+        * for ``convert_as='vectorized'``, a function ``eps_t(t, args)``.
+          The time-dependent coefficients of ``H`` and all ``L`` are
+          lambdified together into a single numpy function, available as
+          ``eps_t.coeffs``, that returns the values of all coefficients for a
+          given `t` (or array of `t`), and caches the result for the most
+          recent `t`. Free symbols other than `time_symbol` are taken from
+          `args` (by name)
+        * for ``convert_as='array'``, the array of coefficient values
+          sampled on `tlist`, to be interpolated by qutip.
 
     Raises:
         AlgebraError: If the Hilbert space (`slh.space` or `full_space`) is
             invalid for numerical conversion
+        ValueError: If `tlist` is not given for ``convert_as='array'``, or if
+            the time-dependent coefficients contain free symbols other than
+            `time_symbol` for ``convert_as='array'``
     """
     if full_space:
         if not full_space >= slh.space:
@@ -166,29 +204,279 @@ def SLH_to_qutip(slh, full_space=None, time_symbol=None,
             if L_qutip.norm('max') > 0:
                 Ls.append(L_qutip)
     else:
+        if convert_as == 'array' and tlist is None:
+            raise ValueError("convert_as='array' requires tlist")
+        coeffs = None
+        if convert_as in ['vectorized', 'array']:
+            coeffs = _TimeDependentCoefficients(time_symbol)
         H = _time_dependent_to_qutip(slh.H, full_space, time_symbol,
-                                     convert_as)
+                                     convert_as, coeffs=coeffs)
         Ls = []
         for L in slh.Ls:
             if is_scalar(L):
                 L = L * IdentityOperator
             L_qutip = _time_dependent_to_qutip(L, full_space, time_symbol,
-                                               convert_as)
+                                               convert_as, coeffs=coeffs)
             Ls.append(L_qutip)
+        if convert_as == 'array':
+            if len(coeffs.params) > 0:
+                raise ValueError(
+                    "Time-dependent coefficients contain symbols %s other "
+                    "than %s" % (coeffs.params, time_symbol))
+            samples = coeffs(np.asarray(tlist, dtype=np.float64))
+            H = _sampled_coefficients(H, samples)
+            Ls = [_sampled_coefficients(L, samples) for L in Ls]
     return H, Ls
 
 
-def _convert_local_operator_to_qutip(expr, full_space, mapping):
-    """Convert a LocalOperator instance to qutip"""
+def convert_to_qutip_sweep(expr, params, values, full_space=None):
+    """Convert a QNET expression to qutip objects for many numerical values of
+    its parameters
+
+    Up to numerical round-off, this is equivalent to::
+
+        [convert_to_qutip(expr.substitute(dict(zip(params, vals))),
+                          full_space)
+         for vals in values]
+
+    but the symbolic processing (expansion of `expr`, and the conversion of
+    every operator term to qutip) is done only once. The scalar coefficients
+    of all terms are compiled into a single numerical function via
+    :func:`sympy.lambdify`, which is evaluated for all `values` at once.
+
+    Args:
+        expr: a QNET expression, e.g. an :class:`.Operator`
+        params (list): the sympy symbols for the parameters in `expr`
+        values (array-like): The numerical values for `params`, as a
+            two-dimensional array of shape ``(N, len(params))``. If there is
+            only a single parameter, a one-dimensional array of length ``N``
+            is also accepted
+        full_space (HilbertSpace): The Hilbert space in which `expr` is
+            defined, cf. :func:`convert_to_qutip`
+
+    Returns:
+        list: the ``N`` qutip objects, one for each row of `values`
+
+    Raises:
+        ValueError: if `values` has the wrong shape, or if the coefficients
+            in `expr` contain symbols that are not in `params`
+    """
+    params = list(params)
+    values = _sweep_values(params, values)
+    if full_space is None:
+        full_space = expr.space
+    coeffs, terms = _sweep_terms(expr, params, values)
+    n_values = len(values)
+    if len(terms) == 0:
+        return [_sweep_zero(expr, full_space) for _ in range(n_values)]
+    coeff_vals = _sweep_coeff_vals(coeffs, params, values)
+    terms_qutip = []
+    for term in terms:
+        if isinstance(term, list):  # term depends on the parameters
+            terms_qutip.append([
+                convert_to_qutip(t, full_space=full_space) for t in term])
+        else:
+            terms_qutip.append(convert_to_qutip(term, full_space=full_space))
+    results = []
+    for i in range(n_values):
+        result = 0
+        for (c_vals, term_qutip) in zip(coeff_vals, terms_qutip):
+            if isinstance(term_qutip, list):
+                term_qutip = term_qutip[i]
+            result = result + complex(c_vals[i]) * term_qutip
+        results.append(result)
+    return results
+
+
+def SLH_to_qutip_sweep(slh, params, values, full_space=None):
+    """Generate the QuTiP representation of the Hamiltonian and the collapse
+    operators of `slh` for many numerical values of its parameters
+
+    This is equivalent to calling :func:`SLH_to_qutip` on `slh` with `params`
+    substituted by each row of `values`, but all symbolic processing is done
+    only once, see :func:`convert_to_qutip_sweep` (whose arguments have the
+    same meaning). Time-dependent models are not supported.
+
+    Returns:
+        list: a tuple ``(H, [L1, L2, ...])`` for each row of `values`, cf.
+        :func:`SLH_to_qutip`
+    """
+    if full_space:
+        if not full_space >= slh.space:
+            raise AlgebraError("full_space="+str(full_space)+" needs to "
+                               "at least include slh.space = "+str(slh.space))
+    else:
+        full_space = slh.space
+    if full_space == TrivialSpace:
+        raise AlgebraError(
+            "Cannot convert SLH object in TrivialSpace. "
+            "You may pass a non-trivial `full_space`")
+    slh = move_drive_to_H(slh)
+    Hs = convert_to_qutip_sweep(slh.H, params, values, full_space=full_space)
+    Ls_per_L = []
+    for L in slh.Ls:
+        if is_scalar(L):
+            L = L * IdentityOperator
+        Ls_per_L.append(
+            convert_to_qutip_sweep(L, params, values, full_space=full_space))
+    results = []
+    for (i, H) in enumerate(Hs):
+        Ls = []
+        for L_values in Ls_per_L:
+            if L_values[i].norm('max') > 0:
+                Ls.append(L_values[i])
+        results.append((H, Ls))
+    return results
+
+
+def _sweep_values(params, values):
+    """Convert `values` for :func:`convert_to_qutip_sweep` into a
+    two-dimensional numpy array"""
+    values = np.asarray(values)
+    if values.ndim == 1 and len(params) == 1:
+        values = values.reshape((-1, 1))
+    if values.ndim != 2 or values.shape[1] != len(params):
+        raise ValueError(
+            "values must be an array of shape (N, %d), not %s"
+            % (len(params), values.shape))
+    return values
+
+
+def _sweep_zero(expr, full_space):
+    """Zero qutip object of the same kind (operator, ket, bra, or
+    super-operator) as `expr`, in `full_space`"""
+    if isinstance(expr, State):
+        dims = [ls.dimension for ls in full_space.local_factors]
+        ket = qutip.Qobj(
+            csr_matrix((full_space.dimension, 1)),
+            dims=[dims, [1] * len(dims)])
+        return ket.dag() if expr.isbra else ket
+    zero = convert_to_qutip(ZeroOperator, full_space=full_space)
+    if isinstance(expr, SuperOperator):
+        return qutip.spre(zero)
+    return zero
+
+
+def _sweep_terms(expr, params, values):
+    """Split `expr` into lists of coefficients and terms for
+    :func:`convert_to_qutip_sweep`
+
+    Each coefficient is a sympy expression (or a number), or a list with the
+    numerical value for each row of `values` if the coefficient cannot be
+    converted to a sympy expression. Each term is a QNET expression that
+    does not depend on `params`, or a list with the term for each row of
+    `values` (with the parameters substituted), otherwise. Terms with the
+    same operator are combined.
+    """
+    expr = expr.expand()
+    if expr.is_zero or (isinstance(expr, Bra) and expr.ket.is_zero):
+        return [], []
+    if isinstance(expr, QuantumPlus):
+        operands = expr.operands
+    else:
+        operands = [expr, ]
+    var_maps = None
+    coeffs = OrderedDict()  # term => coeff
+    for operand in operands:
+        if isinstance(operand, ScalarTimesQuantumExpression):
+            coeff, term = operand.coeff, operand.term
+        else:
+            coeff, term = 1, operand
+        if isinstance(coeff, ScalarValue):
+            coeff = coeff.val
+        if not isinstance(coeff, (sympy.Basic, int, float, complex)):
+            if var_maps is None:
+                var_maps = _sweep_var_maps(params, values)
+            coeff = [complex(c) for c in batch_substitute(coeff, var_maps)]
+        if term in coeffs:
+            if isinstance(coeff, list) or isinstance(coeffs[term], list):
+                coeff = list(np.broadcast_to(
+                    coeff, len(values)) + np.broadcast_to(
+                        coeffs[term], len(values)))
+            else:
+                coeff = coeff + coeffs[term]
+        coeffs[term] = coeff
+    terms = []
+    for term in coeffs.keys():
+        if set(params) & term.free_symbols:
+            if var_maps is None:
+                var_maps = _sweep_var_maps(params, values)
+            terms.append(batch_substitute(term, var_maps))
+        else:
+            terms.append(term)
+    return list(coeffs.values()), terms
+
+
+def _sweep_var_maps(params, values):
+    """List of dicts mapping `params` to each row of `values`"""
+    return [dict(zip(params, row)) for row in values]
+
+
+def _sweep_coeff_vals(coeffs, params, values):
+    """Numerical values for the `coeffs` from :func:`_sweep_terms`, as a list
+    of arrays of length ``N = len(values)``.
+
+    All sympy coefficients are evaluated through a single lambdified function
+    that is vectorized over the rows of `values`."""
+    n_values = len(values)
+    symbolic = [
+        i for (i, coeff) in enumerate(coeffs) if not isinstance(coeff, list)]
+    result = list(coeffs)
+    if len(symbolic) > 0:
+        sym_coeffs = [sympy.sympify(coeffs[i]) for i in symbolic]
+        free_symbols = set.union(*[c.free_symbols for c in sym_coeffs])
+        unknown = free_symbols - set(params)
+        if len(unknown) > 0:
+            raise ValueError(
+                "Coefficients contain symbols that are not in params: %s"
+                % ", ".join(sorted(str(sym) for sym in unknown)))
+        func = lambdify(params, sym_coeffs, modules='numpy')
+        vals = func(*[values[:, j] for j in range(len(params))])
+        for (i, val) in zip(symbolic, vals):
+            result[i] = np.broadcast_to(
+                np.asarray(val, dtype=np.complex128), (n_values, ))
+    return result
+
+
+@lru_cache(maxsize=128)
+def _qeye(dimension):
+    """Identity of the given `dimension`. The (shared) result must not be
+    modified in-place."""
+    return qutip.qeye(dimension)
+
+
+def _cached_local_operator_to_qutip(expr, full_space):
+    """Convert a LocalOperator instance to qutip, without a mapping
+
+    The result is cached (in `_LOCAL_OPERATOR_CACHE`), as the same local
+    operators generally occur in many terms of an expression. The (shared)
+    result must not be modified in-place, and must not be handed out by
+    :func:`convert_to_qutip` without copying it.
+    """
+    key = (expr, full_space)
+    try:
+        return _LOCAL_OPERATOR_CACHE[key]
+    except KeyError:
+        result = _local_operator_to_qutip(expr, full_space, None)
+        _LOCAL_OPERATOR_CACHE[key] = result
+        return result
+
+
+def _local_operator_to_qutip(expr, full_space, mapping):
+    """Convert a LocalOperator instance to qutip (uncached)"""
     n = full_space.dimension
     if full_space != expr.space:
         all_spaces = full_space.local_factors
         own_space_index = all_spaces.index(expr.space)
+        if mapping is None:
+            local_qobj = _cached_local_operator_to_qutip(expr, expr.space)
+        else:
+            local_qobj = _local_operator_to_qutip(expr, expr.space, mapping)
         return qutip.tensor(
-            *([qutip.qeye(s.dimension)
+            *([_qeye(s.dimension)
                for s in all_spaces[:own_space_index]] +
-              [convert_to_qutip(expr, expr.space, mapping=mapping), ] +
-              [qutip.qeye(s.dimension)
+              [local_qobj, ] +
+              [_qeye(s.dimension)
                for s in all_spaces[own_space_index + 1:]])
         )
     if isinstance(expr, Create):
@@ -202,15 +490,16 @@ def _convert_local_operator_to_qutip(expr, full_space, mapping):
     elif isinstance(expr, Destroy):
         return qutip.destroy(n)
     elif isinstance(expr, Phase):
-        arg = complex(expr.operands[1]) * arange(n)
+        arg = complex(expr.phase) * arange(n)
         d = np_cos(arg) + 1j * np_sin(arg)
         return qutip.Qobj(np_diag(d))
     elif isinstance(expr, Displace):
-        alpha = expr.operands[1]
+        alpha = complex(expr.displacement)
         return qutip.displace(n, alpha)
     elif isinstance(expr, Squeeze):
-        eta = expr.operands[1]
-        return qutip.displace(n, eta)
+        eta = complex(expr.squeezing_factor)
+        # qutip's squeezing parameter has the opposite sign
+        return qutip.squeeze(n, -eta)
     elif isinstance(expr, LocalSigma):
         j = expr.j
         k = expr.k
@@ -228,8 +517,7 @@ def _convert_local_operator_to_qutip(expr, full_space, mapping):
 
 def _convert_operator_operation_to_qutip(expr, full_space, mapping):
     if isinstance(expr, OperatorPlus):
-        return sum((convert_to_qutip(op, full_space, mapping=mapping)
-                    for op in expr.operands), 0)
+        return _assemble_operator_terms(expr.operands, full_space, mapping)
     elif isinstance(expr, OperatorTimes):
         # if any factor acts non-locally, we need to expand distributively.
         if any(len(op.space) > 1 for op in expr.operands):
@@ -239,22 +527,9 @@ def _convert_operator_operation_to_qutip(expr, full_space, mapping):
                                  .format(expr))
             return convert_to_qutip(se, full_space, mapping=mapping)
         all_spaces = full_space.local_factors
-        by_space = []
-        ck = 0
-        for ls in all_spaces:
-            # group factors by associated local space
-            ls_ops = [convert_to_qutip(o, o.space, mapping=mapping)
-                      for o in expr.operands if o.space == ls]
-            if len(ls_ops):
-                # compute factor associated with local space
-                by_space.append(reduce(lambda a, b: a * b, ls_ops, 1))
-                ck += len(ls_ops)
-            else:
-                # if trivial action, take identity matrix
-                by_space.append(qutip.qeye(ls.dimension))
+        ck = sum(1 for o in expr.operands if o.space in all_spaces)
         assert ck == len(expr.operands)
-        # combine local factors in tensor product
-        return qutip.tensor(*by_space)
+        return _assemble_operator_terms([expr], full_space, mapping)
     elif isinstance(expr, Adjoint):
         return convert_to_qutip(qutip.dag(expr.operands[0]), full_space,
                                 mapping=mapping)
@@ -304,15 +579,34 @@ def _convert_operator_operation_to_qutip(expr, full_space, mapping):
                          % (str(expr), type(expr)))
 
 
+def _assemble_operator_terms(terms, full_space, mapping):
+    """Convert the sum of the operators in `terms` to qutip, see
+    :func:`qnet.convert.to_scipy_sparse._assemble_operator_terms`"""
+
+    def convert(term):
+        qobj = convert_to_qutip(term, full_space, mapping=mapping)
+        return qobj.data, qobj.dims[0]
+
+    def convert_local(op, local_space):
+        if mapping is None and isinstance(op, LocalOperator):
+            # the shared cached Qobj is not modified, so no copy is needed
+            return _cached_local_operator_to_qutip(op, local_space).data
+        return convert_to_qutip(op, local_space, mapping=mapping).data
+
+    matrix, dims = _assemble_sparse_operator_terms(
+        terms, full_space, mapping, convert, convert_local)
+    return qutip.Qobj(matrix, dims=[dims, dims])
+
+
 def _convert_state_operation_to_qutip(expr, full_space, mapping):
     if full_space != expr.space:
         all_spaces = full_space.local_factors
         own_space_index = all_spaces.index(expr.space)
         return qutip.tensor(
-            *([qutip.qeye(s.dimension)
+            *([_qeye(s.dimension)
                for s in all_spaces[:own_space_index]] +
               convert_to_qutip(expr, expr.space, mapping=mapping) +
-              [qutip.qeye(s.dimension)
+              [_qeye(s.dimension)
                for s in all_spaces[own_space_index + 1:]])
         )
     if isinstance(expr, BraKet):
@@ -334,9 +628,9 @@ def _convert_ket_to_qutip(expr, full_space, mapping):
         all_spaces = full_space.local_factors
         own_space_index = all_spaces.index(expr.space)
         factors = (
-            [qutip.qeye(s.dimension) for s in all_spaces[:own_space_index]] +
+            [_qeye(s.dimension) for s in all_spaces[:own_space_index]] +
             [convert_to_qutip(expr, expr.space, mapping=mapping), ] +
-            [qutip.qeye(s.dimension) for s in all_spaces[own_space_index + 1:]]
+            [_qeye(s.dimension) for s in all_spaces[own_space_index + 1:]]
         )
         return qutip.tensor(*factors)
     if isinstance(expr, BasisKet):
@@ -360,8 +654,9 @@ def _convert_ket_to_qutip(expr, full_space, mapping):
         return complex(expr.coeff) * convert_to_qutip(expr.term, full_space,
                                                       mapping=mapping)
     elif isinstance(expr, OperatorTimesKet):
-        return convert_to_qutip(expr.coeff, full_space, mapping=mapping) * \
-                convert_to_qutip(expr.term, full_space, mapping=mapping)
+        return (
+            convert_to_qutip(expr.operator, full_space, mapping=mapping) *
+            convert_to_qutip(expr.ket, full_space, mapping=mapping))
     else:
         raise ValueError("Cannot convert '%s' of type %s"
                          % (str(expr), type(expr)))
@@ -372,14 +667,14 @@ def _convert_superoperator_to_qutip(expr, full_space, mapping):
         all_spaces = full_space.local_factors
         own_space_index = all_spaces.index(expr.space)
         return qutip.tensor(
-            *([qutip.qeye(s.dimension)
+            *([_qeye(s.dimension)
                for s in all_spaces[:own_space_index]] +
               convert_to_qutip(expr, expr.space, mapping=mapping) +
-              [qutip.qeye(s.dimension)
+              [_qeye(s.dimension)
                for s in all_spaces[own_space_index + 1:]])
         )
-    if isinstance(expr, IdentitySuperOperator):
-        return qutip.spre(qutip.tensor(*[qutip.qeye(s.dimension)
+    if expr is IdentitySuperOperator:
+        return qutip.spre(qutip.tensor(*[_qeye(s.dimension)
                                          for s in full_space.local_factors]))
     elif isinstance(expr, SuperOperatorPlus):
         return sum((convert_to_qutip(op, full_space, mapping=mapping)
@@ -411,9 +706,15 @@ def _convert_superoperator_to_qutip(expr, full_space, mapping):
 
 def _time_dependent_to_qutip(
         op, full_space=None, time_symbol=symbols("t", real=True),
-        convert_as='pyfunc'):
+        convert_as='pyfunc', coeffs=None):
     """Convert a possiblty time-dependent operator into the nested-list
-    structure required by QuTiP"""
+    structure required by QuTiP
+
+    For ``convert_as='vectorized'`` or ``convert_as='array'``, all
+    time-dependent coefficients are collected in the given
+    :class:`_TimeDependentCoefficients` instance `coeffs`, and each
+    coefficient is represented by a :class:`_CoefficientFunction`.
+    """
     if full_space is None:
         full_space = op.space
     if time_symbol in op.free_symbols:
@@ -430,7 +731,7 @@ def _time_dependent_to_qutip(
             for o in op.operands:
                 if time_symbol in o.free_symbols:
                     result.append(_time_dependent_to_qutip(o, full_space,
-                                  time_symbol, convert_as))
+                                  time_symbol, convert_as, coeffs))
             return result
         elif (
                 isinstance(op, ScalarTimesOperator) and
@@ -452,12 +753,128 @@ def _time_dependent_to_qutip(
                 # routines, or lambdify with 'numexpr' to implement this in a
                 # more robust way
                 coeff = re.sub("I", "(1.0j)", str(op.coeff.val))
+            elif convert_as in ['vectorized', 'array']:
+                coeff = coeffs.add(op.coeff.val)
             else:
                 raise ValueError(("Invalid value '%s' for `convert_as`, must "
-                                  "be one of 'str', 'pyfunc'") % convert_as)
+                                  "be one of 'str', 'pyfunc', 'vectorized', "
+                                  "'array'") % convert_as)
             return [convert_to_qutip(op.term, full_space), coeff]
         else:
             raise ValueError("op cannot be expressed in qutip. It must have "
                              "the structure op = sum_i f_i(t) * op_i")
     else:
         return convert_to_qutip(op, full_space=full_space)
+
+
+class _TimeDependentCoefficients(object):
+    """Vectorized evaluation of a list of time-dependent coefficients
+
+    Calling the instance with a time `t` (and a dict `args` of values for any
+    other free symbols, by name) returns the list of the (complex) values of
+    all coefficients added via :meth:`add`. All coefficients are lambdified
+    together into a single numpy function, and the result for the most
+    recent `t` is cached. For an array `t`, the result is a 2D array of the
+    coefficients (first index) at each time (second index).
+    """
+
+    def __init__(self, time_symbol):
+        self.time_symbol = time_symbol
+        self.exprs = []
+        self._indices = {}  # expr => index in self.exprs
+        self._func = None
+        self._params = None
+        self._cached_t = None
+        self._cached_vals = None
+        self._cached_vector = None
+
+    def add(self, expr):
+        """Add the sympy expression `expr`, and return a
+        :class:`_CoefficientFunction` for it. Identical expressions share the
+        same component of the vector of coefficients."""
+        expr = sympy.sympify(expr)
+        try:
+            index = self._indices[expr]
+        except KeyError:
+            self._func = None
+            index = len(self.exprs)
+            self.exprs.append(expr)
+            self._indices[expr] = index
+        return _CoefficientFunction(self, index)
+
+    @property
+    def params(self):
+        """List of free symbols other than the time symbol"""
+        if self._params is None:
+            symbols = set()
+            for expr in self.exprs:
+                symbols.update(expr.free_symbols)
+            symbols.discard(self.time_symbol)
+            self._params = sorted(symbols, key=str)
+        return self._params
+
+    def _compile(self):
+        self._params = None
+        self._func = lambdify(
+            [self.time_symbol] + self.params, self.exprs, modules='numpy')
+        self._cached_t = None
+
+    def _param_vals(self, args):
+        param_vals = []
+        for param in self.params:
+            try:
+                param_vals.append(
+                    args[param] if param in args else args[param.name])
+            except (KeyError, TypeError):
+                raise ValueError(
+                    "No value for symbol %s in args %r" % (param, args))
+        return tuple(param_vals)
+
+    def __call__(self, t, args=None):
+        if self._func is None:
+            self._compile()
+        param_vals = self._param_vals(args) if self._params else ()
+        if isinstance(t, float) or np.ndim(t) == 0:
+            # solvers evaluate all coefficients at the same t in a row
+            if t == self._cached_t and param_vals == self._cached_vals:
+                return self._cached_vector
+            vector = np.array(
+                self._func(t, *param_vals), dtype=np.complex128)
+            self._cached_t = t
+            self._cached_vals = param_vals
+            self._cached_vector = vector.tolist()
+            return self._cached_vector
+        vals = self._func(t, *param_vals)
+        return np.array(
+            np.broadcast_arrays(*vals, t)[:-1], dtype=np.complex128)
+
+
+class _CoefficientFunction(object):
+    """Time-dependent coefficient ``f(t, args)`` for qutip, evaluated as a
+    component of the vector of :class:`_TimeDependentCoefficients`
+    `coeffs`"""
+
+    __slots__ = ('coeffs', 'index')
+
+    def __init__(self, coeffs, index):
+        self.coeffs = coeffs
+        self.index = index
+
+    def __call__(self, t, args):
+        coeffs = self.coeffs
+        if (t.__class__ is float and t == coeffs._cached_t and
+                not coeffs._params):
+            # shortcut for the most common case
+            return coeffs._cached_vector[self.index]
+        return coeffs(t, args)[self.index]
+
+
+def _sampled_coefficients(td_op, samples):
+    """Replace every :class:`_CoefficientFunction` in the time-dependent
+    operator structure `td_op` by the corresponding row of `samples`"""
+    if isinstance(td_op, list):
+        return [_sampled_coefficients(item, samples) for item in td_op]
+    elif isinstance(td_op, _CoefficientFunction):
+        return samples[td_op.index]
+    else:
+        return td_op
@@ -0,0 +1,744 @@
+"""Conversion of QNET expressions to sparse (scipy) or dense (numpy)
+matrices.
+
+Unlike :func:`qnet.convert.to_qutip.convert_to_qutip`, the conversion does not
+require qutip, and avoids the overhead of instantiating :class:`qutip.Qobj`
+objects. Kets are converted to column vectors, bras to row vectors, and
+super-operators to matrices acting on operators that have been vectorized by
+stacking their columns (the same convention as in qutip).
+
+For Hilbert spaces that are too large to hold even a sparse matrix in memory,
+:func:`convert_to_linear_operator` converts an operator to a matrix-free
+:class:`scipy.sparse.linalg.LinearOperator`.
+"""
+from collections import OrderedDict
+from functools import partial, reduce
+
+import numpy as np
+from scipy.linalg import expm, pinv, svd
+from scipy.sparse import coo_matrix, csr_matrix, identity, kron
+from scipy.sparse.linalg import LinearOperator
+
+from ..algebra.core.circuit_algebra import SLH
+from ..algebra.core.exceptions import AlgebraError
+from ..algebra.core.hilbert_space_algebra import TrivialSpace
+from ..algebra.core.operator_algebra import (
+    DENSE_DIMENSION_LIMIT, Operator, IdentityOperator, ZeroOperator,
+    LocalOperator, LocalSigma, OperatorPlus, OperatorTimes,
+    ScalarTimesOperator, Adjoint, PseudoInverse, OperatorTrace,
+    NullSpaceProjector)
+from ..algebra.core.state_algebra import (
+    State, BraKet, KetBra, BasisKet, CoherentStateKet, KetPlus, TensorKet,
+    ScalarTimesKet, OperatorTimesKet, Bra, ZeroKet)
+from ..algebra.core.super_operator_algebra import (
+    SuperOperator, IdentitySuperOperator, SuperOperatorPlus,
+    SuperOperatorTimes, ScalarTimesSuperOperator, SPre, SPost,
+    SuperOperatorTimesOperator, ZeroSuperOperator)
+from ..algebra.library.fock_operators import (
+    Destroy, Create, Phase, Displace, Squeeze)
+from ..algebra.library.spin_algebra import Jz, Jplus, Jminus
+from ..utils.cache import LRUCache
+
+__all__ = ['convert_to_scipy_sparse', 'convert_to_linear_operator']
+
+LOCAL_OPERATOR_CACHE_SIZE = 1024
+# maximum number of local operator matrices to keep in _LOCAL_OPERATOR_CACHE
+
+_LOCAL_OPERATOR_CACHE = LRUCache(maxsize=LOCAL_OPERATOR_CACHE_SIZE)
+# expr => scipy.sparse.csr_matrix, see _convert_local. The cached matrices
+# must not be modified in-place
+
+
+def convert_to_scipy_sparse(expr, full_space=None, mapping=None, dense=False):
+    """Convert a QNET expression to a sparse matrix
+
+    Args:
+        expr: a QNET expression (an operator, state, or super-operator)
+        full_space (HilbertSpace): The
+            Hilbert space in which `expr` is defined. If not given,
+            ``expr.space`` is used. The Hilbert space must have a well-defined
+            basis.
+        mapping (dict): A mapping of any (sub-)expression to either a matrix
+            (a scipy sparse matrix or a numpy array) directly, or to a
+            callable that will convert the expression into a matrix. Useful
+            for e.g. supplying objects for symbols
+        dense (bool): If True, return a dense numpy array instead of a
+            sparse matrix. This is only recommended for small Hilbert spaces.
+
+    Returns:
+        scipy.sparse.csr_matrix or numpy.ndarray: The matrix representation
+        of `expr`
+
+    Raises:
+        ValueError: if `expr` is not in `full_space`, or if `expr` cannot be
+            converted.
+    """
+    if full_space is None:
+        full_space = expr.space
+    if not expr.space.is_tensor_factor_of(full_space):
+        raise ValueError(
+            "expr '%s' must be in full_space %s" % (expr, full_space))
+    if full_space == TrivialSpace:
+        raise AlgebraError(
+            "Cannot convert object in TrivialSpace to a matrix. "
+            "You may pass a non-trivial `full_space`")
+    matrix = _convert(expr, full_space, mapping)
+    if dense:
+        return matrix.toarray()
+    return matrix
+
+
+def convert_to_linear_operator(expr, full_space=None, mapping=None):
+    """Convert a QNET operator to a matrix-free linear operator
+
+    The resulting :class:`~scipy.sparse.linalg.LinearOperator` can be used
+    e.g. in the iterative solvers and in the propagators of
+    :mod:`scipy.sparse.linalg`. Applying it to a state does not require
+    the matrix representation of `expr` in `full_space`: Every term that is a
+    product of local operators is applied factor by factor, acting on the
+    corresponding axis of the state reshaped as a tensor. Identity factors
+    are never constructed. All diagonal terms are combined in a single
+    vector. Only terms that cannot be written as a product of local
+    operators are converted to a sparse matrix, see
+    :func:`convert_to_scipy_sparse`.
+
+    Args:
+        expr (Operator): a QNET operator
+        full_space (HilbertSpace): The
+            Hilbert space in which `expr` is defined. If not given,
+            ``expr.space`` is used. The Hilbert space must have a well-defined
+            basis.
+        mapping (dict): A mapping of any (sub-)expression to a matrix or to a
+            callable, as in :func:`convert_to_scipy_sparse`
+
+    Returns:
+        scipy.sparse.linalg.LinearOperator: The operator `expr` acting on
+        (and returning) state vectors of dimension ``full_space.dimension``
+
+    Raises:
+        TypeError: if `expr` is not an :class:`.Operator`
+        ValueError: if `expr` is not in `full_space`, or if `expr` cannot be
+            converted.
+    """
+    if full_space is None:
+        full_space = expr.space
+    if not isinstance(expr, Operator):
+        raise TypeError("expr '%s' must be an Operator" % expr)
+    if not expr.space.is_tensor_factor_of(full_space):
+        raise ValueError(
+            "expr '%s' must be in full_space %s" % (expr, full_space))
+    if full_space == TrivialSpace:
+        raise AlgebraError(
+            "Cannot convert object in TrivialSpace to a linear operator. "
+            "You may pass a non-trivial `full_space`")
+    local_spaces = full_space.local_factors
+    diagonal_terms = []
+    product_terms = []
+    matrices = []
+    for (coeff, term) in _operator_terms(expr, mapping):
+        local_factors = _local_factors(
+            term, local_spaces, mapping,
+            lambda op, ls: _convert_local(op, ls, mapping))
+        if local_factors is None:
+            matrices.append(coeff * _convert(term, full_space, mapping))
+            continue
+        coeff = coeff * local_factors[0]
+        factors = OrderedDict([
+            (local_spaces.index(ls), _coo_factor(factor))
+            for (ls, factor) in local_factors[1].items()])
+        if all(factor.diagonal_only for factor in factors.values()):
+            diagonal_terms.append((coeff, factors))
+        else:
+            product_terms.append((coeff, factors))
+    dims = []
+    for (k, ls) in enumerate(local_spaces):
+        shapes = [
+            factors[k].shape[0]
+            for (_, factors) in diagonal_terms + product_terms
+            if k in factors]
+        # a `mapping` may define the dimension of a local space
+        dims.append(shapes[0] if shapes else ls.dimension)
+    n = int(np.prod(dims))
+    diagonal = None
+    for (coeff, factors) in diagonal_terms:
+        if diagonal is None:
+            diagonal = np.zeros(n, dtype=np.complex128)
+        diagonal += _kron_diagonal(
+            [factors.get(k) for k in range(len(dims))], dims, coeff)
+    # the coefficient of each product is absorbed into its first factor
+    adjoint_product_terms = [
+        [(_axis_shape(dims, k),
+          factor.adjoint().local_operation(coeff.conjugate() if i == 0 else 1))
+         for (i, (k, factor)) in enumerate(factors.items())]
+        for (coeff, factors) in product_terms]
+    product_terms = [
+        [(_axis_shape(dims, k), factor.local_operation(coeff if i == 0 else 1))
+         for (i, (k, factor)) in enumerate(factors.items())]
+        for (coeff, factors) in product_terms]
+
+    def matvec(state):
+        return _apply_terms(
+            state, n, diagonal, product_terms, matrices)
+
+    def rmatvec(state):
+        return _apply_terms(
+            state, n, None if diagonal is None else diagonal.conj(),
+            adjoint_product_terms, [m.conj().T for m in matrices])
+
+    return LinearOperator(
+        (n, n), matvec=matvec, rmatvec=rmatvec, dtype=np.complex128)
+
+
+def _operator_terms(expr, mapping, coeff=1):
+    """Iterate over tuples ``(coeff, term)`` for the terms of `expr`, where
+    products with non-local factors are expanded"""
+    for (term_coeff, term) in _flat_operator_terms([expr], mapping, coeff):
+        if (isinstance(term, OperatorTimes) and
+                (mapping is None or term not in mapping) and
+                any(len(op.space) > 1 for op in term.operands)):
+            expanded = term.expand()
+            if expanded != term:
+                yield from _operator_terms(expanded, mapping, term_coeff)
+                continue
+        yield term_coeff, term
+
+
+def _axis_shape(dims, k):
+    """Shape ``(L, d, R)`` for reshaping a state in a Hilbert space with local
+    dimensions `dims` so that the `k`'th factor is the middle axis"""
+    return (int(np.prod(dims[:k])), dims[k], int(np.prod(dims[k+1:])))
+
+
+def _apply_terms(state, n, diagonal, product_terms, matrices):
+    """Apply a sum of a diagonal, products of local factors, and full
+    matrices to the vector `state` of dimension `n`"""
+    state = np.asarray(state, dtype=np.complex128).reshape(n)
+    if diagonal is None:
+        result = np.zeros(n, dtype=np.complex128)
+    else:
+        result = diagonal * state
+    for factors in product_terms:
+        psi = state
+        for (shape, operation) in factors:
+            psi = operation(psi.reshape(shape))
+        result += psi.reshape(n)
+    for matrix in matrices:
+        result += matrix.dot(state)
+    return result
+
+
+def _band_local(offset, start, vals, psi):
+    """Apply a local factor whose entries `vals` are on a single diagonal (in
+    the rows ``start, start+1, ...`` and columns shifted by `offset`) to the
+    middle axis of the array `psi` of shape ``(L, d, R)``"""
+    res = np.empty_like(psi)
+    stop = start + len(vals)
+    np.multiply(
+        psi[:, start+offset:stop+offset, :], vals, out=res[:, start:stop, :])
+    res[:, :start, :] = 0
+    res[:, stop:, :] = 0
+    return res
+
+
+def _gather_local(cols, vals, psi):
+    """Apply a local factor with at most one entry per row (the entry
+    `vals[i]` in column `cols[i]` for row `i`) to the middle axis of the
+    array `psi` of shape ``(L, d, R)``"""
+    res = np.take(psi, cols, axis=1)
+    res *= vals
+    return res
+
+
+def _matmul_local(matrix, psi):
+    """Apply the local `matrix` (dense array or sparse matrix) to the middle
+    axis of the array `psi` of shape ``(L, d, R)``"""
+    (L, d, R) = psi.shape
+    if R == 1:
+        return matrix.dot(psi.reshape(L, d).T).T
+    if isinstance(matrix, np.ndarray):
+        return np.matmul(matrix, psi)
+    if L == 1:
+        return matrix.dot(psi.reshape(d, R))
+    res = matrix.dot(psi.transpose(1, 0, 2).reshape(d, L * R))
+    return res.reshape(d, L, R).transpose(1, 0, 2)
+
+
+def _convert(expr, full_space, mapping):
+    """Implementation of :func:`convert_to_scipy_sparse`, returning a CSR
+    matrix"""
+    if mapping is not None and expr in mapping:
+        return _mapped_matrix(expr, mapping)
+    if isinstance(expr, Operator):
+        return _convert_operator(expr, full_space, mapping)
+    elif isinstance(expr, State):
+        return _convert_state(expr, full_space, mapping)
+    elif isinstance(expr, SuperOperator):
+        return _convert_superoperator(expr, full_space, mapping)
+    elif isinstance(expr, BraKet):
+        return (_convert(expr.bra, full_space, mapping) *
+                _convert(expr.ket, full_space, mapping))
+    elif isinstance(expr, SLH):
+        raise ValueError("SLH objects cannot be converted to a single matrix")
+    else:
+        raise ValueError("Cannot convert '%s' of type %s"
+                         % (str(expr), type(expr)))
+
+
+def _mapped_matrix(expr, mapping):
+    """Matrix for `expr` from the `mapping`"""
+    matrix = mapping[expr]
+    if callable(matrix):
+        matrix = matrix(expr)
+    return csr_matrix(matrix, dtype=np.complex128)
+
+
+def _convert_operator(expr, full_space, mapping):
+    if expr is ZeroOperator:
+        n = full_space.dimension
+        return csr_matrix((n, n), dtype=np.complex128)
+    elif isinstance(expr, OperatorTimes) and any(
+            len(op.space) > 1 for op in expr.operands):
+        # if any factor acts non-locally, we need to expand distributively.
+        se = expr.expand()
+        if se == expr:
+            raise ValueError("Cannot represent as matrix: {!s}".format(expr))
+        return _convert(se, full_space, mapping)
+    elif (expr is IdentityOperator or
+            isinstance(expr, (LocalOperator, OperatorPlus, OperatorTimes,
+                              ScalarTimesOperator))):
+        matrix, _ = _assemble_operator_terms(
+            [expr], full_space, mapping,
+            convert=lambda term: _with_dims(
+                _convert(term, full_space, mapping)),
+            convert_local=lambda op, ls: _convert_local(op, ls, mapping))
+        return matrix
+    elif isinstance(expr, Adjoint):
+        return _convert(
+            expr.operand, full_space, mapping).conj().transpose().tocsr()
+    elif isinstance(expr, KetBra):
+        return (_convert(expr.ket, full_space, mapping) *
+                _convert(expr.bra, full_space, mapping))
+    elif isinstance(expr, SuperOperatorTimesOperator):
+        # super-operators act on column-stacked operators
+        n = full_space.dimension
+        sop, op = expr.operands
+        vec = _convert(op, full_space, mapping).transpose().reshape(
+            (n**2, 1))
+        res = _convert(sop, full_space, mapping) * vec
+        return csr_matrix(res.reshape((n, n)).transpose())
+    elif isinstance(expr, PseudoInverse):
+        if full_space.dimension <= DENSE_DIMENSION_LIMIT:
+            arr = _convert(expr.operand, full_space, mapping).toarray()
+            return csr_matrix(pinv(arr))
+        raise NotImplementedError("Only implemented for smaller state "
+                                  "spaces")
+    elif isinstance(expr, NullSpaceProjector):
+        if full_space.dimension <= DENSE_DIMENSION_LIMIT:
+            arr = _convert(expr.operand, full_space, mapping).toarray()
+            # compute Singular Value Decomposition
+            U, s, Vh = svd(arr)
+            tol = 1e-8 * s[0]
+            zero_svs = s < tol
+            Vhzero = Vh[zero_svs, :]
+            return csr_matrix(Vhzero.conjugate().transpose().dot(Vhzero))
+        raise NotImplementedError("Only implemented for smaller state "
+                                  "spaces")
+    elif isinstance(expr, OperatorTrace):
+        raise NotImplementedError('Cannot convert OperatorTrace to a matrix')
+    else:
+        raise ValueError("Cannot convert '%s' of type %s"
+                         % (str(expr), type(expr)))
+
+
+def _with_dims(matrix):
+    return matrix, [matrix.shape[0]]
+
+
+def _convert_local(op, local_space, mapping):
+    """Convert the operator `op` that acts on `local_space`, without
+    embedding it in a larger Hilbert space"""
+    if mapping is not None and op in mapping:
+        return _mapped_matrix(op, mapping)
+    if isinstance(op, LocalOperator) and op.space == local_space:
+        try:
+            return _LOCAL_OPERATOR_CACHE[op]
+        except KeyError:
+            matrix = _local_operator_matrix(op)
+            _LOCAL_OPERATOR_CACHE[op] = matrix
+            return matrix
+    return _convert(op, local_space, mapping)
+
+
+def _local_operator_matrix(expr):
+    """Matrix of the :class:`.LocalOperator` `expr` in its own Hilbert
+    space"""
+    n = expr.space.dimension
+    if isinstance(expr, Create):
+        return _diagonal_csr(np.sqrt(np.arange(1, n)), -1, n)
+    elif isinstance(expr, Destroy):
+        return _diagonal_csr(np.sqrt(np.arange(1, n)), 1, n)
+    elif isinstance(expr, Jz):
+        j = (n - 1) / 2.
+        return _diagonal_csr(j - np.arange(n), 0, n)
+    elif isinstance(expr, (Jplus, Jminus)):
+        j = (n - 1) / 2.
+        m = j - np.arange(1, n)
+        vals = np.sqrt(j * (j + 1) - m * (m + 1))
+        if isinstance(expr, Jminus):
+            return _diagonal_csr(vals, -1, n)
+        return _diagonal_csr(vals, 1, n)
+    elif isinstance(expr, Phase):
+        arg = complex(expr.phase) * np.arange(n)
+        return _diagonal_csr(np.exp(1j * arg), 0, n)
+    elif isinstance(expr, Displace):
+        alpha = complex(expr.displacement)
+        a = _destroy_dense(n)
+        return csr_matrix(expm(alpha * a.T - alpha.conjugate() * a))
+    elif isinstance(expr, Squeeze):
+        eta = complex(expr.squeezing_factor)
+        a = _destroy_dense(n)
+        a2 = a.dot(a)
+        return csr_matrix(expm(0.5 * (eta * a2.T - eta.conjugate() * a2)))
+    elif isinstance(expr, LocalSigma):
+        return csr_matrix(
+            ([1.0], ([expr.index_j], [expr.index_k])), shape=(n, n),
+            dtype=np.complex128)
+    else:
+        raise ValueError("Cannot convert '%s' of type %s"
+                         % (str(expr), type(expr)))
+
+
+def _diagonal_csr(vals, offset, n):
+    """``n x n`` CSR matrix with the given `vals` on the diagonal with the
+    given `offset` (positive for the upper, negative for the lower
+    triangle)"""
+    rows = np.arange(n + 1)
+    if offset >= 0:
+        indptr = np.minimum(rows, n - offset)
+        indices = np.arange(offset, n)
+    else:
+        indptr = np.maximum(rows + offset, 0)
+        indices = np.arange(n + offset)
+    return csr_matrix(
+        (np.asarray(vals, dtype=np.complex128), indices, indptr),
+        shape=(n, n))
+
+
+def _destroy_dense(n):
+    return np.diag(np.sqrt(np.arange(1, n, dtype=np.complex128)), 1)
+
+
+def _convert_state(expr, full_space, mapping):
+    """Convert a ket to a column vector or a bra to a row vector"""
+    n = full_space.dimension
+    if isinstance(expr, Bra):
+        return _convert(
+            expr.ket, full_space, mapping).conj().transpose().tocsr()
+    elif expr is ZeroKet:
+        return csr_matrix((n, 1), dtype=np.complex128)
+    elif isinstance(expr, KetPlus):
+        return sum((_convert(op, full_space, mapping)
+                    for op in expr.operands),
+                   csr_matrix((n, 1), dtype=np.complex128))
+    elif isinstance(expr, ScalarTimesKet):
+        return complex(expr.coeff) * _convert(expr.term, full_space, mapping)
+    elif isinstance(expr, OperatorTimesKet):
+        return (_convert(expr.operator, full_space, mapping) *
+                _convert(expr.ket, full_space, mapping))
+    elif isinstance(expr, TensorKet):
+        if any(len(op.space) > 1 for op in expr.operands):
+            se = expr.expand()
+            if se == expr:
+                raise ValueError(
+                    "Cannot represent as matrix: {!s}".format(expr))
+            return _convert(se, full_space, mapping)
+        if expr.space != full_space:
+            raise ValueError(
+                "Cannot embed state '%s' in %s" % (expr, full_space))
+        by_space = {op.space: op for op in expr.operands}
+        return reduce(
+            lambda a, b: kron(a, b, format='csr'),
+            [_convert(by_space[ls], ls, mapping)
+             for ls in full_space.local_factors])
+    elif expr.space != full_space:
+        raise ValueError(
+            "Cannot embed state '%s' in %s" % (expr, full_space))
+    elif isinstance(expr, BasisKet):
+        return csr_matrix(
+            ([1.0], ([expr.index], [0])), shape=(n, 1), dtype=np.complex128)
+    elif isinstance(expr, CoherentStateKet):
+        alpha = complex(expr.ampl)
+        a = _destroy_dense(n)
+        D = expm(alpha * a.T - alpha.conjugate() * a)
+        return csr_matrix(D[:, :1])
+    else:
+        raise ValueError("Cannot convert '%s' of type %s"
+                         % (str(expr), type(expr)))
+
+
+def _convert_superoperator(expr, full_space, mapping):
+    """Convert a super-operator to a matrix acting on column-stacked
+    operators"""
+    n = full_space.dimension
+    if expr is IdentitySuperOperator:
+        return identity(n**2, dtype=np.complex128, format='csr')
+    elif expr is ZeroSuperOperator:
+        return csr_matrix((n**2, n**2), dtype=np.complex128)
+    elif isinstance(expr, SuperOperatorPlus):
+        return sum((_convert(op, full_space, mapping)
+                    for op in expr.operands),
+                   csr_matrix((n**2, n**2), dtype=np.complex128))
+    elif isinstance(expr, SuperOperatorTimes):
+        return reduce(
+            lambda a, b: a * b,
+            [_convert(op, full_space, mapping) for op in expr.operands])
+    elif isinstance(expr, ScalarTimesSuperOperator):
+        return complex(expr.coeff) * _convert(expr.term, full_space, mapping)
+    elif isinstance(expr, SPre):
+        return kron(
+            identity(n, dtype=np.complex128),
+            _convert(expr.operands[0], full_space, mapping), format='csr')
+    elif isinstance(expr, SPost):
+        return kron(
+            _convert(expr.operands[0], full_space, mapping).transpose(),
+            identity(n, dtype=np.complex128), format='csr')
+    else:
+        raise ValueError("Cannot convert '%s' of type %s"
+                         % (str(expr), type(expr)))
+
+
+###############################################################################
+# Assembly of sums of Kronecker products (shared with qnet.convert.to_qutip)
+
+
+def _assemble_operator_terms(
+        terms, full_space, mapping, convert, convert_local):
+    """Sum of the operators in `terms`, as a sparse matrix
+
+    Every term that is a (scalar multiple of a) product of local operators
+    is converted via the Kronecker product of its local factors, directly
+    into COO-triplets. The contributions of all diagonal terms are
+    accumulated in a single vector. The triplets of all terms are then
+    summed in a single sparse matrix construction, instead of adding up
+    full-space matrices one at a time.
+
+    Args:
+        terms (list): operators to sum up
+        full_space (HilbertSpace): The Hilbert space in which to represent
+            the `terms`
+        mapping (dict or None): The mapping of (sub-)expressions. Any term
+            or factor in the `mapping` is converted via `convert` or
+            `convert_local`
+        convert (callable): function that receives a term that is not a
+            product of local operators and returns a tuple of the sparse
+            matrix representing the term in `full_space` and the list of
+            dimensions of the local factors
+        convert_local (callable): function that receives a local factor and
+            the local space on which it acts, and returns the sparse matrix
+            representing the factor in that local space
+
+    Returns:
+        tuple: CSR matrix and list of the dimensions of all the local factors
+        of `full_space`
+    """
+    local_spaces = full_space.local_factors
+    contributions = []
+    for (coeff, term) in _flat_operator_terms(terms, mapping):
+        local_factors = _local_factors(
+            term, local_spaces, mapping, convert_local)
+        if local_factors is None:
+            matrix, term_dims = convert(term)
+            contributions.append((coeff, matrix.tocoo(), term_dims))
+        else:
+            coeff = coeff * local_factors[0]
+            factors = [
+                _coo_factor(local_factors[1].get(ls)) for ls in local_spaces]
+            # a `mapping` may define the dimension of a local space
+            term_dims = [
+                ls.dimension if factor is None else factor.shape[0]
+                for (ls, factor) in zip(local_spaces, factors)]
+            contributions.append((coeff, factors, term_dims))
+    dims = contributions[0][2]
+    n = int(np.prod(dims))
+    index_dtype = np.int32 if n < 2**31 else np.int64
+    diagonal = None
+    rows, cols, data = [], [], []
+    for (coeff, factors, term_dims) in contributions:
+        if isinstance(factors, list):
+            if all(factor is None or factor.diagonal_only
+                   for factor in factors):
+                if diagonal is None:
+                    diagonal = np.zeros(n, dtype=np.complex128)
+                diagonal += _kron_diagonal(factors, term_dims, coeff)
+                continue
+            row, col, vals = _kron_coo(factors, term_dims, coeff, index_dtype)
+        else:
+            row, col, vals = (
+                factors.row.astype(index_dtype, copy=False),
+                factors.col.astype(index_dtype, copy=False),
+                coeff * factors.data)
+        rows.append(row)
+        cols.append(col)
+        data.append(vals)
+    if diagonal is not None:
+        rows.append(np.arange(n, dtype=index_dtype))
+        cols.append(rows[-1])
+        data.append(diagonal)
+    matrix = coo_matrix(
+        (np.concatenate(data).astype(np.complex128, copy=False),
+         (np.concatenate(rows), np.concatenate(cols))),
+        shape=(n, n)).tocsr()
+    matrix.eliminate_zeros()
+    matrix.sort_indices()
+    return matrix, dims
+
+
+def _flat_operator_terms(terms, mapping, coeff=1):
+    """Iterate over tuples ``(coeff, term)`` for all `terms`, where sums
+    (including numeric multiples of sums) are flattened"""
+    for term in terms:
+        if mapping is None or term not in mapping:
+            if isinstance(term, OperatorPlus):
+                yield from _flat_operator_terms(term.operands, mapping, coeff)
+                continue
+            elif (isinstance(term, ScalarTimesOperator) and
+                    isinstance(term.term, OperatorPlus) and
+                    (mapping is None or term.term not in mapping)):
+                yield from _flat_operator_terms(
+                    term.term.operands, mapping,
+                    coeff * _numeric_coeff(term.coeff))
+                continue
+        yield coeff, term
+
+
+def _numeric_coeff(coeff):
+    try:
+        return complex(coeff)
+    except TypeError:
+        raise TypeError("Scalar coefficient '%s' is not numerical" % coeff)
+
+
+def _local_factors(term, local_spaces, mapping, convert_local):
+    """Decompose `term` into a numeric coefficient and a dict that maps
+    local spaces to the sparse matrix of the factor acting on that space (for
+    all spaces on which `term` does not act as the identity). Return None if
+    `term` is not a product of operators acting on the `local_spaces`."""
+    if mapping is not None and term in mapping:
+        return None
+    if isinstance(term, ScalarTimesOperator):
+        res = _local_factors(term.term, local_spaces, mapping, convert_local)
+        if res is None:
+            return None
+        return _numeric_coeff(term.coeff) * res[0], res[1]
+    elif term is IdentityOperator:
+        return 1, {}
+    elif isinstance(term, LocalOperator):
+        operands = [term]
+    elif isinstance(term, OperatorTimes):
+        operands = term.operands
+    else:
+        return None
+    by_space = OrderedDict()
+    for op in operands:
+        if op.space not in local_spaces:
+            return None
+        by_space.setdefault(op.space, []).append(op)
+    factors = {}
+    for (ls, ls_ops) in by_space.items():
+        factors[ls] = reduce(
+            lambda a, b: a * b, [convert_local(o, ls) for o in ls_ops])
+    return 1, factors
+
+
+class _COOFactor(object):
+    """Sparse local factor in a Kronecker product, in COO-format"""
+
+    def __init__(self, matrix):
+        self.shape = matrix.shape
+        if isinstance(matrix, csr_matrix):
+            # avoid the (comparatively large) overhead of `tocoo`
+            self.row = np.repeat(
+                np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+            self.col = matrix.indices
+            self.data = matrix.data
+        else:
+            matrix = matrix.tocoo()
+            self.row = matrix.row
+            self.col = matrix.col
+            self.data = matrix.data
+        self.diagonal_only = bool(np.all(self.row == self.col))
+
+    def diagonal(self):
+        diagonal = np.zeros(self.shape[0], dtype=self.data.dtype)
+        np.add.at(diagonal, self.row, self.data)
+        return diagonal
+
+    def adjoint(self):
+        return _COOFactor(coo_matrix(
+            (self.data.conj(), (self.col, self.row)),
+            shape=(self.shape[1], self.shape[0])))
+
+    def local_operation(self, coeff=1):
+        """Function that applies `coeff` times the factor to the middle axis
+        of an array of shape ``(L, d, R)``, see :func:`_band_local`,
+        :func:`_gather_local`, and :func:`_matmul_local`"""
+        data = coeff * self.data.astype(np.complex128)
+        dim = self.shape[0]
+        offsets = self.col - self.row
+        if len(data) > 0 and np.all(offsets == offsets[0]):
+            # e.g. ladder operators: a single strided multiplication
+            start = self.row.min()
+            vals = np.zeros(self.row.max() + 1 - start, dtype=np.complex128)
+            np.add.at(vals, self.row - start, data)
+            return partial(_band_local, offsets[0], start, vals[:, None])
+        elif len(np.unique(self.row)) == len(self.row):
+            # e.g. permutations: a single gather along the middle axis
+            cols = np.zeros(dim, dtype=np.intp)
+            vals = np.zeros(dim, dtype=np.complex128)
+            cols[self.row] = self.col
+            vals[self.row] = data
+            return partial(_gather_local, cols, vals[:, None])
+        matrix = csr_matrix((data, (self.row, self.col)), shape=self.shape)
+        if dim <= DENSE_DIMENSION_LIMIT:
+            matrix = matrix.toarray()
+        return partial(_matmul_local, matrix)
+
+
+def _coo_factor(matrix):
+    """Wrap `matrix` in :class:`_COOFactor`, unless it is None (standing for
+    the identity)"""
+    if matrix is None:
+        return None
+    return _COOFactor(matrix)
+
+
+def _kron_coo(factors, dims, coeff=1, index_dtype=np.int64):
+    """COO-triplets (rows, columns, values) of `coeff` times the Kronecker
+    product of the given :class:`_COOFactor` instances. A factor of None
+    stands for the identity of the corresponding dimension in `dims`"""
+    rows = np.zeros(1, dtype=index_dtype)
+    cols = np.zeros(1, dtype=index_dtype)
+    vals = np.full(1, coeff, dtype=np.complex128)
+    for (factor, dim) in zip(factors, dims):
+        if factor is None:
+            f_rows = f_cols = np.arange(dim, dtype=index_dtype)
+            f_vals = np.ones(dim)
+        else:
+            f_rows, f_cols, f_vals = factor.row, factor.col, factor.data
+        rows = (rows[:, None] * dim + f_rows[None, :]).ravel()
+        cols = (cols[:, None] * dim + f_cols[None, :]).ravel()
+        vals = (vals[:, None] * f_vals[None, :]).ravel()
+    return rows, cols, vals
+
+
+def _kron_diagonal(factors, dims, coeff=1):
+    """Diagonal of `coeff` times the Kronecker product of the given
+    diagonal :class:`_COOFactor` instances (or None for identities of the
+    corresponding dimension in `dims`)"""
+    diagonal = np.full(1, coeff, dtype=np.complex128)
+    for (factor, dim) in zip(factors, dims):
+        if factor is None:
+            diagonal = np.repeat(diagonal, dim)
+        else:
+            diagonal = np.outer(diagonal, factor.diagonal()).ravel()
+    return diagonal
@@ -0,0 +1,266 @@
+"""Cache backends for memoization of expensive constructions.
+
+The classes in this module are (mutable) mappings with additional bookkeeping,
+that serve as backends e.g. for the instance cache used by
+:meth:`.Expression.create` (see :func:`.set_instance_cache`):
+
+* :class:`UnboundedCache` keeps every entry forever (the behavior of a plain
+  :class:`dict`)
+* :class:`LRUCache` keeps at most a given number of entries (globally, and/or
+  per class), evicting the least-recently used entries first
+* :class:`WeakValueCache` keeps an entry only as long as its value is
+  referenced elsewhere
+
+All backends count cache hits, misses, and evictions, which are available
+through their :meth:`~UnboundedCache.cache_info` method.
+"""
+import weakref
+from collections import OrderedDict, namedtuple
+from collections.abc import MutableMapping
+
+__all__ = ['CacheInfo', 'UnboundedCache', 'LRUCache', 'WeakValueCache']
+
+__private__ = []  # anything not in __all__ must be in __private__
+
+
+CacheInfo = namedtuple(
+    'CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+CacheInfo.__doc__ = """Statistics of a cache backend
+
+Attributes:
+    hits (int): number of successful lookups
+    misses (int): number of lookups for a key not in the cache
+    evictions (int): number of entries that were dropped from the cache
+        (without being explicitly deleted)
+    maxsize (int or None): maximum number of entries in the cache
+    currsize (int): current number of entries in the cache
+"""
+
+
+def _key_class(key):
+    """Return the class a cache `key` belongs to
+
+    Instance keys (cf. :meth:`.Expression._get_instance_key`) are tuples whose
+    first element is the class of the instance. For any other key, return None
+    """
+    if isinstance(key, tuple) and len(key) > 0 and isinstance(key[0], type):
+        return key[0]
+    return None
+
+
+class UnboundedCache(MutableMapping):
+    """Cache that never evicts any entries
+
+    Looking up a key through item access (``cache[key]``) counts as a hit or a
+    miss; membership tests (``key in cache``) and iteration do not.
+    """
+
+    maxsize = None
+
+    def __init__(self):
+        self._data = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __getitem__(self, key):
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            raise
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def keys(self):
+        return self._data.keys()
+
+    def values(self):
+        return self._data.values()
+
+    def items(self):
+        return self._data.items()
+
+    def clear(self):
+        """Remove all entries (without counting them as evictions)"""
+        self._data.clear()
+
+    def cache_info(self):
+        """Return a :class:`CacheInfo` with the statistics of the cache"""
+        return CacheInfo(
+            hits=self.hits, misses=self.misses, evictions=self.evictions,
+            maxsize=self.maxsize, currsize=len(self))
+
+    def reset_stats(self):
+        """Reset the hit, miss, and eviction counters to zero"""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def empty_copy(self):
+        """Return a new, empty cache with the same configuration"""
+        return self.__class__()
+
+    def __repr__(self):
+        return "%s(%s)" % (self.__class__.__name__, self.cache_info())
+
+
+class LRUCache(UnboundedCache):
+    """Cache that evicts the least-recently used entries
+
+    Args:
+        maxsize (int or None): The maximum total number of entries. If None,
+            the total number of entries is not limited.
+        maxsize_per_class (int, dict, or None): The maximum number of entries
+            for keys belonging to the same class (keys that are tuples with a
+            class as their first element, like the keys of the instance cache
+            of :meth:`.Expression.create`). If an int, the same limit applies
+            to every class. If a dict, it maps classes to their limit; for a
+            class not in the dict, the limit for the nearest base class in the
+            dict applies, if any. If None, there is no per-class limit.
+
+    Example:
+
+        >>> cache = LRUCache(maxsize=2)
+        >>> cache['a'] = 1; cache['b'] = 2
+        >>> cache['a']
+        1
+        >>> cache['c'] = 3  # evicts 'b', the least-recently used entry
+        >>> sorted(cache.keys())
+        ['a', 'c']
+        >>> cache.cache_info()
+        CacheInfo(hits=1, misses=0, evictions=1, maxsize=2, currsize=2)
+    """
+
+    def __init__(self, maxsize=None, maxsize_per_class=None):
+        super().__init__()
+        if maxsize is not None and maxsize < 0:
+            raise ValueError("maxsize must be None or >= 0")
+        self.maxsize = maxsize
+        self.maxsize_per_class = maxsize_per_class
+        self._data = OrderedDict()
+        self._class_keys = None  # class => OrderedDict of keys (LRU order)
+        if maxsize_per_class is not None:
+            self._class_keys = {}
+
+    def _class_limit(self, cls):
+        """Maximum number of entries for the given `cls` (or None)"""
+        limits = self.maxsize_per_class
+        if isinstance(limits, int):
+            return limits
+        if cls is None:
+            return None
+        for base in cls.__mro__:
+            if base in limits:
+                return limits[base]
+        return None
+
+    def __getitem__(self, key):
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            raise
+        self.hits += 1
+        self._data.move_to_end(key)
+        if self._class_keys is not None:
+            self._class_keys[_key_class(key)].move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        data = self._data
+        if key in data:
+            data.move_to_end(key)
+        data[key] = value
+        if self._class_keys is not None:
+            cls = _key_class(key)
+            class_keys = self._class_keys.setdefault(cls, OrderedDict())
+            class_keys[key] = None
+            class_keys.move_to_end(key)
+            limit = self._class_limit(cls)
+            if limit is not None:
+                while len(class_keys) > limit:
+                    old_key, _ = class_keys.popitem(last=False)
+                    del data[old_key]
+                    self.evictions += 1
+        if self.maxsize is not None:
+            while len(data) > self.maxsize:
+                old_key, _ = data.popitem(last=False)
+                if self._class_keys is not None:
+                    del self._class_keys[_key_class(old_key)][old_key]
+                self.evictions += 1
+
+    def __delitem__(self, key):
+        del self._data[key]
+        if self._class_keys is not None:
+            del self._class_keys[_key_class(key)][key]
+
+    def clear(self):
+        """Remove all entries (without counting them as evictions)"""
+        self._data.clear()
+        if self._class_keys is not None:
+            self._class_keys.clear()
+
+    def empty_copy(self):
+        """Return a new, empty cache with the same configuration"""
+        return self.__class__(
+            maxsize=self.maxsize, maxsize_per_class=self.maxsize_per_class)
+
+
+class WeakValueCache(UnboundedCache):
+    """Cache that holds only weak references to its values
+
+    An entry is evicted as soon as its value is no longer referenced anywhere
+    else. Values that do not support weak references (e.g. :class:`int`, or
+    SymPy objects) are silently not stored.
+    """
+
+    def __getitem__(self, key):
+        try:
+            value = self._data[key]()
+        except KeyError:
+            self.misses += 1
+            raise
+        if value is None:  # dead reference whose callback has not run yet
+            self.misses += 1
+            raise KeyError(key)
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        self_ref = weakref.ref(self)
+
+        def remove(ref):
+            cache = self_ref()
+            if cache is not None and cache._data.get(key) is ref:
+                del cache._data[key]
+                cache.evictions += 1
+
+        try:
+            self._data[key] = weakref.ref(value, remove)
+        except TypeError:
+            pass  # value cannot be weakly referenced
+
+    def values(self):
+        return [value for value in (ref() for ref in self._data.values())
+                if value is not None]
+
+    def items(self):
+        return [(key, value) for (key, value) in
+                ((key, ref()) for (key, ref) in self._data.items())
+                if value is not None]
@@ -31,10 +31,49 @@ def sorted_if_possible(iterable, **kwargs):
         List of elements, sorted if orderable, otherwise kept in the order of iteration.
 
     """
+    items = list(iterable)  # `iterable` may be an iterator
     try:
-        return sorted(iterable, **kwargs)
+        return sorted(items, **kwargs)
     except TypeError:
-        return list(iterable)
+        return items
+
+
+_ATOM, _ORDERED_MAPPING, _MAPPING, _SEQUENCE, _COLLECTION = range(5)
+
+_CONTAINER_KINDS = {
+    tuple: _SEQUENCE, list: _SEQUENCE, dict: _MAPPING,
+    OrderedDict: _ORDERED_MAPPING, str: _ATOM, bytes: _ATOM, int: _ATOM,
+    float: _ATOM, complex: _ATOM, bool: _ATOM, type(None): _ATOM}
+# type => kind of container, for `nested_tuple`
+
+
+def _container_kind(type_):
+    """Classify `type_` for :func:`nested_tuple`
+
+    The classification (through the abstract base classes in
+    `collections.abc`) is memoized for every type.
+    """
+    try:
+        return _CONTAINER_KINDS[type_]
+    except KeyError:
+        if issubclass(type_, OrderedDict):
+            kind = _ORDERED_MAPPING
+        elif issubclass(type_, Mapping):
+            kind = _MAPPING
+        elif issubclass(type_, (str, bytes)):
+            kind = _ATOM
+        elif issubclass(type_, Sequence):
+            kind = _SEQUENCE
+        elif (
+            issubclass(type_, Container)
+            and issubclass(type_, Iterable)
+            and issubclass(type_, Sized)
+        ):
+            kind = _COLLECTION
+        else:
+            kind = _ATOM
+        _CONTAINER_KINDS[type_] = kind
+        return kind
 
 
 def nested_tuple(container):
@@ -57,6 +96,11 @@ def nested_tuple(container):
     The returned container is hashable if and only if all the values contained in the
     original data structure are hashable.
 
+    The classification of the type of `container` (and of the type of any
+    object inside it) is memoized, so that types must not be registered with
+    the above abstract base classes after they have been passed to
+    `nested_tuple`.
+
     Parameters
     ----------
     container
@@ -68,17 +112,17 @@ def nested_tuple(container):
         Nested tuple containing the same data as `container`.
 
     """
-    if isinstance(container, OrderedDict):
+    kind = _container_kind(type(container))
+    if kind == _ATOM:
+        return container
+    if kind == _SEQUENCE:
+        return tuple([
+            item if _container_kind(type(item)) == _ATOM
+            else nested_tuple(item) for item in container])
+    if kind == _ORDERED_MAPPING:
         return tuple(map(nested_tuple, container.items()))
-    if isinstance(container, Mapping):
+    if kind == _MAPPING:
+        if len(container) == 0:
+            return ()
         return tuple(sorted_if_possible(map(nested_tuple, container.items())))
-    if not isinstance(container, (str, bytes)):
-        if isinstance(container, Sequence):
-            return tuple(map(nested_tuple, container))
-        if (
-            isinstance(container, Container)
-            and isinstance(container, Iterable)
-            and isinstance(container, Sized)
-        ):
-            return tuple(sorted_if_possible(map(nested_tuple, container)))
-    return container
+    return tuple(sorted_if_possible(map(nested_tuple, container)))
@@ -0,0 +1,69 @@
+"""Evaluation of independent function calls in a pool of worker processes"""
+import pickle
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+__all__ = []
+
+__private__ = ['map_unique']  # anything not in __all__ must be in __private__
+
+
+def map_unique(func, values, processes=None):
+    """Apply `func` to each unique element of `values`
+
+    Args:
+        func (callable): function of a single argument
+        values (iterable): hashable values to which to apply `func`. Values
+            that occur multiple times are evaluated only once. Values of
+            different types are distinct, even if they compare equal (e.g.
+            ``1`` and ``1.0``)
+        processes (int or None): If an integer greater than 1, the number of
+            worker processes over which to distribute the evaluation of
+            `func`. Otherwise, `func` is evaluated serially in the current
+            process.
+
+    Returns:
+        OrderedDict: mapping of the tuple ``(type(value), value)`` for each
+        unique value (in the order of first occurrence in `values`) to the
+        result of `func`
+
+    The evaluation falls back to serial mode if there are fewer than two
+    unique values, if `func` or any of the values cannot be pickled (e.g., for
+    a lambda), or if the worker processes cannot be started. The result does
+    not depend on whether the evaluation was serial or parallel, as long as
+    `func` is deterministic.
+
+    Example:
+        >>> results = map_unique(abs, [-1, 1, -2, -1, -1.0])
+        >>> list(results.values())
+        [1, 1, 2, 1.0]
+        >>> results[int, -2]
+        2
+    """
+    unique = OrderedDict()
+    for val in values:
+        unique.setdefault((type(val), val), val)
+    keys = list(unique.keys())
+    unique_values = list(unique.values())
+    if (processes is not None and processes > 1 and
+            len(unique_values) > 1 and _is_picklable(func, unique_values)):
+        chunksize = max(1, len(unique_values) // (4 * processes))
+        try:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                results = list(executor.map(
+                    func, unique_values, chunksize=chunksize))
+            return OrderedDict(zip(keys, results))
+        except (BrokenProcessPool, OSError):
+            pass  # fall back to serial evaluation
+    return OrderedDict(
+        [(key, func(val)) for (key, val) in zip(keys, unique_values)])
+
+
+def _is_picklable(*objs):
+    """Check whether all `objs` can be sent to a worker process"""
+    try:
+        pickle.dumps(objs)
+        return True
+    except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+        return False
@@ -9,10 +9,10 @@ from qnet import (
     SLH, CircuitSymbol, CPermutation, circuit_identity, map_channels,
     SeriesProduct, Concatenation, circuit_identity as cid, FB,
     getABCD, CIdentity, pad_with_identity, move_drive_to_H,
-    try_adiabatic_elimination, Component, connect, Operator, OperatorSymbol,
-    ZeroOperator, LocalSigma, LocalProjector, IdentityOperator, Destroy,
-    LocalSpace, Matrix, identity_matrix, CoherentDriveCC, PhaseCC,
-    Beamsplitter)
+    try_adiabatic_elimination, Component, connect, reduce_network, Operator,
+    OperatorSymbol, ZeroOperator, LocalSigma, LocalProjector,
+    IdentityOperator, Destroy, LocalSpace, Matrix, identity_matrix,
+    CoherentDriveCC, PhaseCC, Beamsplitter, AlgebraError)
 from qnet.utils.permutations import (
     invert_permutation, permute, full_block_perm,
     block_perm_and_perms_within_blocks)
@@ -449,6 +449,78 @@ def test_ABCD():
     assert D[0, 0] == 1
 
 
+def test_ABCD_linear():
+    """Test the direct construction of the ABCD model for linear SLH models,
+    and its numeric evaluation"""
+    a = Destroy(hs=1)
+    b = Destroy(hs=2)
+    kappa, g, eps, chi = sympy.symbols('kappa g epsilon chi', positive=True)
+    alpha = sympy.Symbol('alpha')
+
+    slh = SLH(identity_matrix(1), [a], 2 * a.dag() * a).coherent_input(3)
+    A, B, C, D, a_vec, c_vec = getABCD(slh, method='linear')
+    assert A[0, 0] == -sympyOne / 2 - 2 * I
+    assert A[1, 1] == -sympyOne / 2 + 2 * I
+    assert B[0, 0] == -1
+    assert C[0, 0] == 1
+    assert D[0, 0] == 1
+    assert a_vec[0] == -3
+    assert c_vec[0] == 3
+
+    # degenerate parametric amplifier: squeezing couples a and a^dagger
+    slh = SLH(
+        identity_matrix(1), [sympy.sqrt(kappa) * a],
+        I * eps / 2 * (a.dag() * a.dag() - a * a))
+    A, B, C, D, a_vec, c_vec = getABCD(slh, method='linear')
+    assert A == sympy.Matrix([[-kappa/2, eps], [eps, -kappa/2]])
+    A, B, C, D, a_vec, c_vec = getABCD(
+        slh, method='linear', doubled_up=False)
+    assert A == sympy.Matrix([[-kappa/2]])
+
+    # Kerr non-linearity, linearized around a displacement alpha
+    slh = SLH(
+        identity_matrix(1), [sympy.sqrt(kappa) * a],
+        chi * a.dag() * a.dag() * a * a)
+    A, B, C, D, a_vec, c_vec = getABCD(
+        slh, a0={a: alpha}, method='linear', doubled_up=False)
+    alpha_c = alpha.conjugate()
+    assert A[0, 0] == sympy.expand(-4 * I * chi * alpha * alpha_c - kappa/2)
+    assert a_vec[0] == sympy.expand(
+        -2 * I * chi * alpha**2 * alpha_c - kappa * alpha / 2)
+    assert c_vec[0] == sympy.sqrt(kappa) * alpha
+
+    # L depending on a creation operator (phase-insensitive amplifier)
+    slh = SLH(
+        identity_matrix(2),
+        [[sympy.sqrt(kappa) * a], [sympy.sqrt(g) * b.dag()]],
+        ZeroOperator)
+    A, B, C, D, a_vec, c_vec = getABCD(slh, method='linear')
+    assert A[0, 0] == -kappa/2
+    assert A[1, 1] == g/2
+    assert B[1, 3] == sympy.sqrt(g)
+    assert C[1, 3] == sympy.sqrt(g)
+
+    # numeric evaluation
+    A, B, C, D, a_vec, c_vec = getABCD(
+        slh, method='linear', params={kappa: 2, g: 0.5})
+    assert A.dtype == complex
+    assert abs(A[0, 0] + 1) < 1e-14
+    assert abs(A[1, 1] - 0.25) < 1e-14
+    with pytest.raises(ValueError) as exc_info:
+        getABCD(slh, method='linear', params={kappa: 2})
+    assert 'g' in str(exc_info.value)
+
+    # models outside the supported class
+    with pytest.raises(ValueError):
+        getABCD(SLH(identity_matrix(1), [a * a], ZeroOperator),
+                method='linear')
+    with pytest.raises(ValueError):
+        getABCD(SLH(Matrix([[a.dag() * a]]), [a], ZeroOperator),
+                method='linear')
+    with pytest.raises(ValueError):
+        getABCD(slh, method='compiled')
+
+
 def test_inverse():
     """Test that the series product of a circuit and its inverse gives the
     identity"""
@@ -626,6 +698,108 @@ def test_connect_to_slh():
     assert circuit.toSLH().expand() == slh
 
 
+def test_reduce_network():
+    """Test that reduce_network gives the same SLH model as connect"""
+    cav = [CavityCC(label='cav%d' % i, hs=i) for i in range(4)]
+    BS = [Beamsplitter(label='BS%d' % i) for i in range(4)]
+    a = Destroy(hs=0)
+    cos_phi, sin_phi = sympy.cos(sympy.pi / 5), sympy.sin(sympy.pi / 5)
+    networks = [
+        # chain
+        (cav, [((i, 'out'), (i+1, 'in')) for i in range(3)]),
+        # ring
+        ([cav[0], BS[0], cav[1], BS[1]], [
+            ((cav[0], 'out'), (BS[0], 'in')),
+            ((BS[0], 'tr'), (cav[1], 'in')),
+            ((cav[1], 'out'), (BS[1], 'in')),
+            ((BS[1], 'tr'), (cav[0], 'in'))]),
+        # 2x2 lattice
+        (BS + cav, [
+            ((BS[0], 'tr'), (cav[1], 'in')),
+            ((cav[1], 'out'), (BS[1], 'in')),
+            ((BS[0], 'rf'), (BS[2], 'vac')),
+            ((BS[1], 'rf'), (BS[3], 'vac')),
+            ((BS[2], 'tr'), (cav[3], 'in')),
+            ((cav[3], 'out'), (BS[3], 'in')),
+            ((cav[0], 'out'), (BS[0], 'vac'))]),
+        # self-loop and duplicate component
+        ([BS[0], cav[0], BS[0]], [
+            ((0, 'tr'), (cav[0], 'in')),
+            ((cav[0], 'out'), (2, 'in')),
+            ((2, 'rf'), (2, 'vac'))]),
+        # no connections
+        (cav[:2], []),
+        # fully closed node (whose output is fed back into its input),
+        # followed by a rotation with a feedback loop
+        ([SLH([[I]], [[a]], a.dag() * a),
+          SLH([[cos_phi, -sin_phi], [sin_phi, cos_phi]], [[0], [0]], 0)], [
+            ((0, 0), (0, 0)),
+            ((1, 1), (1, 0))]),
+    ]
+    for (components, connections) in networks:
+        slh = reduce_network(components, connections)
+        assert isinstance(slh, SLH)
+        assert slh == connect(components, connections, force_SLH=True)
+    slh = reduce_network(cav[:2], [((0, 0), (1, 0))], expand_simplify=False)
+    assert slh.expand().simplify_scalar() == connect(
+        cav[:2], [((0, 0), (1, 0))], force_SLH=True)
+    with pytest.raises(ValueError) as exc_info:
+        reduce_network(cav[:2], [((cav[0], 'out'), (cav[1], 'bla'))])
+    assert 'invalid input channel bla' in str(exc_info.value)
+
+
+def test_feedback_many():
+    """Test that SLH.feedback_many gives the same result as repeated
+    feedback"""
+    cav = [CavityCC(label='cav%d' % i, hs=i).toSLH() for i in range(2)]
+    BS = Beamsplitter(mixing_angle=sympy.pi/3).toSLH()
+    # ring of two cavities and beamsplitters, ports: BS (0, 1), cav0 (2),
+    # BS (3, 4), cav1 (5)
+    slh = BS.concatenate_slh(cav[0]).concatenate_slh(BS).concatenate_slh(
+        cav[1])
+    pairs = [(0, 2), (2, 3), (3, 5), (5, 0)]
+    assert slh.feedback_many(pairs[:2]).expand() == (
+        slh.feedback(out_port=0, in_port=2).feedback(out_port=1, in_port=2)
+        .expand())
+    result = slh.feedback_many(pairs)
+    assert result.cdim == 2
+    assert result.expand().simplify_scalar() == (
+        connect(
+            [Beamsplitter(mixing_angle=sympy.pi/3), cav[0],
+             Beamsplitter(mixing_angle=sympy.pi/3), cav[1]],
+            [((0, 0), (1, 0)), ((1, 0), (2, 0)), ((2, 0), (3, 0)),
+             ((3, 0), (0, 0))], force_SLH=True))
+    assert slh.feedback_many([]) is slh
+    # operator-valued scattering matrix outside of the fed-back channels
+    hs = LocalSpace('tls', basis=('g', 'e'))
+    P = LocalProjector('e', hs=hs)
+    a = Destroy(hs=hs)
+    slh_op = SLH(
+        Matrix([[0, 1, 0], [1, 0, 0], [0, 0, P]]), Matrix([[a], [0], [a]]),
+        a.dag() * a)
+    assert slh_op.feedback_many([(0, 0)]).expand() == (
+        slh_op.feedback(out_port=0, in_port=0).expand())
+    with pytest.raises(AlgebraError) as exc_info:
+        slh_op.feedback_many([(2, 2)])
+    assert 'general operators' in str(exc_info.value)
+    assert (
+        BS.feedback_many([(1, 0)]) == BS.feedback(out_port=1, in_port=0))
+    with pytest.raises(ValueError):
+        slh.feedback_many([(0, 2), (0, 3)])
+    with pytest.raises(ValueError):
+        slh.feedback_many([(0, 6)])
+    with pytest.raises(AlgebraError) as exc_info:
+        SLH(identity_matrix(1), [[0]], 0).feedback_many([(0, 0)])
+    assert 'Ill-posed network' in str(exc_info.value)
+    # closing all channels
+    b = Destroy(hs=0)
+    closed = SLH([[-1]], [[b]], b.dag() * b).feedback_many([(0, 0)])
+    assert closed.S.shape == (0, 0)
+    assert closed.L.shape == (0, 1)
+    assert closed.H.expand() == b.dag() * b
+    assert closed.concatenate_slh(BS).S == BS.S
+
+
 def test_duplicate_component():
     """Test that we can build a circuit containing two identical components"""
     cav = CavityCC(hs=1)
@@ -687,6 +861,8 @@ def test_adiabatic_elimination():
         Delta * LocalProjector('e', hs=tls))
 
     assert slh_limit == expected
+    assert try_adiabatic_elimination(
+        slh, k, simplify_strategy='simplify') == expected
 
 
 def test_move_drive_to_H():
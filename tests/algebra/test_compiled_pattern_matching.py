@@ -0,0 +1,85 @@
+"""Test that the compiled pattern matcher gives the same results as the
+(default) interpreted one, by running the tests in test_pattern_matching.py
+and test_rules.py with `Pattern.compiled_matching` enabled"""
+
+import pytest
+
+from qnet.algebra.pattern_matching import (
+    Pattern, MatchDict, ProtoExpr, pattern_head, wc)
+from qnet.algebra.core.operator_algebra import OperatorSymbol
+from qnet.algebra.core.hilbert_space_algebra import LocalSpace
+
+import test_pattern_matching
+import test_rules
+
+
+@pytest.fixture
+def compiled_matching():
+    """Enable compiled matching for the duration of a test"""
+    Pattern.compiled_matching = True
+    try:
+        yield
+    finally:
+        Pattern.compiled_matching = False
+
+
+@pytest.mark.parametrize(
+    'ind, pat, expr, matched, wc_dict', test_pattern_matching.PATTERNS)
+def test_compiled_matches_interpreted(ind, pat, expr, matched, wc_dict):
+    """Test that the compiled matcher of every pattern in the
+    test_pattern_matching.PATTERNS list gives the same result as the
+    interpreted matcher"""
+    res_interpreted = pat._match(expr)
+    res_compiled = pat._match_compiled(expr)
+    assert bool(res_compiled) == bool(res_interpreted) == matched
+    assert list(res_compiled.items()) == list(res_interpreted.items())
+    assert res_compiled.merge_lists == res_interpreted.merge_lists
+    bindings = pat.compiled()(expr)
+    if matched:
+        assert bindings == wc_dict
+    else:
+        assert bindings is None
+
+
+@pytest.mark.parametrize(
+    'ind, pat, expr, matched, wc_dict', test_pattern_matching.PATTERNS)
+def test_match(ind, pat, expr, matched, wc_dict, compiled_matching):
+    test_pattern_matching.test_match(ind, pat, expr, matched, wc_dict)
+
+
+def test_no_match(compiled_matching):
+    """Test that the reasons for a failed match are identical (they are
+    obtained lazily from the interpreted matcher)"""
+    test_pattern_matching.test_no_match()
+
+
+@pytest.mark.parametrize(
+    "cls, rule, args, kwargs, expected", test_rules.TESTS)
+def test_rule(cls, rule, args, kwargs, expected, caplog, compiled_matching):
+    test_rules.test_rule(cls, rule, args, kwargs, expected, caplog)
+
+
+def test_compiled_merge_lists():
+    """Test that repeated wildcards inside a non-single argument are collected
+    in the correct order"""
+    hs = LocalSpace(0)
+    A, B, C = [OperatorSymbol(s, hs=hs) for s in 'ABC']
+    for pat in [pattern_head(wc('a', head=OperatorSymbol), wc('b__')),
+                pattern_head(wc('a__'), wc('b', head=OperatorSymbol))]:
+        expr = ProtoExpr([A, B, C], {})
+        res = pat.compiled()(expr)
+        assert res == dict(pat._match(expr))
+    pat = pattern_head(wc('a___'), wc('b'))
+    assert pat.compiled()(ProtoExpr([A], {})) == {'a': [], 'b': A}
+    assert pat.compiled() is pat.compiled()
+
+
+def test_compiled_failure_is_lazy():
+    """Test that a failed compiled match only evaluates its `reason` when
+    requested"""
+    pat = wc('a', head=int)
+    res = pat._match_compiled('1')
+    assert isinstance(res, MatchDict)
+    assert not res
+    assert callable(res._reason)
+    assert res.reason == "'1' is not an instance of int"
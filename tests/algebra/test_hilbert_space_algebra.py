@@ -207,7 +207,7 @@ def test_hs_basis_states():
         hs_prod.basis_state('g0')
 
     hs_prod4 = hs1 * hs2 * hs3 * hs4
-    basis = hs_prod4.basis_states
+    basis = iter(hs_prod4.basis_states)
     assert next(basis) == (BasisKet('g', hs=hs1) * BasisKet(0, hs=hs2) *
                            BasisKet(0, hs=hs3) * BasisKet(0, hs=hs4))
     assert next(basis) == (BasisKet('g', hs=hs1) * BasisKet(0, hs=hs2) *
@@ -234,6 +234,74 @@ def test_hs_basis_states():
         FullSpace.basis_states
 
 
+def test_product_space_basis_indexing():
+    """Test the conversion between indices, local indices, and labels of the
+    basis states of a ProductSpace"""
+    hs1 = LocalSpace('1', basis=['g', 'e'])
+    hs2 = LocalSpace('2', dimension=3)
+    hs3 = LocalSpace('3', basis=['-', '0', '+'])
+    hs = hs1 * hs2 * hs3
+    assert hs.dimension == 18
+    for (i, label) in enumerate(hs.basis_labels):
+        local_indices = hs.local_basis_indices(i)
+        assert hs.basis_index(local_indices) == i
+        assert hs.basis_index(label) == i
+        assert hs.basis_label(i) == label
+        assert hs.basis_state(i) == hs.basis_state(label)
+    assert hs.local_basis_indices(11) == (1, 0, 2)
+    assert hs.local_basis_indices(-1) == (1, 2, 2)
+    assert hs.basis_label(11) == 'e,0,+'
+    with pytest.raises(IndexError):
+        hs.local_basis_indices(18)
+    with pytest.raises(IndexError):
+        hs.basis_index((0, 3, 0))
+    with pytest.raises(IndexError):
+        hs.basis_index((0, 0))
+    with pytest.raises(KeyError):
+        hs.basis_index('g,0,x')
+    with pytest.raises(BasisNotSetError):
+        (hs1 * LocalSpace('4')).local_basis_indices(0)
+    with pytest.raises(BasisNotSetError):
+        (hs1 * LocalSpace('4')).basis_states
+
+    basis = hs.basis_states
+    assert len(basis) == 18
+    assert list(basis) == [hs.basis_state(i) for i in range(18)]
+    assert basis[11] == (
+        BasisKet('e', hs=hs1) * BasisKet(0, hs=hs2) * BasisKet('+', hs=hs3))
+    assert basis[-1] == hs.basis_state(17)
+    assert basis[2:8:3] == [hs.basis_state(2), hs.basis_state(5)]
+    assert basis.index(basis[11]) == 11
+    assert basis.index(basis[11], 11) == 11
+    assert basis.index(basis[11], -7, -6) == 11
+    with pytest.raises(ValueError):
+        basis.index(basis[11], 12)
+    with pytest.raises(ValueError):
+        basis.index(basis[11], 0, 11)
+    assert basis[11] in basis
+    assert BasisKet('e', hs=hs1) not in basis
+    # states on other spaces are not in the basis, even with matching
+    # local indices
+    foreign = LocalSpace('f1', dimension=3) * LocalSpace('f2', dimension=6)
+    with pytest.raises(ValueError):
+        basis.index(foreign.basis_state(4))
+    assert foreign.basis_state(4) not in basis
+    partly_foreign = (
+        BasisKet('e', hs=hs1) * BasisKet(0, hs=hs2) *
+        BasisKet(0, hs=LocalSpace('f3', dimension=3)))
+    with pytest.raises(ValueError):
+        basis.index(partly_foreign)
+    with pytest.raises(IndexError):
+        basis[18]
+
+    # the basis of a large space must not be instantiated for indexing
+    big = ProductSpace(*[LocalSpace(i, dimension=10) for i in range(12)])
+    assert big.basis_label(-1) == ",".join(["9"] * 12)
+    assert big.basis_states[10**12 - 2] == big.basis_state(",".join(
+        ["9"] * 11 + ["8"]))
+    assert big._basis is None
+
+
 def test_hilbertspace_free_symbols():
     """Test that Hilbert spaces with an indexed name return the index symbol in
     free_symbols"""
@@ -1,7 +1,10 @@
 from qnet.algebra.core.hilbert_space_algebra import LocalSpace
-from qnet.algebra.core.operator_algebra import OperatorSymbol, OperatorPlus
+from qnet.algebra.core.operator_algebra import (
+    OperatorSymbol, OperatorPlus, OperatorTimes)
 from qnet.algebra.core.abstract_algebra import Expression
-from qnet.algebra.toolbox.core import no_instance_caching, temporary_instance_cache
+from qnet.algebra.toolbox.core import (
+    no_instance_caching, temporary_instance_cache, set_instance_cache)
+from qnet.utils.cache import LRUCache
 
 
 def test_context_instance_caching():
@@ -57,3 +60,28 @@ def test_exception_teardown():
     finally:
         # Even if this failed we don't want to make a mess for other tests
         OperatorPlus._instances = instances
+
+
+def test_set_instance_cache():
+    """Test that we can replace the instance cache backend"""
+    h1 = LocalSpace("caching")
+    a = OperatorSymbol("a", hs=h1)
+    b = OperatorSymbol("b", hs=h1)
+    orig_cache = set_instance_cache(
+        LRUCache(maxsize=100, maxsize_per_class={OperatorTimes: 1}))
+    try:
+        expr1 = a * b
+        assert (a * b) is expr1
+        info = OperatorTimes._instances.cache_info()
+        assert info.hits >= 1
+        assert info.maxsize == 100
+        expr2 = b * a
+        assert expr2 in OperatorTimes._instances.values()
+        assert expr1 not in OperatorTimes._instances.values()
+        with temporary_instance_cache(OperatorTimes):
+            assert isinstance(OperatorTimes._instances, LRUCache)
+            assert len(OperatorTimes._instances) == 0
+        assert '_instances' not in OperatorTimes.__dict__
+    finally:
+        set_instance_cache(orig_cache)
+    assert Expression._instances is orig_cache
@@ -1,6 +1,8 @@
 from qnet import (
     Matrix, Zero, One, ZeroOperator, OperatorSymbol, NoConjugateMatrix, zerosm,
-    IdentityOperator)
+    IdentityOperator, SparseMatrix, SLH, Destroy, Beamsplitter, block_matrix,
+    hstackm, vstackm, identity_matrix, set_sparse_matrix_threshold)
+from qnet.algebra.core.matrix_algebra import permutation_matrix
 from sympy import symbols, re, im
 
 import pytest
@@ -44,6 +46,148 @@ def test_matrix_block_structure():
         [0, 0, 0, 1, 1, 1],
         [0, 0, 0, 1, 1, 1]])
     assert m.block_structure == (2, 1, 3)
+    assert m.block_structure is m.block_structure  # cached
+    assert SparseMatrix(m).block_structure == (2, 1, 3)
+    blocks = m._get_blocks((2, 4))
+    assert blocks == (m[:2, :2], m[2:, 2:])
+    with pytest.raises(ValueError):
+        m._get_blocks((1, 5))
+    v = Matrix([[1], [2], [3]])
+    assert v._get_blocks((1, 2)) == (Matrix([[1]]), Matrix([[2], [3]]))
+
+    # overlapping couplings merge into a single block
+    m = SparseMatrix(
+        {(0, 0): 1, (2, 0): 1, (1, 3): 1, (5, 5): 1}, shape=(6, 6))
+    assert Matrix(m.matrix).block_structure == (4, 1, 1)
+    assert m.block_structure == (4, 1, 1)
+    assert Matrix([[1, 0, 0, 1], [0, 1, 0, 0], [0, 0, 1, 0],
+                   [0, 0, 0, 1]]).block_structure == (4, )
+    assert identity_matrix(3).block_structure == (1, 1, 1)
+
+
+def test_matrix_block_structure_zero_operator():
+    """Test that ZeroOperator elements are zero for the block structure"""
+    A = OperatorSymbol("A", hs=0)
+    m = Matrix([
+        [A, ZeroOperator, ZeroOperator],
+        [ZeroOperator, A, A],
+        [ZeroOperator, A, A]])
+    assert m.block_structure == (1, 2)
+    assert SparseMatrix(m).block_structure == (1, 2)
+
+
+def test_sparse_matrix():
+    """Test that a SparseMatrix behaves like the equivalent dense Matrix"""
+    A = OperatorSymbol("A", hs=0)
+    B = OperatorSymbol("B", hs=0)
+    alpha = symbols('alpha')
+    dense = Matrix([
+        [A, ZeroOperator, ZeroOperator],
+        [ZeroOperator, ZeroOperator, alpha * B],
+        [ZeroOperator, B, ZeroOperator]])
+    sparse = SparseMatrix(dense)
+    assert sparse.zero is ZeroOperator
+    assert set(sparse.entries) == {(0, 0), (1, 2), (2, 1)}
+    assert sparse == dense
+    assert dense == sparse
+    assert hash(sparse) == hash(dense)
+    assert SparseMatrix(sparse.entries, shape=(3, 3)) == sparse
+    with pytest.raises(ValueError):
+        SparseMatrix({(0, 0): A})
+
+    # hashing does not require the dense matrix
+    hashed = SparseMatrix({(0, 1): A, (2, 2): B}, shape=(3, 3))
+    assert hash(hashed) == hash(Matrix(hashed.matrix))
+    hashed = SparseMatrix({(0, 1): A, (2, 2): B}, shape=(3, 3))
+    hash(hashed)
+    assert hashed._dense is None
+
+    # scalar zeros in a matrix of operators are not stored
+    mixed = Matrix([[A, 0, 0], [0, 0, alpha * B], [0, B, ZeroOperator]])
+    sparse_mixed = SparseMatrix(mixed)
+    assert sparse_mixed.zero is ZeroOperator
+    assert set(sparse_mixed.entries) == {(0, 0), (1, 2), (2, 1)}
+    assert sparse_mixed == mixed
+    assert mixed == sparse_mixed
+    assert sparse_mixed == sparse == dense
+    assert hash(sparse_mixed) == hash(mixed) == hash(dense)
+    numeric_with_zero_op = SparseMatrix([[0, 1], [0, 0]], zero=ZeroOperator)
+    assert numeric_with_zero_op.entries == {(0, 1): 1}
+
+    # indexing
+    assert sparse[1, 2] == alpha * B
+    assert sparse[0, 1] is ZeroOperator
+    assert sparse[-1, 1] == B
+    for item in [(slice(1, None), slice(None, 2)), (1, slice(None)),
+                 (slice(None), 2), 2]:
+        assert isinstance(sparse[item], SparseMatrix)
+        assert sparse[item] == dense[item]
+    with pytest.raises(IndexError):
+        sparse[3, 0]
+
+    # arithmetic
+    numeric = Matrix([[0, 1, 0], [2, 0, 0], [0, 0, 0]])
+    for (a, b) in [(sparse, dense), (sparse, numeric), (dense, sparse),
+                   (numeric, sparse)]:
+        a_dense, b_dense = Matrix(a.matrix), Matrix(b.matrix)
+        assert isinstance(a * b, SparseMatrix)
+        assert (a * b).expand() == (a_dense * b_dense).expand()
+        assert isinstance(a + b, SparseMatrix)
+        assert (a + b).expand() == (a_dense + b_dense).expand()
+    assert (sparse * 2) == (dense * 2)
+    assert (alpha * sparse) == (alpha * dense)
+    assert (sparse - sparse).expand().is_zero
+    assert not sparse.is_zero
+    assert SparseMatrix(zerosm((2, 2))).is_zero
+    assert (SparseMatrix(numeric) * IdentityOperator).zero is ZeroOperator
+
+    # element-wise operations
+    assert isinstance(sparse.adjoint(), SparseMatrix)
+    assert sparse.adjoint() == dense.adjoint()
+    assert sparse.T == dense.T
+    assert sparse.free_symbols == dense.free_symbols == {alpha}
+    assert sparse.space == dense.space
+    assert SparseMatrix([[1j, 0]]).conjugate() == Matrix([[-1j, 0]])
+    plus_one = sparse.element_wise(lambda o: o + IdentityOperator)
+    assert not isinstance(plus_one, SparseMatrix)
+    assert plus_one == dense.element_wise(lambda o: o + IdentityOperator)
+
+
+def test_sparse_matrix_auto():
+    """Test the automatic use of sparse matrices above the threshold"""
+    orig_threshold = set_sparse_matrix_threshold(4)
+    try:
+        a = Destroy(hs=0)
+        assert isinstance(permutation_matrix((1, 2, 3, 0)), SparseMatrix)
+        assert permutation_matrix((1, 2, 3, 0)) == Matrix([
+            [0, 0, 0, 1], [1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0]])
+        assert not isinstance(permutation_matrix((1, 0)), SparseMatrix)
+        m = Matrix([[1, 2], [3, 4]])
+        z = zerosm((2, 2), dtype=int)
+        assert isinstance(block_matrix(m, z, z, m), SparseMatrix)
+        assert block_matrix(m, z, z, m).block_structure == (2, 2)
+        assert not isinstance(hstackm((m, m)), SparseMatrix)
+        assert isinstance(vstackm((m, m)), SparseMatrix)
+        assert isinstance(hstackm((SparseMatrix(m), m)), SparseMatrix)
+        assert hstackm((SparseMatrix(m), m)) == Matrix(
+            [[1, 2, 1, 2], [3, 4, 3, 4]])
+
+        BS = Beamsplitter().toSLH()
+        cav = SLH([[1]], [[a]], a.dag() * a)
+        slh = BS.concatenate_slh(cav).concatenate_slh(BS)
+        assert isinstance(slh.S, SparseMatrix)
+        assert isinstance(slh.L, SparseMatrix)
+        assert slh.S.zero is ZeroOperator
+        assert not isinstance(BS.S, SparseMatrix)
+        slh_fb = slh.feedback(out_port=2, in_port=0)
+        set_sparse_matrix_threshold(None)
+        slh_dense = BS.concatenate_slh(cav).concatenate_slh(BS)
+        assert not isinstance(slh_dense.S, SparseMatrix)
+        assert slh_dense == slh
+        assert hash(slh_dense) == hash(slh)
+        assert slh_dense.feedback(out_port=2, in_port=0) == slh_fb
+    finally:
+        set_sparse_matrix_threshold(orig_threshold)
 
 
 def test_matrix_real_imag_conjugate():
@@ -790,6 +790,49 @@ def test_create_destroy_product_expand():
     assert result == expected
 
 
+def test_expand_product_of_sums():
+    """Test that expanding a product of sums collects the distributed terms,
+    without adding the transient products to the instance cache"""
+    from qnet.algebra.core.abstract_algebra import Expression
+    from qnet.algebra.toolbox.core import temporary_instance_cache
+    g = symbols('g0:3')
+    a = [Destroy(hs=i) for i in range(3)]
+    H = sum((g[i] * a[i].dag() * a[(i + 1) % 3] for i in range(3)),
+            ZeroOperator)
+    expected = OperatorPlus.create(*[
+        g[i] * g[j] * a[i].dag() * a[(i + 1) % 3] * a[j].dag() *
+        a[(j + 1) % 3] for i in range(3) for j in range(3)]).expand()
+    with temporary_instance_cache(Expression):
+        result = (H * H).expand()
+        n_cached = len(Expression._instances)
+    assert result == expected
+    # the cache contains the result and its sub-expressions, but not the
+    # transient products of each combination of summands
+    assert n_cached < 10 * len(result.operands)
+    assert (H * (H - H)).expand() == ZeroOperator
+    assert ((1 + H) * (1 - H)).expand() == (1 - H * H).expand()
+
+
+def test_expand_product_uses_binary_rules_memo(monkeypatch):
+    """Test that the memoization of binary rules remains active while
+    expanding a product of sums"""
+    from qnet.algebra.core import algebraic_properties
+    from qnet.algebra.core.abstract_algebra import Expression
+    from qnet.algebra.toolbox.core import (
+        temporary_instance_cache, temporary_rules, binary_rules_cache_info)
+    # logging the rules (as in test_rules.py) disables the memo
+    monkeypatch.setattr(algebraic_properties, 'LOG', False)
+    g = symbols('g0:3')
+    a = [Destroy(hs=i) for i in range(3)]
+    H = sum((g[i] * a[i].dag() * a[(i + 1) % 3] for i in range(3)),
+            ZeroOperator)
+    with temporary_rules(OperatorTimes):  # resets the memo
+        with temporary_instance_cache(Expression):
+            (H * H * H).expand()
+        info = binary_rules_cache_info(OperatorTimes)[OperatorTimes]
+        assert info.hits > info.misses > 0
+
+
 def test_issue76():
     """Test resolution of #76"""
     ket_0 = BasisKet(0, hs=0)
@@ -20,3 +20,19 @@ def test_op_plus_scalar():
     assert A + alpha == OperatorPlus(alpha * IdentityOperator, A)
     assert (OperatorPlus.create(alpha, A) ==
             OperatorPlus(alpha * IdentityOperator, A))
+
+
+def test_op_plus_collect_many_terms():
+    """Test collecting a large number of summands with symbolic and numeric
+    coefficients"""
+    hs = LocalSpace("0")
+    A = OperatorSymbol('A', hs=hs)
+    B = OperatorSymbol('B', hs=hs)
+    s = symbols('s0:200')
+    terms = [s[k] * A + 0.5 * B for k in range(200)]
+    expected = OperatorPlus(100.0 * B, sum(s) * A)
+    assert OperatorPlus.create(*terms) == expected
+    assert OperatorPlus.from_terms(terms) == expected
+    assert OperatorPlus.from_terms(iter(terms)) == expected
+    assert OperatorPlus.from_terms(t for t in [A, B, -A, -B]) == ZeroOperator
+    assert OperatorPlus.from_terms([A, 2 * A, B, -B]) == 3 * A
@@ -424,3 +424,28 @@ def test_wc_names():
         pattern(LocalSigma, ra, rb, hs=ls),
         pattern(LocalSigma, rc, rd, hs=ls))
     assert pat.wc_names == set(['ra', 'rb', 'rc', 'rd', 'ls'])
+
+
+def test_lazy_reason():
+    """Test that the reason for a failed match is only evaluated on demand"""
+
+    class ReprCounter():
+        n_repr = 0
+
+        def __repr__(self):
+            ReprCounter.n_repr += 1
+            return 'ReprCounter()'
+
+    expr = ProtoExpr([ReprCounter(), 1], {})
+    pat = pattern_head(wc('a', head=ReprCounter), wc('b', head=str))
+    match = pat.match(expr)
+    assert not match
+    assert ReprCounter.n_repr == 0
+    assert match.reason == "1 is not an instance of str"
+    match = match_pattern(pattern_head(wc('a', head=str), 1), expr)
+    assert not match
+    assert ReprCounter.n_repr == 0
+    assert match.reason == "ReprCounter() is not an instance of str"
+    assert ReprCounter.n_repr == 1
+    match.reason
+    assert ReprCounter.n_repr == 1
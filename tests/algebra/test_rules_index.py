@@ -0,0 +1,99 @@
+"""Test the dispatch index for the rules of match_replace and
+match_replace_binary"""
+
+from qnet.algebra.core import algebraic_properties
+from qnet.algebra.core.algebraic_properties import _rules_index
+from qnet.algebra.core.hilbert_space_algebra import LocalSpace
+from qnet.algebra.core.operator_algebra import (
+    OperatorSymbol, OperatorTimes, ScalarTimesOperator, ZeroOperator,
+    Operator, LocalSigma)
+from qnet.algebra.library.fock_operators import Create, Destroy
+from qnet.algebra.pattern_matching import wc, pattern_head
+from qnet.algebra.toolbox.core import (
+    temporary_rules, no_instance_caching, binary_rules_cache_info)
+
+
+def test_binary_rules_candidates():
+    """Test that only rules that can match the operand types are tried"""
+    A = OperatorSymbol('A', hs=0)
+    B = OperatorSymbol('B', hs=0)
+    index = _rules_index(OperatorTimes, '_binary_rules')
+    names = [name for (name, _) in index.candidates((A, B))]
+    assert 'R002' not in names  # ZeroOperator
+    assert 'R005' not in names  # LocalSigma * LocalSigma
+    assert 'R013' not in names  # Destroy * Create
+    a = Destroy(hs=0)
+    names = [name for (name, _) in index.candidates((a, a.dag()))]
+    assert 'R013' in names
+    names = [name for (name, _) in index.candidates((ZeroOperator, A))]
+    assert 'R002' in names
+    sigma = LocalSigma(0, 1, hs=0)
+    names = [name for (name, _) in index.candidates((Create(hs=0), sigma))]
+    assert 'R009' in names
+    # candidates are in the original order
+    all_names = list(OperatorTimes._binary_rules.keys())
+    assert names == [name for name in all_names if name in names]
+
+
+def test_rules_candidates_arity():
+    """Test that rules are filtered by the number of operands"""
+    A = OperatorSymbol('A', hs=0)
+    index = _rules_index(ScalarTimesOperator, '_rules')
+    assert len(index.candidates((2, A))) > 0
+    assert len(index.candidates((2, A, A))) == 0
+
+
+def test_rules_index_invalidation():
+    """Test that the index is rebuilt when rules change"""
+    hs = LocalSpace('idx')
+    A = OperatorSymbol('A', hs=hs)
+    B = OperatorSymbol('B', hs=hs)
+    C = OperatorSymbol('C', hs=hs)
+    index = _rules_index(OperatorTimes, '_binary_rules')
+    assert A * B != C
+    with temporary_rules(OperatorTimes), no_instance_caching():
+        assert _rules_index(OperatorTimes, '_binary_rules') is not index
+        X = wc('X', head=OperatorSymbol, conditions=[lambda X: X == A])
+        Y = wc('Y', head=Operator, conditions=[lambda Y: Y == B])
+        OperatorTimes.add_rule('extra', pattern_head(X, Y), lambda X, Y: C)
+        assert A * B == C
+        OperatorTimes.del_rules('extra', 'R001')
+        assert A * B != C
+        OperatorTimes.add_rule('extra', pattern_head(X, Y), lambda X, Y: C)
+        assert A * B == C
+    assert A * B != C
+    assert _rules_index(OperatorTimes, '_binary_rules').rules is (
+        OperatorTimes._binary_rules)
+
+
+def test_binary_replacement_memo(monkeypatch):
+    """Test that the results of binary rules are memoized, and that the memo
+    is discarded when rules change"""
+    # logging the rules (as in test_rules.py) disables the memo
+    monkeypatch.setattr(algebraic_properties, 'LOG', False)
+    hs = LocalSpace('memo')
+    A = OperatorSymbol('A', hs=hs)
+    B = OperatorSymbol('B', hs=hs)
+    C = OperatorSymbol('C', hs=hs)
+    with temporary_rules(OperatorTimes):
+        # the memo is reset on entering temporary_rules
+        assert binary_rules_cache_info(OperatorTimes)[OperatorTimes].hits == 0
+        X = wc('X', head=OperatorSymbol, conditions=[lambda X: X == A])
+        Y = wc('Y', head=Operator, conditions=[lambda Y: Y == B])
+        OperatorTimes.add_rule('extra', pattern_head(X, Y), lambda X, Y: C)
+        with no_instance_caching():
+            assert OperatorTimes.create(A, B, A, B, A) == (
+                OperatorTimes.create(C, C, A))
+        info = binary_rules_cache_info(OperatorTimes)[OperatorTimes]
+        assert info.hits == info.misses == info.currsize == 0
+        expr = OperatorTimes.create(A, B, A, B, A)
+        assert expr == OperatorTimes.create(C, C, A)
+        info = binary_rules_cache_info(OperatorTimes)[OperatorTimes]
+        assert info.hits > 0
+        assert info.currsize > 0
+        assert OperatorTimes in binary_rules_cache_info()
+        OperatorTimes.del_rules('extra')
+        info = binary_rules_cache_info(OperatorTimes)[OperatorTimes]
+        assert info.currsize == 0
+        with no_instance_caching():
+            assert OperatorTimes.create(A, B) != C
@@ -952,3 +952,44 @@ def test_kronecker_delta():
     assert isinstance(delta_1i.val, SympyKroneckerDelta)
     assert delta_i1.substitute({i: 1}) == One
     assert delta_i1.substitute({i: 0}) == Zero
+
+
+def test_numeric_fast_path():
+    """Test that numeric ScalarValues created through the fast path in
+    `create` are indistinguishable from ones instantiated directly"""
+    from qnet.algebra.core.scalar_algebra import _numeric_order_str
+    values = [
+        0.5, 2.0, 3, -1, 1.5+2j, 2+0j, -0.5j, np.float64(0.25),
+        np.float64(3.0), np.complex128(1+1j), np.complex128(2.5+0j),
+        np.int64(4), 1e300]
+    for val in values:
+        a = ScalarValue.create(val)
+        b = ScalarValue(val)
+        assert a == b
+        assert hash(a) == hash(b)
+        assert a._instance_key == b._instance_key
+        assert a._order_key == b._order_key
+    labels = [
+        '0.5', '2', '3', '-1', '(1.5+2j)', '2', str(-0.5j), '0.25', '3',
+        '(1+1j)', '2.5', '4', str(int(1e300))]
+    assert [_numeric_order_str(val) for val in values] == labels
+    for val in [0.5+0j, np.complex128(0.5), np.complex128(2.0)]:
+        assert _numeric_order_str(val) == _numeric_order_str(val.real)
+    assert ScalarValue.create(1.0) is One
+    assert ScalarValue.create(0j) is Zero
+    with pytest.raises(ValueError):
+        ScalarValue.create(np.inf)
+
+    a, b = ScalarValue.create(0.5+0.5j), ScalarValue.create(2.0)
+    assert a * b == ScalarValue(1+1j)
+    assert a + b == ScalarValue(2.5+0.5j)
+    assert b**2 == ScalarValue(4.0)
+    assert a.conjugate() == ScalarValue(0.5-0.5j)
+    assert isinstance(a.conjugate(), ScalarValue)
+    assert ScalarTimes.create(a, b, 2) == ScalarValue(2+2j)
+    assert ScalarTimes.create(0.5, 2) is One
+    assert ScalarTimes.create(a, Zero) is Zero
+
+    A = OperatorSymbol('A', hs=0)
+    for (val, label) in zip(values, labels):
+        assert (val * A)._order_key[-1] == label
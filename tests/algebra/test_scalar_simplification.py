@@ -0,0 +1,82 @@
+"""Test the strategies for the simplification of scalar coefficients"""
+import sympy
+import pytest
+
+from qnet import (
+    OperatorSymbol, Matrix, SLH, identity_matrix, Destroy, CoherentDriveCC,
+    move_drive_to_H, set_simplify_scalar_strategy)
+from qnet.algebra.core.scalar_simplification import (
+    is_canonical_scalar, simplify_expand_collect, simplify_nsimplify_numeric,
+    simplify_cost_aware, simplification_strategy, SIMPLIFY_SCALAR_STRATEGIES)
+
+
+def test_is_canonical_scalar():
+    alpha, kappa = sympy.symbols('alpha, kappa', positive=True)
+    assert is_canonical_scalar(2)
+    assert is_canonical_scalar(0.5 + 1j)
+    assert is_canonical_scalar(alpha)
+    assert is_canonical_scalar(sympy.sqrt(kappa) * alpha / 2)
+    assert is_canonical_scalar(sympy.I * alpha**2 / kappa)
+    assert not is_canonical_scalar(alpha + kappa)
+    assert not is_canonical_scalar(sympy.sqrt(alpha + kappa))
+    assert not is_canonical_scalar(alpha * sympy.exp(sympy.I * kappa))
+
+
+def test_simplification_strategies():
+    alpha, g, kappa = sympy.symbols('alpha, g, kappa', positive=True)
+    coeff = alpha * g + alpha * kappa
+    assert simplify_expand_collect(coeff) == alpha * (g + kappa)
+    assert simplify_expand_collect((g + 1)**2 - g**2) == 2 * g + 1
+    assert simplify_nsimplify_numeric(0.5) == sympy.Rational(1, 2)
+    assert simplify_nsimplify_numeric(2) == 2
+    assert simplify_nsimplify_numeric(0.5 * alpha) == 0.5 * alpha
+    assert simplify_cost_aware(coeff) == alpha * (g + kappa)
+    assert simplify_cost_aware((g**2 - 1) / (g - 1)) == g + 1
+    assert simplify_cost_aware(sympy.sqrt(kappa) * alpha / 2) == (
+        sympy.sqrt(kappa) * alpha / 2)
+    for name, func in SIMPLIFY_SCALAR_STRATEGIES.items():
+        assert simplification_strategy(name) is func
+    assert simplification_strategy(sympy.factor) is sympy.factor
+    with pytest.raises(ValueError):
+        simplification_strategy('unknown')
+    with pytest.raises(TypeError):
+        simplification_strategy(None)
+
+
+def test_simplify_scalar_strategy():
+    """Test selecting a simplification strategy per call and globally"""
+    g = sympy.symbols('g', positive=True)
+    A = OperatorSymbol('A', hs=0)
+    expr = ((g**2 - 1) / (g - 1)) * A + (0.5 * sympy.sqrt(2)) * A.dag()
+    assert expr.simplify_scalar() == expr.simplify_scalar('simplify')
+    assert expr.simplify_scalar('auto') == (
+        (g + 1) * A + (0.5 * sympy.sqrt(2)) * A.dag())
+    assert expr.simplify_scalar('nsimplify') == (
+        ((g**2 - 1) / (g - 1)) * A + (sympy.sqrt(2) / 2) * A.dag())
+    M = Matrix([[expr, 0.25]])
+    assert M.simplify_scalar('nsimplify')[0, 1] == sympy.Rational(1, 4)
+    with pytest.raises(ValueError):
+        expr.simplify_scalar('unknown')
+    orig_strategy = set_simplify_scalar_strategy('nsimplify')
+    try:
+        assert orig_strategy == 'simplify'
+        assert expr.simplify_scalar() == expr.simplify_scalar('nsimplify')
+        assert M.simplify_scalar() == M.simplify_scalar('nsimplify')
+    finally:
+        set_simplify_scalar_strategy(orig_strategy)
+    with pytest.raises(ValueError):
+        set_simplify_scalar_strategy('unknown')
+    assert expr.simplify_scalar() == expr.simplify_scalar(sympy.simplify)
+
+
+def test_move_drive_to_H_strategy():
+    """Test that move_drive_to_H with the cost-aware simplification gives the
+    same result as with sympy.simplify"""
+    kappa = sympy.symbols('kappa', positive=True)
+    alpha = sympy.symbols('alpha')
+    a = Destroy(hs=0)
+    slh = SLH(identity_matrix(1), [sympy.sqrt(kappa) * a], 0)
+    driven = (slh << CoherentDriveCC(displacement=alpha)).toSLH()
+    assert (
+        move_drive_to_H(driven, simplify_strategy='auto') ==
+        move_drive_to_H(driven))
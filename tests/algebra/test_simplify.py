@@ -53,3 +53,74 @@ def test_simplify():
     assert (srepr(new_expr) ==
             "ScalarTimesOperator(ScalarValue(2), OperatorSymbol('CommutAD', "
             "hs=LocalSpace('h1')))")
+
+
+def test_simplify_scalar_parallel():
+    """Test that simplify_scalar gives the same result when simplifying the
+    coefficients in worker processes"""
+    import sympy
+    from qnet import (
+        Destroy, Matrix, SLH, identity_matrix, ZeroOperator, adjoint)
+    g = sympy.symbols('g0:4', positive=True)
+    a = [Destroy(hs=i) for i in range(2)]
+    H = sum(
+        ((g[i]**2 - g[i+1]**2) / (g[i] - g[i+1]) * a[i % 2].dag() *
+         a[(i+1) % 2] for i in range(3)), ZeroOperator)
+    H = H + H.dag()
+    expected = sum(
+        ((g[i] + g[i+1]) * a[i % 2].dag() * a[(i+1) % 2]
+         for i in range(3)), ZeroOperator)
+    expected = expected + expected.dag()
+    assert H.simplify_scalar() == expected
+    assert H.simplify_scalar(processes=2) == expected
+    # unpicklable func: fall back to serial mode
+    assert H.simplify_scalar(
+        func=lambda c: sympy.simplify(c), processes=2) == expected
+
+    M = Matrix([[g[0] * (1 + g[1]) - g[0] * g[1], H], [0, 1]])
+    assert M.simplify_scalar(processes=2) == M.simplify_scalar()
+    assert M.element_wise(adjoint, processes=2) == M.element_wise(adjoint)
+
+    slh = SLH(identity_matrix(1), [(g[0]**2 - 1) / (g[0] + 1) * a[0]], H)
+    simplified = slh.simplify_scalar(processes=2)
+    assert simplified == slh.simplify_scalar()
+    assert simplified.L[0, 0] == (g[0] - 1) * a[0]
+
+
+def test_simplify_scalar_memoization():
+    """Test that simplify_scalar re-uses the result of simplifying the same
+    coefficient with the same function"""
+    import sympy
+    from qnet import (
+        Destroy, Matrix, simplify_scalar_cache_info,
+        clear_simplify_scalar_cache)
+    calls = []
+
+    def simplify(coeff):
+        calls.append(coeff)
+        return sympy.simplify(coeff)
+
+    g = sympy.symbols('g', positive=True)
+    a = Destroy(hs=0)
+    coeff = (g**2 - 1) / (g - 1)
+    expr = coeff * a.dag() * a + coeff * a
+    clear_simplify_scalar_cache()
+    assert simplify_scalar_cache_info().currsize == 0
+    expected = (g + 1) * a.dag() * a + (g + 1) * a
+    assert expr.simplify_scalar(func=simplify) == expected
+    assert calls == [coeff]
+    assert expr.simplify_scalar(func=simplify) == expected
+    assert Matrix([[expr, coeff]]).simplify_scalar(func=simplify) == Matrix(
+        [[expected, g + 1]])
+    assert calls == [coeff]
+    info = simplify_scalar_cache_info()
+    assert info.misses == 1
+    assert info.hits == 6
+    # a different function is a different cache key
+    assert expr.simplify_scalar() == expected
+    assert simplify_scalar_cache_info().currsize == 2
+    clear_simplify_scalar_cache()
+    assert simplify_scalar_cache_info().currsize == 0
+    assert simplify_scalar_cache_info().hits == 0
+    assert expr.simplify_scalar(func=simplify) == expected
+    assert calls == [coeff, coeff]
@@ -1,11 +1,12 @@
 from sympy import symbols
 import pytest
 
-from qnet.algebra.core.abstract_algebra import substitute
+from qnet.algebra.core.abstract_algebra import (
+    substitute, batch_substitute, _SubstitutionPlan)
 from qnet.algebra.core.exceptions import BasisNotSetError
 from qnet.algebra.core.matrix_algebra import Matrix
 from qnet.algebra.core.operator_algebra import (
-    IdentityOperator, II, OperatorSymbol)
+    IdentityOperator, II, OperatorSymbol, OperatorPlus, Adjoint)
 from qnet.algebra.library.fock_operators import Destroy
 from qnet.algebra.core.hilbert_space_algebra import LocalSpace
 
@@ -165,3 +166,43 @@ def test_singleton_substitute():
     """Test that calling the substitute method on a Singleton returns the
     Singleton"""
     assert II.substitute({}) is II
+
+
+def test_substitute_deep_expression():
+    """Test substitution in an expression tree that is deeper than the
+    recursion limit"""
+    hs = LocalSpace('deep')
+    A = OperatorSymbol('A', hs=hs)
+    B = OperatorSymbol('B', hs=hs)
+    expr = A
+    for _ in range(500):
+        expr = Adjoint(expr)  # bypasses simplification (no `create`)
+    assert expr.substitute({A: B}) == B
+    assert expr.substitute({B: A}) is expr
+
+
+def test_substitute_unchanged_and_shared(H_JC):
+    """Test that unaffected sub-expressions are returned unchanged, and that
+    shared sub-expressions are substituted only once"""
+    H = H_JC
+    omega_a, omega_b, g = symbols('omega_a, omega_b, g')
+    a = Destroy(hs=LocalSpace('A'))
+    assert H.substitute({OperatorSymbol('X', hs=0): a}) is H
+    assert substitute(H, {}) is H
+    expr = OperatorPlus(H, H)  # bypasses simplification (no `create`)
+    plan = _SubstitutionPlan(expr)
+    assert len([node for node in plan.nodes if node[0] is H]) == 1
+    assert expr.substitute({g: 0}) == (2 * H.substitute({g: 0})).expand()
+
+
+def test_batch_substitute(H_JC):
+    """Test batch substitution for a list of var_maps"""
+    H = H_JC
+    omega_a, omega_b, g = symbols('omega_a, omega_b, g')
+    var_maps = [
+        {omega_a: 1, omega_b: 2, g: val} for val in (0, 0.1, 0.2)]
+    results = batch_substitute(H, var_maps)
+    assert results == [H.substitute(var_map) for var_map in var_maps]
+    a = Destroy(hs=LocalSpace('A'))
+    assert batch_substitute(a, [{a: II}, {}]) == [II, a]
+    assert batch_substitute(g, [{g: 1}]) == [1]
@@ -1,3 +1,4 @@
+import sympy
 from sympy import symbols
 import numpy as np
 from numpy import sqrt
@@ -7,13 +8,17 @@ import pytest
 
 from qnet.algebra.core.operator_algebra import (
     LocalSigma, LocalProjector, OperatorSymbol,
-    ScalarTimesOperator, ZeroOperator)
+    ScalarTimesOperator, ZeroOperator, IdentityOperator)
 from qnet.algebra.library.fock_operators import Destroy, Create
 from qnet.algebra.core.hilbert_space_algebra import LocalSpace
 from qnet.algebra.core.circuit_algebra import SLH
 from qnet.algebra.core.matrix_algebra import identity_matrix, Matrix
 from qnet.convert.to_qutip import (
-    _time_dependent_to_qutip, convert_to_qutip, SLH_to_qutip)
+    _time_dependent_to_qutip, convert_to_qutip, SLH_to_qutip,
+    convert_to_qutip_sweep, SLH_to_qutip_sweep, _LOCAL_OPERATOR_CACHE)
+from qnet.algebra.library.fock_operators import Displace
+from qnet.algebra.core.state_algebra import BasisKet
+from qnet.algebra.core.super_operator_algebra import SPre
 
 _hs_counter = 0
 
@@ -88,6 +93,43 @@ def test_nonlocal_sum():
                         convert_to_qutip((a + sigma)*(a + sigma))
 
 
+def test_multimode_sum():
+    """Test the conversion of a sum of many terms over six subsystems,
+    including diagonal terms, nested sums and the identity"""
+    hs = [LocalSpace(hs_name(), dimension=3) for _ in range(5)]
+    hs.append(LocalSpace(hs_name(), basis=("g", "e")))
+    a = [Destroy(hs=h) for h in hs[:5]]
+    sigma = LocalSigma('g', 'e', hs=hs[5])
+    H = (sum((0.5 * i * a[i].dag() * a[i] +
+              0.1j * (a[i].dag() * a[i+1] - a[i+1].dag() * a[i])
+              for i in range(4)), ZeroOperator) +
+         2 * (sigma.dag() * sigma + sigma * a[4].dag() + sigma.dag() * a[4]) +
+         3 * IdentityOperator)
+    full_space = H.space
+    assert len(full_space.local_factors) == 6
+    H_q = convert_to_qutip(H, full_space=full_space)
+    assert H_q.dims == [[3, 3, 3, 3, 3, 2], [3, 3, 3, 3, 3, 2]]
+
+    def embed(ops):
+        factors = [qutip.qeye(h.dimension) for h in hs]
+        for (i, op) in ops.items():
+            factors[i] = op
+        return qutip.tensor(*factors)
+
+    a_q = qutip.destroy(3)
+    sigma_q = qutip.basis(2, 0) * qutip.basis(2, 1).dag()
+    H_expected = 3 * embed({})
+    for i in range(4):
+        H_expected += 0.5 * i * embed({i: a_q.dag() * a_q})
+        H_expected += 0.1j * (embed({i: a_q.dag(), i+1: a_q}) -
+                              embed({i+1: a_q.dag(), i: a_q}))
+    H_expected += 2 * (embed({5: sigma_q.dag() * sigma_q}) +
+                       embed({5: sigma_q, 4: a_q.dag()}) +
+                       embed({5: sigma_q.dag(), 4: a_q}))
+    assert (H_q - H_expected).norm('max') < 1e-12
+    assert H_q.isherm
+
+
 def test_scalar_coeffs():
     H = LocalSpace(hs_name(), dimension=5)
     a = Create(hs=H).adjoint()
@@ -184,6 +226,55 @@ def test_time_dependent_to_qutip():
     assert terms == expected
 
 
+def test_time_dependent_compiled_coeffs():
+    """Test the conversion of time-dependent coefficients of an SLH model
+    into a single numpy function, or sampled on a time grid"""
+    hs1 = LocalSpace(hs_name(), dimension=3)
+    hs2 = LocalSpace(hs_name(), dimension=2)
+    a, b = Destroy(hs=hs1), Destroy(hs=hs2)
+    g, w, t = symbols('g, w, t', real=True)
+    H = (a.dag() * a + sympy.sin(w * t) * (a + a.dag()) +
+         g * sympy.cos(t) * (a.dag() * b + b.dag() * a))
+    slh = SLH(identity_matrix(2), [sqrt(0.1) * a, sympy.exp(-t) * b], H)
+    slh_num = slh.substitute({g: 0.5, w: 2.0})
+    tlist = np.linspace(0, 1, 11)
+    H_ref, Ls_ref = SLH_to_qutip(slh_num, time_symbol=t)
+    H_vec, Ls_vec = SLH_to_qutip(
+        slh_num, time_symbol=t, convert_as='vectorized')
+    coeffs = H_vec[1][1].coeffs
+    assert len(coeffs.exprs) == 3  # the two cos(t) coefficients are shared
+    assert H_vec[2][1].coeffs is coeffs
+    assert Ls_vec[1][1].coeffs is coeffs
+    H_arr, Ls_arr = SLH_to_qutip(
+        slh_num, time_symbol=t, convert_as='array', tlist=tlist)
+    samples = coeffs(tlist)
+    assert samples.shape == (3, 11)
+    for (ref, vec, arr) in [(H_ref, H_vec, H_arr),
+                            ([Ls_ref[1]], [Ls_vec[1]], [Ls_arr[1]])]:
+        assert len(ref) == len(vec) == len(arr)
+        for (term_ref, term_vec, term_arr) in zip(ref, vec, arr):
+            if isinstance(term_ref, qutip.Qobj):
+                assert term_vec == term_arr == term_ref
+                continue
+            assert term_vec[0] == term_arr[0] == term_ref[0]
+            for (i, t_val) in enumerate(tlist):
+                expected = term_ref[1](t_val, {})
+                assert abs(term_vec[1](t_val, {}) - expected) < 1e-14
+                assert abs(term_arr[1][i] - expected) < 1e-14
+    # symbols other than the time are taken from args
+    H_vec, Ls_vec = SLH_to_qutip(slh, time_symbol=t, convert_as='vectorized')
+    coeff = H_vec[-1][1]
+    assert coeff.coeffs.params == [g, w]
+    assert abs(coeff(0.5, {'g': 0.5, 'w': 2.0}) - 0.5 * np.cos(0.5)) < 1e-14
+    assert abs(coeff(0.5, {'g': 1.0, 'w': 2.0}) - np.cos(0.5)) < 1e-14
+    with pytest.raises(ValueError):
+        coeff(0.5, {'g': 1.0})
+    with pytest.raises(ValueError):
+        SLH_to_qutip(slh, time_symbol=t, convert_as='array', tlist=tlist)
+    with pytest.raises(ValueError):
+        SLH_to_qutip(slh_num, time_symbol=t, convert_as='array')
+
+
 def test_non_herm_lindblad_conversion():
     """Test that Lindblad operators with trace 0 are correctly converted to
     qutip.
@@ -230,3 +321,105 @@ def test_trivial_space_conversion():
     H, Ls = SLH_to_qutip(slh, full_space=LocalSpace(0, dimension=10))
     assert np.linalg.norm((H.data.todense() - np.zeros((10, 10)))) == 0.0
     assert len(Ls) == 0
+
+
+def test_parameter_sweep():
+    """Test conversion of an expression for many values of its parameters"""
+    hs1 = LocalSpace(hs_name(), dimension=4)
+    hs2 = LocalSpace(hs_name(), dimension=2)
+    a = Destroy(hs=hs1)
+    sig = LocalSigma(0, 1, hs=hs2)
+    omega, g, kappa = symbols('omega, g, kappa', real=True)
+    H = (omega * a.dag() * a + g * (a.dag() * sig + sig.dag() * a) +
+         2 * g * a.dag() * sig)
+    params = [omega, g]
+    values = np.array([[1.0, 0.0], [0.5, 0.1], [2.0, -1.0]])
+    results = convert_to_qutip_sweep(H, params, values)
+    assert len(results) == 3
+    for (vals, result) in zip(values, results):
+        expected = convert_to_qutip(
+            H.substitute(dict(zip(params, vals))), full_space=H.space)
+        assert (result - expected).norm('max') < 1e-12
+    results = H.parameter_sweep([omega, g], [[1, 1]])
+    expected = convert_to_qutip(H.substitute({omega: 1, g: 1}))
+    assert (results[0] - expected).norm('max') < 1e-12
+    # single parameter given as 1D array, operator depending on parameter
+    alpha = symbols('alpha')
+    D = Displace(alpha, hs=hs1)
+    results = convert_to_qutip_sweep(D + omega * a, [alpha, omega],
+                                     [[0.1, 1], [0.2, 2]])
+    expected = convert_to_qutip(Displace(0.2, hs=hs1) + 2 * a)
+    assert (results[1] - expected).norm('max') < 1e-12
+    results = convert_to_qutip_sweep(omega * a, [omega], np.linspace(0, 1, 5))
+    assert (results[-1] - convert_to_qutip(a)).norm('max') < 1e-12
+    # expressions that are zero: fresh zero objects of the right kind
+    ket = omega * BasisKet(1, hs=hs1)
+    zero_kets = convert_to_qutip_sweep(
+        ket - ket, [omega], [1.0, 2.0], full_space=hs1)
+    assert zero_kets[0].type == 'ket'
+    assert zero_kets[0].shape == (4, 1)
+    assert zero_kets[0] is not zero_kets[1]
+    zero_bras = convert_to_qutip_sweep(
+        ket.dag() - ket.dag(), [omega], [1.0, 2.0], full_space=hs1)
+    assert zero_bras[0].type == 'bra'
+    assert zero_bras[0].shape == (1, 4)
+    zero_ops = convert_to_qutip_sweep(
+        omega * a - omega * a, [omega], [1, 2], full_space=hs1)
+    assert zero_ops[0].type == 'oper'
+    assert zero_ops[0].norm() == 0
+    assert zero_ops[0] is not zero_ops[1]
+    zero_sops = convert_to_qutip_sweep(
+        omega * SPre(a) - omega * SPre(a), [omega], [1, 2], full_space=hs1)
+    assert zero_sops[0].type == 'super'
+    with pytest.raises(ValueError) as exc_info:
+        convert_to_qutip_sweep(H, [omega], [1.0, 2.0])
+    assert 'not in params: g' in str(exc_info.value)
+    with pytest.raises(ValueError):
+        convert_to_qutip_sweep(H, [omega, g], [1.0, 2.0])
+    # SLH
+    slh = SLH(identity_matrix(1), [[sqrt(2) * kappa * a]], H)
+    params = [omega, g, kappa]
+    values = [[1.0, 0.5, 1.0], [1.0, 0.5, 0.0]]
+    results = SLH_to_qutip_sweep(slh, params, values)
+    assert slh.parameter_sweep(params, values)[0][0] == results[0][0]
+    for (vals, (H_q, Ls_q)) in zip(values, results):
+        H_expected, Ls_expected = SLH_to_qutip(
+            slh.substitute(dict(zip(params, vals))))
+        assert (H_q - H_expected).norm('max') < 1e-12
+        assert len(Ls_q) == len(Ls_expected)
+        for (L_q, L_expected) in zip(Ls_q, Ls_expected):
+            assert (L_q - L_expected).norm('max') < 1e-12
+
+
+def test_local_operator_cache():
+    """Test that converted local operators are cached, without sharing the
+    cached objects with the caller"""
+    hs1 = LocalSpace(hs_name(), dimension=3)
+    hs2 = LocalSpace(hs_name(), dimension=2)
+    a = Destroy(hs=hs1)
+    misses = _LOCAL_OPERATOR_CACHE.misses
+    a_q = convert_to_qutip(a)
+    assert convert_to_qutip(a) is not a_q
+    assert convert_to_qutip(a) == a_q == qutip.destroy(3)
+    a_q_full = convert_to_qutip(a, full_space=hs1 * hs2)
+    assert a_q_full == qutip.tensor(qutip.destroy(3), qutip.qeye(2))
+    assert convert_to_qutip(a, full_space=hs1 * hs2) is not a_q_full
+    assert _LOCAL_OPERATOR_CACHE.misses == misses + 2
+    H = a.dag() * a + a + a.dag()
+    assert convert_to_qutip(H) == (
+        qutip.num(3) + qutip.destroy(3) + qutip.create(3))
+    assert _LOCAL_OPERATOR_CACHE.misses == misses + 3  # a.dag()
+    # modifying a converted operator in-place does not affect later
+    # conversions
+    a_q.data.data[:] = 0
+    assert a_q.norm() == 0
+    assert convert_to_qutip(a).norm() > 0
+    assert convert_to_qutip(H) == (
+        qutip.num(3) + qutip.destroy(3) + qutip.create(3))
+    # with a mapping, the cache is bypassed
+    b_q = 2 * qutip.destroy(3)
+    assert convert_to_qutip(a, mapping={a: b_q}) is b_q
+    assert convert_to_qutip(a) == qutip.destroy(3)
+    # the identity is not shared
+    assert convert_to_qutip(IdentityOperator, full_space=hs1) is not (
+        convert_to_qutip(IdentityOperator, full_space=hs1))
@@ -0,0 +1,193 @@
+"""Test the conversion of QNET expressions to scipy sparse matrices and
+matrix-free linear operators, by comparison with the conversion to qutip"""
+import numpy as np
+import qutip
+from scipy.sparse import csr_matrix
+from scipy.sparse.linalg import LinearOperator
+
+import pytest
+
+from qnet.algebra.core.operator_algebra import (
+    LocalSigma, OperatorSymbol, IdentityOperator, ZeroOperator)
+from qnet.algebra.core.state_algebra import (
+    BasisKet, CoherentStateKet, KetBra)
+from qnet.algebra.core.super_operator_algebra import (
+    SPre, SPost, liouvillian)
+from qnet.algebra.core.hilbert_space_algebra import LocalSpace
+from qnet.algebra.library.fock_operators import (
+    Destroy, Create, Phase, Displace, Squeeze)
+from qnet.algebra.library.spin_algebra import SpinSpace, Jz, Jplus, Jminus
+from qnet.convert.to_qutip import convert_to_qutip
+from qnet.convert.to_scipy_sparse import (
+    convert_to_scipy_sparse, convert_to_linear_operator)
+
+
+def assert_same_as_qutip(expr, **kwargs):
+    matrix = convert_to_scipy_sparse(expr, **kwargs)
+    assert isinstance(matrix, csr_matrix)
+    expected = convert_to_qutip(expr, **kwargs).data.toarray()
+    assert np.max(np.abs(matrix.toarray() - expected)) < 1e-12
+
+
+def test_local_operators():
+    """Test that local operators are converted as in qutip"""
+    hs = LocalSpace('sp1', dimension=5)
+    spin = SpinSpace('sp2', spin=2)
+    tls = LocalSpace('sp3', basis=('g', 'e'))
+    for expr in [
+            Create(hs=hs), Destroy(hs=hs), Phase(0.3, hs=hs),
+            Displace(0.5 - 0.2j, hs=hs), Squeeze(0.2 + 0.1j, hs=hs),
+            Jz(hs=spin), Jplus(hs=spin), Jminus(hs=spin),
+            LocalSigma('g', 'e', hs=tls), LocalSigma(1, 1, hs=tls)]:
+        assert_same_as_qutip(expr)
+        assert_same_as_qutip(expr, full_space=hs * spin * tls)
+
+
+def test_operators():
+    """Test the conversion of sums and products of operators over several
+    Hilbert spaces"""
+    hs1 = LocalSpace('sp4', dimension=4)
+    hs2 = LocalSpace('sp5', basis=('g', 'e'))
+    a = Destroy(hs=hs1)
+    sigma = LocalSigma('g', 'e', hs=hs2)
+    H = (0.5 * a.dag() * a + 2j * (a.dag() * sigma - sigma.dag() * a) +
+         3 * IdentityOperator)
+    assert_same_as_qutip(H)
+    assert_same_as_qutip(H * H)
+    assert_same_as_qutip(a * sigma)
+    assert_same_as_qutip(sigma, full_space=H.space)
+    full_space = H.space * LocalSpace('sp6', dimension=3)
+    assert_same_as_qutip(H, full_space=full_space)
+    zero = convert_to_scipy_sparse(ZeroOperator, full_space=full_space)
+    assert zero.shape == (24, 24)
+    assert zero.nnz == 0
+    H_dense = convert_to_scipy_sparse(H, dense=True)
+    assert isinstance(H_dense, np.ndarray)
+    assert np.max(np.abs(
+        convert_to_scipy_sparse(H.dag(), dense=True) -
+        H_dense.conj().T)) < 1e-12
+
+
+def test_mapping():
+    """Test that the `mapping` has the same semantics as in
+    convert_to_qutip"""
+    hs1 = LocalSpace('sp7', dimension=10)
+    hs2 = LocalSpace('sp8', dimension=5)
+    expN = OperatorSymbol("expN", hs=1)
+    N = Create(hs=hs1) * Destroy(hs=hs1)
+    M = Create(hs=hs2) * Destroy(hs=hs2)
+    expN_matrix = convert_to_qutip(N).expm().data
+    for mapping in [{expN: expN_matrix},
+                    {expN: expN_matrix.toarray()},
+                    {expN: lambda expr: expN_matrix}]:
+        res = convert_to_scipy_sparse(expN * M, mapping=mapping)
+        expected = qutip.tensor(
+            convert_to_qutip(N).expm(), convert_to_qutip(M))
+        assert np.max(np.abs(res.toarray() - expected.full())) < 1e-8
+    with pytest.raises(ValueError):
+        convert_to_scipy_sparse(expN * M)
+
+
+def test_states():
+    """Test the conversion of kets, bras, and their products"""
+    hs1 = LocalSpace('sp9a', dimension=6)
+    hs2 = LocalSpace('sp9b', basis=('g', 'e'))
+    psi = (CoherentStateKet(0.5, hs=hs1) * BasisKet('e', hs=hs2) +
+           BasisKet(2, hs=hs1) * BasisKet('g', hs=hs2))
+    psi_matrix = convert_to_scipy_sparse(psi)
+    assert psi_matrix.shape == (12, 1)
+    expected = (
+        qutip.tensor(qutip.coherent(6, 0.5), qutip.basis(2, 1)) +
+        qutip.tensor(qutip.basis(6, 2), qutip.basis(2, 0)))
+    assert np.max(np.abs(psi_matrix.toarray() - expected.full())) < 1e-12
+    a = Destroy(hs=hs1)
+    assert np.max(np.abs(
+        convert_to_scipy_sparse(a * psi).toarray() -
+        (convert_to_scipy_sparse(a, full_space=psi.space) *
+         psi_matrix).toarray())) < 1e-12
+    bra = convert_to_scipy_sparse(psi.dag())
+    assert bra.shape == (1, 12)
+    norm = convert_to_scipy_sparse(
+        psi.dag() * psi, full_space=psi.space, dense=True)
+    assert abs(norm[0, 0] - expected.norm()**2) < 1e-12
+    rho = convert_to_scipy_sparse(KetBra(psi, psi))
+    assert np.max(np.abs(
+        rho.toarray() - (expected * expected.dag()).full())) < 1e-12
+
+
+def test_superoperators():
+    """Test that super-operators use the same vectorization as in qutip"""
+    hs = LocalSpace('sp11', dimension=4)
+    a = Destroy(hs=hs)
+    H = a.dag() * a + 0.1 * (a + a.dag())
+    L = liouvillian(H, [0.5 * a])
+    L_matrix = convert_to_scipy_sparse(L)
+    L_expected = qutip.liouvillian(
+        convert_to_qutip(H), [convert_to_qutip(0.5 * a)])
+    assert np.max(np.abs(L_matrix.toarray() - L_expected.full())) < 1e-12
+    for sop in [SPre(a), SPost(a)]:
+        assert_same_as_qutip(sop)
+    rho = OperatorSymbol('rho', hs=hs)
+    rho_q = qutip.rand_dm(4)
+    res = convert_to_scipy_sparse(L * rho, mapping={rho: rho_q.full()})
+    expected = qutip.vector_to_operator(
+        L_expected * qutip.operator_to_vector(rho_q))
+    assert np.max(np.abs(res.toarray() - expected.full())) < 1e-12
+
+
+def test_linear_operator():
+    """Test that the matrix-free linear operator acts like the sparse
+    matrix"""
+    hs = [LocalSpace('sp12', dimension=4), LocalSpace('sp13', dimension=3),
+          LocalSpace('sp14', basis=('g', 'e'))]
+    a, b = Destroy(hs=hs[0]), Destroy(hs=hs[1])
+    sigma = LocalSigma('g', 'e', hs=hs[2])
+    A = OperatorSymbol('A', hs=hs[0])
+    random = np.random.RandomState(seed=1)
+    A_matrix = random.rand(4, 4) + 1j * random.rand(4, 4)
+    H = (a.dag() * a + 0.5 * b.dag() * b + sigma.dag() * sigma +
+         0.1j * (a.dag() * b - b.dag() * a) +
+         (0.2 + 0.3j) * (a + a.dag()) * (sigma + sigma.dag()) +
+         2 * A * sigma + IdentityOperator)
+    full_space = H.space * LocalSpace('sp15', dimension=2)
+    mapping = {A: A_matrix}
+    H_op = convert_to_linear_operator(
+        H, full_space=full_space, mapping=mapping)
+    assert isinstance(H_op, LinearOperator)
+    assert H_op.shape == (48, 48)
+    H_matrix = convert_to_scipy_sparse(
+        H, full_space=full_space, mapping=mapping)
+    psi = random.rand(48) + 1j * random.rand(48)
+    assert np.max(np.abs(H_op.matvec(psi) - H_matrix.dot(psi))) < 1e-12
+    assert np.max(np.abs(
+        H_op.rmatvec(psi) - H_matrix.conj().T.dot(psi))) < 1e-12
+    states = random.rand(48, 3)
+    assert np.max(np.abs(
+        H_op.matmat(states) - H_matrix.dot(states))) < 1e-12
+    with pytest.raises(TypeError):
+        convert_to_linear_operator(BasisKet(0, hs=hs[0]))
+
+
+@pytest.mark.parametrize('position', [0, 1, 2])
+def test_linear_operator_local_factors(position):
+    """Test the linear operator for local factors on a single diagonal, with
+    one entry per row, and general (dense or, for a local dimension above
+    DENSE_DIMENSION_LIMIT, sparse) local factors, with the large local space
+    at the given `position`"""
+    labels = ['l1', 'l2', 'l3']
+    big_label = labels.pop(position)
+    hs = [LocalSpace(big_label, dimension=1002),
+          LocalSpace(labels[0], basis=('g', 'e')),
+          LocalSpace(labels[1], dimension=3)]
+    a, b = Destroy(hs=hs[0]), Destroy(hs=hs[2])
+    sigma = LocalSigma('g', 'e', hs=hs[1])
+    sigma_x = sigma + sigma.dag()
+    H = ((a + a.dag()) * sigma_x + 0.3j * a * (b + b.dag()) +
+         a.dag() * sigma + (0.5 - 1j) * sigma_x * b + a * (b + b.dag())**2)
+    H_op = convert_to_linear_operator(H)
+    H_matrix = convert_to_scipy_sparse(H)
+    random = np.random.RandomState(seed=1)
+    psi = random.rand(H_op.shape[0]) + 1j * random.rand(H_op.shape[0])
+    assert np.max(np.abs(H_op.matvec(psi) - H_matrix.dot(psi))) < 1e-10
+    assert np.max(np.abs(
+        H_op.rmatvec(psi) - H_matrix.conj().T.dot(psi))) < 1e-10
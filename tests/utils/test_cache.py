@@ -0,0 +1,93 @@
+import gc
+
+from qnet.utils.cache import UnboundedCache, LRUCache, WeakValueCache
+
+
+class A:
+    pass
+
+
+class B(A):
+    pass
+
+
+class C:
+    pass
+
+
+def test_unbounded_cache_stats():
+    """Test that the unbounded cache counts hits and misses"""
+    cache = UnboundedCache()
+    cache['a'] = 1
+    assert cache['a'] == 1
+    try:
+        cache['b']
+    except KeyError:
+        pass
+    assert 'a' in cache
+    assert 'b' not in cache
+    info = cache.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
+    assert info.evictions == 0
+    assert info.maxsize is None
+    assert info.currsize == 1
+    cache.reset_stats()
+    assert cache.cache_info().hits == 0
+
+
+def test_lru_cache_maxsize():
+    """Test that the LRU cache evicts the least-recently used entries"""
+    cache = LRUCache(maxsize=3)
+    for i in range(3):
+        cache[i] = i
+    assert cache[0] == 0  # 1 is now the least-recently used key
+    cache[3] = 3
+    assert list(cache.keys()) == [2, 0, 3]
+    assert cache.cache_info().evictions == 1
+    empty = cache.empty_copy()
+    assert len(empty) == 0
+    assert empty.maxsize == 3
+
+
+def test_lru_cache_maxsize_per_class():
+    """Test per-class limits of the LRU cache"""
+    cache = LRUCache(maxsize=10, maxsize_per_class={A: 2})
+    for i in range(3):
+        cache[(A, i)] = i
+        cache[(B, i)] = i
+        cache[(C, i)] = i
+    assert set(cache.keys()) == set(
+        [(A, 1), (A, 2), (B, 1), (B, 2), (C, 0), (C, 1), (C, 2)])
+    assert cache.cache_info().evictions == 2
+    for i in range(3, 10):
+        cache[(C, i)] = i
+    assert len(cache) == 10
+    assert (A, 1) not in cache  # globally least-recently used
+    del cache[(A, 2)]
+    cache[(A, 3)] = 3
+    cache[(A, 4)] = 4
+    assert (A, 3) in cache and (A, 4) in cache
+    cache = LRUCache(maxsize_per_class=1)
+    cache[(A, 1)] = 1
+    cache[(A, 2)] = 2
+    cache[(C, 1)] = 1
+    assert set(cache.keys()) == set([(A, 2), (C, 1)])
+
+
+def test_weak_value_cache():
+    """Test that the weak-value cache drops unreferenced values"""
+    cache = WeakValueCache()
+    a, b = A(), A()
+    cache['a'] = a
+    cache['b'] = b
+    cache['c'] = 1  # not weakly referenceable: ignored
+    assert len(cache) == 2
+    assert cache['a'] is a
+    del b
+    gc.collect()
+    assert len(cache) == 1
+    assert list(cache.values()) == [a]
+    info = cache.cache_info()
+    assert info.evictions == 1
+    assert info.hits == 1
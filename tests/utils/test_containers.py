@@ -0,0 +1,25 @@
+"""Test the helpers in qnet.utils.containers"""
+from collections import OrderedDict, UserList
+
+import sympy
+
+from qnet.utils.containers import nested_tuple
+
+
+def test_nested_tuple():
+    """Test conversion of nested containers to a nested tuple"""
+    assert nested_tuple(1) == 1
+    assert nested_tuple('abc') == 'abc'
+    assert nested_tuple(b'abc') == b'abc'
+    assert nested_tuple(()) == ()
+    assert nested_tuple({}) == ()
+    assert nested_tuple([1, [2, 3], (4, {5})]) == (1, (2, 3), (4, (5, )))
+    assert nested_tuple({'b': 1, 'a': [2]}) == (('a', (2, )), ('b', 1))
+    assert nested_tuple(OrderedDict([('b', 1), ('a', 2)])) == (
+        ('b', 1), ('a', 2))
+    assert nested_tuple({3, 1, 2}) == (1, 2, 3)
+    assert nested_tuple(UserList([1, [2]])) == (1, (2, ))
+    assert nested_tuple(sympy.Tuple(1, 2)) == (1, 2)
+    assert nested_tuple(sympy.Symbol('x')) == sympy.Symbol('x')
+    # unorderable elements are kept in order of iteration
+    assert nested_tuple({1: 'a', 'b': 2}) == ((1, 'a'), ('b', 2))
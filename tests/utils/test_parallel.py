@@ -0,0 +1,62 @@
+import pickle
+
+import sympy
+
+from qnet.utils.parallel import map_unique
+
+
+def test_map_unique_serial_parallel():
+    """Test that map_unique gives the same result in serial and parallel
+    mode, and evaluates each unique value only once"""
+    x, y = sympy.symbols('x y')
+    values = [
+        (x**2 - y**2) / (x - y), sympy.sin(x)**2 + sympy.cos(x)**2,
+        (x**2 - y**2) / (x - y), x * (1 + y) - x * y]
+    serial = map_unique(sympy.simplify, values)
+    assert list(serial.keys()) == [
+        (type(v), v) for v in (values[0], values[1], values[3])]
+    assert list(serial.values()) == [x + y, 1, x]
+    parallel = map_unique(sympy.simplify, values, processes=2)
+    assert parallel == serial
+    assert list(parallel.keys()) == list(serial.keys())
+
+
+def test_map_unique_fallback():
+    """Test that map_unique falls back to serial mode for an unpicklable
+    function"""
+    calls = []
+
+    def func(val):  # local function can't be pickled
+        calls.append(val)
+        return 2 * val
+
+    results = map_unique(func, [1, 2, 1, 3], processes=2)
+    assert results == {(int, 1): 2, (int, 2): 4, (int, 3): 6}
+    assert calls == [1, 2, 3]
+
+
+def test_map_unique_types():
+    """Test that map_unique does not conflate equal values of different
+    types"""
+    from qnet import Matrix, Destroy
+    import numpy as np
+    results = map_unique(repr, [1, 1.0, True, 1], processes=2)
+    assert list(results.values()) == ['1', '1.0', 'True']
+    assert results[float, 1] == '1.0'
+    a = Destroy(hs=0)
+    m = Matrix(np.array([[1, 1.0, a]], dtype=object))
+    serial = m.element_wise(repr)
+    assert list(serial.matrix[0]) == ['1', '1.0', repr(a)]
+    parallel = m.element_wise(repr, processes=2)
+    assert list(parallel.matrix[0]) == list(serial.matrix[0])
+
+
+def test_pickle_scalar_value():
+    """Test that ScalarValue instances (which forward unknown attributes to
+    the wrapped value) can be sent to worker processes"""
+    from qnet import ScalarValue, OperatorSymbol
+    alpha = sympy.Symbol('alpha')
+    for expr in [
+            ScalarValue(alpha), ScalarValue(1.5),
+            alpha * OperatorSymbol('A', hs=0)]:
+        assert pickle.loads(pickle.dumps(expr)) == expr